@@ -5,34 +5,102 @@ Local-only evidence deep dive (inventory + entity map + timeline + gaps + Eviden
 Design goals:
 - Never require evidence to be committed to git.
 - PII-safe by default: do not emit raw document text into outputs.
-- Ground outputs with "basis" fields (filename vs content) and stable identifiers (sha256).
+- Ground outputs with "basis" fields (filename, content or media-metadata) and stable identifiers (sha256).
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import base64
+import bisect
+import codecs
+import contextlib
 import csv
 import datetime as dt
+import errno
+import fnmatch
+import gzip
 import hashlib
+import heapq
+import importlib.util
+import io
+import itertools
 import json
+import mmap
 import os
 import re
+import secrets
+import select
+import sqlite3
+import struct
 import sys
+import threading
+import time
+import tracemalloc
 import zipfile
-from dataclasses import dataclass, asdict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field, replace
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
+from xml.sax.saxutils import unescape as xml_unescape
 
 
+def sibling_module(name: str) -> Any:
+    """
+    The module in scripts/<name>.py (e.g. evidence_merkle), loaded by path on first use, so
+    this file imports the same whether run as a script or imported from anywhere else.
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, Path(__file__).resolve().with_name(name + ".py"))
+        module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)  # type: ignore[union-attr]
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
+
+
+_MONTH_ALT = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+MONTHS: Dict[str, int] = {
+    m: i + 1 for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])
+}
+
+# One pattern per supported family; group names are unique so they can be joined into DATE_SCANNER.
+# Digit/letter lookarounds (not \b) so dates embedded in filenames like "Report_2025-08-01" still match.
 DATE_PATTERNS: List[re.Pattern[str]] = [
-    re.compile(r"\b(20\d{2}-\d{2}-\d{2})\b"),
+    # 2025-12-30, 2025/12/30
+    re.compile(r"(?<![0-9])(?P<iy>(?:19|20)\d{2})(?P<isep>[-/.])(?P<im>\d{1,2})(?P=isep)(?P<id>\d{1,2})(?![0-9])"),
+    # January 6, 2026 / Jan. 6th 2026 / Jan 6, '26
+    re.compile(
+        r"(?<![a-z])(?P<mon>" + _MONTH_ALT + r")\.?\s+(?P<md>\d{1,2})(?:st|nd|rd|th)?"
+        r"(?:,?\s+(?P<my>(?:19|20)\d{2})|,\s*'?(?P<my2>\d{2}))(?![0-9])",
+        re.IGNORECASE,
+    ),
+    # 6 January 2026 / 6th Jan, 2026
     re.compile(
-        r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),\s+(20\d{2})\b",
+        r"(?<![0-9])(?P<dd>\d{1,2})(?:st|nd|rd|th)?\s+(?P<dmon>" + _MONTH_ALT + r")\.?,?\s+(?P<dy>(?:19|20)\d{2})(?![0-9])",
         re.IGNORECASE,
     ),
-    re.compile(r"\b(\d{1,2})/(\d{1,2})/(20\d{2})\b"),
+    # 1/7/2026, 1/7/26, 01-07-26 (field order resolved by DateScanner.order)
+    re.compile(r"(?<![0-9/])(?P<na>\d{1,2})(?P<nsep>[/-])(?P<nb>\d{1,2})(?P=nsep)(?P<ny>(?:19|20)\d{2}|\d{2})(?![0-9/])"),
 ]
 
+# Every date starts at a token boundary; checking that once up front (rather than inside each
+# alternative) lets the regex engine skip most positions cheaply. Underscore counts as a boundary.
+DATE_SCANNER: re.Pattern[str] = re.compile(
+    r"(?<![0-9A-Za-z])(?:" + "|".join("(?:%s)" % p.pattern for p in DATE_PATTERNS) + ")", re.IGNORECASE
+)
+
+DATE_ORDERS = ("mdy", "dmy")
+
 
 def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
     h = hashlib.sha256()
@@ -45,6 +113,118 @@ def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
     return h.hexdigest()
 
 
+# Files at least this large are memory-mapped; smaller ones are read with one readinto()
+# into a per-thread buffer that is reused across files.
+MMAP_MIN_BYTES = 8 * 1024 * 1024
+
+_tls = threading.local()
+
+
+@contextlib.contextmanager
+def perf_stage(name: str, nbytes: int = 0) -> Iterator[None]:
+    """
+    Charge wall/CPU time (and bytes read) of the block to stage `name` of the file being
+    indexed on this thread. A no-op unless begin_file_stages(True) was called (--profile).
+    """
+    stages = getattr(_tls, "stages", None)
+    if stages is None:
+        yield
+        return
+    w0, c0 = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        s = stages.setdefault(name, [0.0, 0.0, 0])
+        s[0] += time.perf_counter() - w0
+        s[1] += time.thread_time() - c0
+        s[2] += nbytes
+
+
+# Per-file stage totals: {stage: [wall_s, cpu_s, bytes]}.
+FileStages = Dict[str, List[float]]
+
+
+def begin_file_stages(enabled: bool) -> None:
+    _tls.stages = {} if enabled else None
+
+
+def end_file_stages() -> Optional[FileStages]:
+    stages = getattr(_tls, "stages", None)
+    _tls.stages = None
+    return stages
+
+
+def _reusable_buffer(size: int) -> bytearray:
+    buf = getattr(_tls, "buf", None)
+    if buf is None or len(buf) < size:
+        buf = _tls.buf = bytearray(max(size, 1024 * 1024))
+    return buf
+
+
+class FileBuffer:
+    """
+    Single read of a file shared by hashing and extraction.
+
+    Small files land in a reusable readinto() buffer, large ones are mmap'ed, so a file that
+    is both hashed and extracted is read from disk once instead of twice. Valid only inside
+    the with-block; the buffer is reused by the next FileBuffer on the same thread.
+    """
+
+    def __init__(self, path: Path, size: int) -> None:
+        self.path = path
+        self.size = size
+        self.view: memoryview = memoryview(b"")
+        self._mm: Optional[mmap.mmap] = None
+
+    def __enter__(self) -> "FileBuffer":
+        # mmap'ed pages are faulted in lazily, so for large files most read time lands in "hash".
+        with perf_stage("read", self.size), self.path.open("rb") as f:
+            if self.size >= MMAP_MIN_BYTES:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.view = memoryview(self._mm)
+            elif self.size:
+                buf = _reusable_buffer(self.size)
+                n = f.readinto(memoryview(buf)[: self.size]) or 0
+                self.view = memoryview(buf)[:n]
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.view.release()
+        if self._mm is not None:
+            self._mm.close()
+
+    def sha256(self) -> str:
+        return hashlib.sha256(self.view).hexdigest()
+
+    def stream(self) -> Any:
+        # Seekable binary file object for zipfile/pypdf. The mmap is one already; small
+        # buffers are copied once in memory (no second disk read).
+        if self._mm is not None:
+            self._mm.seek(0)
+            return self._mm
+        return io.BytesIO(self.view)
+
+    def text(self) -> str:
+        return codecs.decode(self.view, "utf-8", errors="ignore")
+
+
+class BytesBuffer:
+    """FileBuffer interface over bytes already in memory (an archive member)."""
+
+    def __init__(self, data: bytes) -> None:
+        self.view = memoryview(data)
+        self.size = len(data)
+
+    def sha256(self) -> str:
+        return hashlib.sha256(self.view).hexdigest()
+
+    def stream(self) -> Any:
+        return io.BytesIO(self.view)
+
+    def text(self) -> str:
+        return codecs.decode(self.view, "utf-8", errors="ignore")
+
+
 def safe_norm(s: str) -> str:
     return re.sub(r"\s+", " ", s).strip()
 
@@ -70,70 +250,313 @@ def infer_category(name: str, rel_path: str) -> str:
     return "Other"
 
 
-def extract_docx_text(path: Path, max_chars: int = 1_000_000) -> Optional[str]:
-    # DOCX is a zip; extract text nodes from word/document.xml.
-    try:
-        with zipfile.ZipFile(path, "r") as zf:
-            with zf.open("word/document.xml") as f:
-                xml = f.read()
-    except Exception:
-        return None
+# Text-bearing WordprocessingML parts, in the order their text is emitted.
+DOCX_TEXT_PARTS: List[re.Pattern[str]] = [
+    re.compile(r"^word/document\.xml$"),
+    re.compile(r"^word/header\d*\.xml$"),
+    re.compile(r"^word/footer\d*\.xml$"),
+    re.compile(r"^word/footnotes\.xml$"),
+    re.compile(r"^word/endnotes\.xml$"),
+    re.compile(r"^word/comments\.xml$"),
+]
+
+
+# Streaming tokenizer over raw part bytes: each match is one event -- a <w:t> text run
+# (group 1), a paragraph end, or a tab/line break. Runs inside a paragraph join without a
+# space because Word often splits a single word across runs.
+_DOCX_EVENT = re.compile(rb"<w:t(?:\s[^>]*)?>([^<]*)</w:t>|</w:p>|<w:(?:tab|br|cr)\b")
+
 
-    # A lightweight (non-XML-parser) extraction of <w:t>text</w:t>.
-    # Good enough for keyword/date detection; avoids extra dependencies.
+def _docx_part_text(stream: Any, budget: int, chunk_size: int) -> Iterator[Tuple[str, int]]:
+    # Yield (text, run_chars) per input chunk until the stream ends or ~budget run chars are produced.
+    carry = b""
+    produced = 0
+    while produced < budget:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buf = carry + chunk
+        pieces: List[str] = []
+        n = 0
+        last = 0
+        for m in _DOCX_EVENT.finditer(buf):
+            last = m.end()
+            raw = m.group(1)
+            if raw is None:
+                pieces.append(" ")
+                continue
+            t = raw.decode("utf-8", errors="ignore")
+            if "&" in t:
+                t = xml_unescape(t, {"&quot;": '"', "&apos;": "'"})
+            pieces.append(t)
+            n += len(t)
+        produced += n
+        yield "".join(pieces), n
+        # Keep only an unfinished trailing element (from its "<") for the next chunk.
+        tail = buf[last:]
+        cut = tail.rfind(b"<w:t")
+        if cut < 0:
+            cut = tail.rfind(b"<")
+        carry = tail[cut:] if cut >= 0 else b""
+
+
+def extract_docx_text(path: Union[Path, BinaryIO], max_chars: int = 1_000_000, chunk_size: int = 256 * 1024) -> Optional[str]:
+    # DOCX is a zip; stream body, header, footer, footnote, endnote and comment parts without
+    # materializing their XML, and stop reading once max_chars of text has been collected.
+    # A lightweight (non-XML-parser) extraction: good enough for keyword/date detection.
     try:
-        s = xml.decode("utf-8", errors="ignore")
+        zf = zipfile.ZipFile(path, "r")
     except Exception:
         return None
 
-    texts = re.findall(r"<w:t[^>]*>(.*?)</w:t>", s, flags=re.IGNORECASE | re.DOTALL)
-    if not texts:
-        return ""
-    joined = safe_norm(" ".join(re.sub(r"<[^>]+>", "", t) for t in texts))
+    out: List[str] = []
+    remaining = max_chars
+    with zf:
+        names = sorted(zf.namelist())
+        if "word/document.xml" not in names:
+            return None
+        parts = [n for pat in DOCX_TEXT_PARTS for n in names if pat.match(n)]
+        for part in parts:
+            if remaining <= 0:
+                break
+            try:
+                with zf.open(part) as f:
+                    for text, n in _docx_part_text(f, remaining, chunk_size):
+                        out.append(text)
+                        remaining -= n
+            except Exception:
+                # Corrupt member: keep the text gathered so far.
+                pass
+            out.append(" ")
+
+    joined = safe_norm("".join(out))
     if len(joined) > max_chars:
         joined = joined[:max_chars]
     return joined
 
 
-def extract_pdf_text_optional(path: Path, max_chars: int = 1_000_000) -> Optional[str]:
+# Page fan-out only pays for the per-task PdfReader re-open on long documents.
+PDF_FANOUT_MIN_PAGES = 64
+
+
+def _pdf_page_range_text(path: str, start: int, stop: int) -> List[str]:
+    # Process-pool task: each worker opens its own reader (PdfReader objects are not picklable).
+    from pypdf import PdfReader  # type: ignore
+
+    reader = PdfReader(path)
+    out: List[str] = []
+    for i in range(start, stop):
+        try:
+            out.append(safe_norm(reader.pages[i].extract_text() or ""))
+        except Exception:
+            out.append("")
+    return out
+
+
+class PdfPageTextCache:
+    """
+    Opt-in local cache of extracted PDF page text keyed by (file sha256, page number).
+
+    Unlike every other artifact this holds raw document text, so it is never written unless
+    a directory is given explicitly (--pdf-text-cache); keep it out of shared/synced folders.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / f"{sha256}.json"
+
+    def load(self, sha256: str) -> Tuple[Optional[int], Dict[int, str]]:
+        try:
+            data = json.loads(self._path(sha256).read_text(encoding="utf-8"))
+            return int(data["page_count"]), {int(k): v for k, v in data["pages"].items()}
+        except Exception:
+            return None, {}
+
+    def save(self, sha256: str, page_count: int, pages: Dict[int, str]) -> None:
+        path = self._path(sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"page_count": page_count, "pages": pages}, ensure_ascii=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def extract_pdf_pages(
+    path: Path,
+    max_chars: int = 1_000_000,
+    page_workers: int = 1,
+    file_hash: str = "",
+    text_cache: Optional[PdfPageTextCache] = None,
+    stream: Optional[BinaryIO] = None,
+) -> Optional[List[str]]:
+    """
+    Normalized text per page (index 0 = page 1), stopping once max_chars have been collected.
+
+    The character budget is a running total (linear in pages). Pages already in text_cache
+    are not re-parsed; missing pages of long documents are fanned out across page_workers
+    processes in contiguous batches and consumed in page order. When stream is given
+    (e.g. FileBuffer.stream()) the serial path parses it instead of re-reading path.
+    """
     # Optional dependency path; if unavailable, return None.
     try:
         from pypdf import PdfReader  # type: ignore
     except Exception:
         return None
 
+    page_count: Optional[int] = None
+    cached: Dict[int, str] = {}
+    if text_cache is not None and file_hash:
+        page_count, cached = text_cache.load(file_hash)
+
+    reader: Any = None
+    try:
+        if page_count is None:
+            reader = PdfReader(stream if stream is not None else str(path))
+            page_count = len(reader.pages)
+    except Exception:
+        return None
+
+    missing = [i for i in range(page_count) if i not in cached]
+    fresh: Dict[int, str] = {}
+
+    def fetch_serial() -> Iterator[str]:
+        nonlocal reader
+        if reader is None:
+            reader = PdfReader(stream if stream is not None else str(path))
+        for i in missing:
+            try:
+                yield safe_norm(reader.pages[i].extract_text() or "")
+            except Exception:
+                yield ""
+
+    def fetch_parallel() -> Iterator[str]:
+        batch = max(8, -(-len(missing) // (page_workers * 4)))
+        ranges: List[Tuple[int, int]] = []
+        for i in missing:
+            if ranges and ranges[-1][1] == i and ranges[-1][1] - ranges[-1][0] < batch:
+                ranges[-1] = (ranges[-1][0], i + 1)
+            else:
+                ranges.append((i, i + 1))
+        with ProcessPoolExecutor(max_workers=page_workers) as pool:
+            futs = deque(pool.submit(_pdf_page_range_text, str(path), a, b) for a, b in ranges)
+            try:
+                while futs:
+                    yield from futs.popleft().result()
+            finally:
+                for fut in futs:
+                    fut.cancel()
+
+    pages: List[str] = []
+    total = 0
     try:
-        reader = PdfReader(str(path))
-        out_parts: List[str] = []
-        for page in reader.pages:
-            t = page.extract_text() or ""
-            if t:
-                out_parts.append(t)
-            if sum(len(x) for x in out_parts) >= max_chars:
+        use_pool = page_workers > 1 and len(missing) >= PDF_FANOUT_MIN_PAGES
+        source = fetch_parallel() if use_pool else fetch_serial()
+        for i in range(page_count):
+            if total >= max_chars:
                 break
-        joined = safe_norm(" ".join(out_parts))
-        if len(joined) > max_chars:
-            joined = joined[:max_chars]
-        return joined
+            if i in cached:
+                t = cached[i]
+            else:
+                t = next(source)
+                fresh[i] = t
+            if total + len(t) > max_chars:
+                t = t[: max_chars - total]
+            pages.append(t)
+            total += len(t)
+        if hasattr(source, "close"):
+            source.close()
     except Exception:
         return None
 
+    if text_cache is not None and file_hash and fresh:
+        try:
+            text_cache.save(file_hash, page_count, {**cached, **fresh})
+        except OSError:
+            pass
+    return pages
 
-def find_dates(text: str) -> List[str]:
-    hits: List[str] = []
-    for pat in DATE_PATTERNS:
-        for m in pat.finditer(text):
-            hits.append(m.group(0))
-    # de-dupe preserving order
-    seen = set()
-    out: List[str] = []
-    for h in hits:
-        key = h.lower()
-        if key in seen:
+
+def extract_pdf_text_optional(path: Path, max_chars: int = 1_000_000) -> Optional[str]:
+    pages = extract_pdf_pages(path, max_chars=max_chars)
+    if pages is None:
+        return None
+    return safe_norm(" ".join(pages))[:max_chars]
+
+
+@dataclass
+class DateHit:
+    iso: str
+    raw: str
+    start: int
+    end: int
+
+
+def _year(y: str) -> int:
+    # Two-digit years pivot at 70 (POSIX strptime convention): 00-69 -> 20xx, 70-99 -> 19xx.
+    n = int(y)
+    if len(y) == 2:
+        return 2000 + n if n < 70 else 1900 + n
+    return n
+
+
+def _date_from_match(m: re.Match[str], order: str) -> Optional[dt.date]:
+    g = m.groupdict()
+    if g["iy"]:
+        y, mo, d = int(g["iy"]), int(g["im"]), int(g["id"])
+    elif g["mon"]:
+        y, mo, d = _year(g["my"] or g["my2"]), MONTHS[g["mon"][:3].lower()], int(g["md"])
+    elif g["dmon"]:
+        y, mo, d = int(g["dy"]), MONTHS[g["dmon"][:3].lower()], int(g["dd"])
+    else:
+        a, b = int(g["na"]), int(g["nb"])
+        mo, d = (a, b) if order == "mdy" else (b, a)
+        y = _year(g["ny"])
+    try:
+        return dt.date(y, mo, d)
+    except ValueError:
+        return None
+
+
+def scan_dates(text: str, order: str = "mdy") -> Iterator[DateHit]:
+    """
+    Single pass over text with DATE_SCANNER, yielding ISO-normalized dates with source offsets.
+
+    order ("mdy" or "dmy") resolves purely numeric dates like 1/7/26; month-name and ISO
+    forms are unambiguous. Impossible dates (2025-02-30, 13/13/25) are dropped.
+    """
+    memo: Dict[str, Optional[str]] = {}
+    for m in DATE_SCANNER.finditer(text):
+        raw = m.group(0)
+        if raw not in memo:
+            d = _date_from_match(m, order)
+            memo[raw] = d.isoformat() if d else None
+        iso = memo[raw]
+        if iso is not None:
+            yield DateHit(iso=iso, raw=raw, start=m.start(), end=m.end())
+
+
+def find_dates(text: str, order: str = "mdy") -> List[str]:
+    # Normalized ISO dates, de-duped preserving first-seen order.
+    # Same scan as scan_dates() without per-hit objects; repeated raw strings normalize once.
+    out: Dict[str, None] = {}
+    collect_dates(DATE_SCANNER.finditer(text), order, out, {})
+    return list(out)
+
+
+def collect_dates(
+    matches: Iterable[re.Match[str]], order: str, out: Dict[str, None], memo: Dict[str, Optional[str]]
+) -> None:
+    # Adds the ISO dates of DATE_SCANNER matches to `out` (an ordered set); `memo` carries the
+    # raw-string normalizations across calls when one text is scanned in chunks.
+    for m in matches:
+        raw = m.group(0)
+        if raw in memo:
             continue
-        seen.add(key)
-        out.append(h)
-    return out
+        d = _date_from_match(m, order)
+        iso = memo[raw] = d.isoformat() if d else None
+        if iso is not None:
+            out.setdefault(iso, None)
 
 
 @dataclass
@@ -144,21 +567,181 @@ class EvidenceItem:
     category: str
 
 
-@dataclass
+class EntityNames:
+    """
+    One run's canonical entity names, numbered in the order first seen (ScanConfig.entities).
+
+    IndexedFile keeps entity hits as ids into the table of the run that built it, so ids
+    never leak between runs, worker processes or --shard runs; anything written out uses
+    the names. Records are built on the main thread only, which is the only writer.
+    """
+
+    __slots__ = ("names", "_ids")
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id(self, name: str) -> int:
+        i = self._ids.get(name)
+        if i is None:
+            i = self._ids[name] = len(self.names)
+            self.names.append(sys.intern(name))
+        return i
+
+
+# Output columns of indexed_files / inventory.csv, in order.
+INDEXED_FIELDS = (
+    "source_root",
+    "full_path",
+    "rel_path",
+    "name",
+    "ext",
+    "size",
+    "mtime_iso",
+    "sha256",
+    "category",
+    "content_extracted",
+    "dates_from_filename",
+    "dates_from_content",
+    "entity_hits",
+    "page_refs",
+)
+
+
 class IndexedFile:
-    source_root: str
-    full_path: str
-    rel_path: str
-    name: str
-    ext: str
-    size: int
-    mtime_iso: str
-    sha256: str
-    category: str
-    content_extracted: bool
-    dates_from_filename: List[str]
-    dates_from_content: List[str]
-    entity_hits: Dict[str, int]
+    """
+    One indexed file (or archive member); row() is its indexed_files / inventory.csv row.
+
+    Kept compact for corpora of millions of files: __slots__ instead of a per-instance
+    __dict__; root, extension, category and date strings interned, dates in tuples; entity
+    hits held as a flat (entity id, count, ...) tuple over the run's EntityNames (passed as
+    entities) instead of a dict per file; sha256 as 32 raw bytes; empty page_refs and a
+    full_path that is just source_root + "/" + rel_path not stored at all.
+
+    Records are mutable (staged dedupe fills in sha256 later) and compare by value, so,
+    like the dataclass they replaced, they are unhashable.
+    """
+
+    __slots__ = (
+        "source_root",
+        "_full_path",
+        "rel_path",
+        "name",
+        "ext",
+        "size",
+        "mtime_iso",
+        "_sha256",
+        "category",
+        "content_extracted",
+        "dates_from_filename",
+        "dates_from_content",
+        "_names",
+        "_entities",
+        "_page_refs",
+    )
+
+    def __init__(
+        self,
+        source_root: str,
+        full_path: str,
+        rel_path: str,
+        name: str,
+        ext: str,
+        size: int,
+        mtime_iso: str,
+        sha256: str,
+        category: str,
+        content_extracted: bool,
+        dates_from_filename: Iterable[str],
+        dates_from_content: Iterable[str],
+        entity_hits: Dict[str, int],
+        # PDF page attribution: {"dates": {iso: [pages]}, "entities": {canonical: [pages]}}.
+        page_refs: Optional[Dict[str, Dict[str, List[int]]]] = None,
+        *,
+        entities: EntityNames,
+    ) -> None:
+        self._names = entities
+        self.source_root = sys.intern(source_root)
+        self.rel_path = rel_path
+        self._full_path: Optional[str] = None if full_path == source_root + "/" + rel_path else full_path
+        self.name = name
+        self.ext = sys.intern(ext)
+        self.size = size
+        self.mtime_iso = mtime_iso
+        self.sha256 = sha256
+        self.category = sys.intern(category)
+        self.content_extracted = content_extracted
+        self.dates_from_filename: Tuple[str, ...] = tuple(sys.intern(d) for d in dates_from_filename)
+        self.dates_from_content: Tuple[str, ...] = tuple(sys.intern(d) for d in dates_from_content)
+        self.entity_hits = entity_hits
+        self.page_refs = page_refs or {}
+
+    @property
+    def full_path(self) -> str:
+        return self._full_path if self._full_path is not None else self.source_root + "/" + self.rel_path
+
+    @property
+    def sha256(self) -> str:
+        h = self._sha256
+        return h.hex() if isinstance(h, bytes) else h
+
+    @sha256.setter
+    def sha256(self, value: str) -> None:
+        try:
+            self._sha256: Union[bytes, str] = bytes.fromhex(value) if len(value) == 64 else value
+        except ValueError:
+            self._sha256 = value
+
+    @property
+    def page_refs(self) -> Dict[str, Dict[str, List[int]]]:
+        return self._page_refs if self._page_refs is not None else {}
+
+    @page_refs.setter
+    def page_refs(self, refs: Dict[str, Dict[str, List[int]]]) -> None:
+        self._page_refs: Optional[Dict[str, Dict[str, List[int]]]] = refs or None
+
+    @property
+    def entity_hits(self) -> Dict[str, int]:
+        e, names = self._entities, self._names.names
+        return {names[e[i]]: e[i + 1] for i in range(0, len(e), 2)}
+
+    @entity_hits.setter
+    def entity_hits(self, hits: Dict[str, int]) -> None:
+        self._entities: Tuple[int, ...] = tuple(v for name, c in hits.items() for v in (self._names.id(name), c))
+
+    def row(self) -> Dict[str, Any]:
+        # Built directly (not asdict(): no deep copy); page_refs is shared with the record.
+        return {
+            "source_root": self.source_root,
+            "full_path": self.full_path,
+            "rel_path": self.rel_path,
+            "name": self.name,
+            "ext": self.ext,
+            "size": self.size,
+            "mtime_iso": self.mtime_iso,
+            "sha256": self.sha256,
+            "category": self.category,
+            "content_extracted": self.content_extracted,
+            "dates_from_filename": list(self.dates_from_filename),
+            "dates_from_content": list(self.dates_from_content),
+            "entity_hits": self.entity_hits,
+            "page_refs": self.page_refs,
+        }
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, IndexedFile) and self.row() == other.row()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return "IndexedFile(" + ", ".join(f"{k}={v!r}" for k, v in self.row().items()) + ")"
+
+
+def content_date_basis(rec: IndexedFile) -> str:
+    # Timeline basis of dates_from_content: a file whose text was not extracted can only
+    # have them from media headers (see media_dates).
+    return "content" if rec.content_extracted else "media-metadata"
 
 
 def load_seed_manifest(path: Optional[Path]) -> List[EvidenceItem]:
@@ -218,220 +801,3425 @@ def build_entity_aliases(extra_terms: List[str]) -> Dict[str, List[str]]:
     return base
 
 
-def count_entity_hits(text: str, aliases: Dict[str, List[str]]) -> Dict[str, int]:
-    hits: Dict[str, int] = {}
-    lower = text.lower()
-    for canonical, alist in aliases.items():
-        c = 0
-        for a in alist:
-            a = a.strip()
-            if not a:
-                continue
-            # word-ish boundary match; allow spaces
-            pat = re.escape(a.lower())
-            c += len(re.findall(pat, lower))
-        if c:
-            hits[canonical] = c
-    return hits
+def _trie_pattern(keys: Iterable[str]) -> str:
+    # Build a regex from a character trie: alternatives share prefixes, so the C regex engine
+    # walks the trie once per start position instead of retrying every alias separately.
+    trie: Dict[str, Any] = {}
+    for k in keys:
+        node = trie
+        for ch in k:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def render(node: Dict[str, Any]) -> str:
+        alts = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            # Greedy optional: longer aliases win, shorter ones remain reachable by backtracking.
+            return ("(?:" + body + ")?") if len(alts) == 1 else body + "?"
+        return body
+
+    return render(trie)
+
+
+class AliasMatcher:
+    """
+    Alias table compiled once into a single trie-shaped pattern (multi-pattern automaton).
+
+    One linear pass over the lowercased text yields leftmost-longest, non-overlapping
+    matches, so "Cody McKenzie" counts once (not also as "Cody" and "McKenzie").
+    With word_boundaries, aliases only match whole words ("er" never matches inside "her").
+    An alias listed under several canonicals counts toward each of them.
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]], word_boundaries: bool = True) -> None:
+        self.aliases = aliases
+        self.word_boundaries = word_boundaries
+        self.canonicals: Dict[str, List[str]] = {}
+        for canonical, alist in aliases.items():
+            for a in alist:
+                key = a.strip().lower()
+                if key and canonical not in self.canonicals.setdefault(key, []):
+                    self.canonicals[key].append(canonical)
+        self.order = {c: i for i, c in enumerate(aliases)}
+        self.longest = max(map(len, self.canonicals), default=0)
+        self.pattern: Optional[re.Pattern[str]] = None
+        if self.canonicals:
+            body = _trie_pattern(self.canonicals)
+            self.pattern = re.compile(r"\b(?:" + body + r")\b" if word_boundaries else body)
+
+    def fingerprint(self) -> str:
+        # Table order is included: it decides the order hits are reported in.
+        blob = json.dumps([list(self.aliases.items()), self.word_boundaries], ensure_ascii=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def count(self, text: str) -> Dict[str, int]:
+        if self.pattern is None:
+            return {}
+        counts: Dict[str, int] = {}
+        self.tally(self.pattern.finditer(text.lower()), counts)
+        return self.ordered(counts)
+
+    def tally(self, matches: Iterable[re.Match[str]], counts: Dict[str, int]) -> None:
+        # Add matches of self.pattern (over lowercased text) to per-canonical counts.
+        for m in matches:
+            for canonical in self.canonicals[m.group(0)]:
+                counts[canonical] = counts.get(canonical, 0) + 1
+
+    def ordered(self, counts: Dict[str, int]) -> Dict[str, int]:
+        # Report in alias-table order so entity_map.json stays stable.
+        return {c: counts[c] for c in sorted(counts, key=self.order.__getitem__)}
+
+
+def count_entity_hits(text: str, matcher: AliasMatcher) -> Dict[str, int]:
+    return matcher.count(text)
+
+
+TERM_TOKEN = re.compile(r"\w+")
+
+
+TERM_KEY_BYTES = 32
+
+
+def term_id(token: str, key: bytes) -> int:
+    # Terms are stored as 64-bit blake2b hashes keyed with the matter's secret --term-key:
+    # without the key file, ids cannot be matched to words by hashing a word list. Queries
+    # hash their tokens with the same key.
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8, key=key, person=b"deepdive-term").digest()
+    return int.from_bytes(digest, "little")
+
+
+def term_key_check(key: bytes) -> int:
+    # Recorded with term ids (index header, config keys) so that postings made with another
+    # key are told apart instead of silently matching nothing.
+    return int.from_bytes(hashlib.blake2b(b"", digest_size=8, key=key, person=b"deepdive-tcheck").digest(), "little")
+
+
+def load_term_key(path: Path, create: bool = False) -> bytes:
+    """
+    A --term-key file: TERM_KEY_BYTES random bytes, hex-encoded. With create, a missing
+    file is generated (readable by the owner only). Raises ValueError for anything else.
+    """
+    if create and not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="ascii") as f:
+            f.write(secrets.token_hex(TERM_KEY_BYTES) + "\n")
+    try:
+        key = bytes.fromhex(path.read_text(encoding="ascii").strip())
+    except (OSError, ValueError) as e:
+        raise ValueError(f"cannot read term key {path}: {e}") from None
+    if len(key) != TERM_KEY_BYTES:
+        raise ValueError(f"term key {path} must hold {TERM_KEY_BYTES} hex-encoded bytes")
+    return key
+
+
+def put_varint(buf: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def get_varint(data: Any, pos: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+class DocTerms:
+    """
+    Positional postings for one document, built token by token: varint term count, then per
+    term (ascending id) the id delta, the entry length and the entry itself (position count +
+    position deltas).
+
+    Positions are token ordinals running across everything added (e.g. all PDF pages, or all
+    chunks of a streamed text file), so phrases are consecutive positions. Entries are copied
+    into the index verbatim by TermIndexWriter.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        self.key = key
+        self.ids: Dict[str, int] = {}
+        self.positions: Dict[int, List[int]] = {}
+        self.pos = 0
+
+    def add(self, tokens: Iterable[str]) -> None:
+        # Tokens must already be lowercased TERM_TOKEN matches.
+        for tok in tokens:
+            tid = self.ids.get(tok)
+            if tid is None:
+                tid = self.ids[tok] = term_id(tok, self.key)
+            self.positions.setdefault(tid, []).append(self.pos)
+            self.pos += 1
+
+    def encode(self) -> bytes:
+        out = bytearray()
+        put_varint(out, len(self.positions))
+        prev = 0
+        for tid in sorted(self.positions):
+            entry = bytearray()
+            plist = self.positions[tid]
+            put_varint(entry, len(plist))
+            last = 0
+            for p in plist:
+                put_varint(entry, p - last)
+                last = p
+            put_varint(out, tid - prev)
+            put_varint(out, len(entry))
+            out += entry
+            prev = tid
+        return bytes(out)
+
+
+def doc_terms(texts: Iterable[str], key: bytes) -> bytes:
+    # DocTerms postings for whole texts (e.g. PDF pages) held in memory.
+    terms = DocTerms(key)
+    for text in texts:
+        terms.add(TERM_TOKEN.findall(text.lower()))
+    return terms.encode()
+
+
+def extract_dates_from_filename(name: str, order: str = "mdy") -> List[str]:
+    return find_dates(name, order)
+
 
+# (source_root, full_path, stat)
+ScanEntry = Tuple[Path, Path, os.stat_result]
 
-def extract_dates_from_filename(name: str) -> List[str]:
-    return find_dates(name)
+SYMLINK_POLICIES = ("files", "follow", "skip")
 
 
-def walk_roots(roots: List[Path]) -> List[Tuple[Path, Path]]:
-    out: List[Tuple[Path, Path]] = []
+def glob_match(rel: str, name: str, patterns: List[str]) -> bool:
+    return any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(name, pat) for pat in patterns)
+
+
+def scan_roots(
+    roots: List[Path],
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    symlinks: str = "files",
+) -> Iterator[ScanEntry]:
+    """
+    Stream regular files under each root using os.scandir, reusing DirEntry.stat().
+
+    Globs match against the root-relative posix path or the bare name; excluded
+    directories are pruned without descending. Entries are visited in sorted name
+    order so output is stable across filesystems.
+
+    Symlink policy:
+    - "files": include symlinked files, do not descend into symlinked directories (default).
+    - "follow": also descend into symlinked directories (cycle-safe).
+    - "skip": ignore symlinks entirely.
+    """
     for root in roots:
-        for p in root.rglob("*"):
-            if p.is_file():
-                out.append((root, p))
+        yield from scan_tree(root, root, include or [], exclude or [], symlinks)
+
+
+def scan_tree(root: Path, top: Path, include: List[str], exclude: List[str], symlinks: str) -> Iterator[ScanEntry]:
+    # scan_roots() of one root, from directory top (root or a directory under it) down.
+    visited: Set[Tuple[int, int]] = set()
+    stack: List[Path] = [top]
+    while stack:
+        d = stack.pop()
+        try:
+            dst = d.stat()
+        except OSError:
+            continue
+        if (dst.st_dev, dst.st_ino) in visited:
+            continue
+        visited.add((dst.st_dev, dst.st_ino))
+        try:
+            with os.scandir(d) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs: List[Path] = []
+        for e in entries:
+            rel = os.path.relpath(e.path, str(root)).replace("\\", "/")
+            try:
+                if e.is_symlink() and symlinks == "skip":
+                    continue
+                if e.is_dir(follow_symlinks=symlinks == "follow"):
+                    if not glob_match(rel, e.name, exclude):
+                        subdirs.append(Path(e.path))
+                    continue
+                if not e.is_file():
+                    continue
+                st = e.stat()
+            except OSError:
+                continue
+            if exclude and glob_match(rel, e.name, exclude):
+                continue
+            if include and not glob_match(rel, e.name, include):
+                continue
+            yield root, Path(e.path), st
+        # Depth-first in sorted order: push in reverse so the smallest name is popped first.
+        stack.extend(reversed(subdirs))
+
+
+# (st_dev, st_ino) of a directory, as scan_roots() uses for cycle detection.
+DirKey = Tuple[int, int]
+# Files per executor task when stat()ing a directory's entries concurrently.
+STAT_BATCH = 32
+
+
+@dataclass
+class _DirListing:
+    files: List[Tuple[str, os.stat_result]]
+    subdirs: List[Tuple[str, Optional[DirKey]]]
+
+
+def _dir_key(path: str) -> Optional[DirKey]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _scan_dir(d: Path, symlinks: str) -> Optional[Tuple[List[os.DirEntry], List[os.DirEntry]]]:
+    # One directory read, classified exactly as scan_roots() does; (files, subdirs) in name order.
+    try:
+        with os.scandir(d) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return None
+    files: List[os.DirEntry] = []
+    subdirs: List[os.DirEntry] = []
+    for e in entries:
+        try:
+            if e.is_symlink() and symlinks == "skip":
+                continue
+            if e.is_dir(follow_symlinks=symlinks == "follow"):
+                subdirs.append(e)
+            elif e.is_file():
+                files.append(e)
+        except OSError:
+            continue
+    return files, subdirs
+
+
+def _stat_entries(entries: List[os.DirEntry]) -> List[Optional[os.stat_result]]:
+    out: List[Optional[os.stat_result]] = []
+    for e in entries:
+        try:
+            out.append(e.stat())
+        except OSError:
+            out.append(None)
     return out
 
 
-def write_json(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, indent=2, ensure_ascii=True), encoding="utf-8")
+def _make_listing(
+    files: List[os.DirEntry], stats: List[Optional[os.stat_result]], subdirs: List[os.DirEntry], keys: List[Optional[DirKey]]
+) -> _DirListing:
+    return _DirListing(
+        files=[(e.name, st) for e, st in zip(files, stats) if st is not None],
+        subdirs=[(e.name, k) for e, k in zip(subdirs, keys)],
+    )
 
 
-def write_csv(path: Path, rows: List[Dict[str, Any]], fieldnames: List[str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow({k: r.get(k, "") for k in fieldnames})
+async def _gather_listings(
+    roots: List[Path], exclude: List[str], symlinks: str, concurrency: int
+) -> Tuple[Dict[DirKey, Optional[_DirListing]], List[Optional[DirKey]]]:
+    # Every reachable, non-excluded directory is listed once (by inode), with up to
+    # `concurrency` scandir/stat calls in flight across the whole tree.
+    loop = asyncio.get_running_loop()
+    listings: Dict[DirKey, Optional[_DirListing]] = {}
+    scheduled: Set[DirKey] = set()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
 
+        def run(fn: Any, *a: Any) -> Any:
+            return loop.run_in_executor(pool, fn, *a)
 
-def main() -> int:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--root", action="append", required=True, help="Evidence root directory (repeatable).")
-    ap.add_argument("--seed-manifest", default="", help="Optional seed manifest JSON (array of {name,path,ext,category}).")
-    ap.add_argument("--out-dir", required=True, help="Output directory for reports/manifests (local-only).")
-    ap.add_argument("--evidence-root-name", default="evidence", help="Logical name used for manifest paths.")
-    ap.add_argument("--max-bytes-for-hash", type=int, default=0, help="If >0, only hash files <= this size (bytes).")
-    args = ap.parse_args()
+        async def visit(root: Path, d: Path, key: DirKey) -> None:
+            scanned = await run(_scan_dir, d, symlinks)
+            if scanned is None:
+                listings[key] = None
+                return
+            files, subdirs = scanned
+            batches = [files[i : i + STAT_BATCH] for i in range(0, len(files), STAT_BATCH)]
+            results = await asyncio.gather(
+                *(run(_stat_entries, b) for b in batches),
+                run(lambda: [_dir_key(e.path) for e in subdirs]),
+            )
+            stats = [st for part in results[:-1] for st in part]
+            keys = results[-1]
+            listings[key] = _make_listing(files, stats, subdirs, keys)
+            children = []
+            for e, k in zip(subdirs, keys):
+                rel = os.path.relpath(e.path, str(root)).replace("\\", "/")
+                if k is None or k in scheduled or glob_match(rel, e.name, exclude):
+                    continue
+                scheduled.add(k)
+                children.append(visit(root, Path(e.path), k))
+            await asyncio.gather(*children)
 
-    roots = [Path(r).expanduser().resolve() for r in args.root]
-    out_dir = Path(args.out_dir).expanduser().resolve()
-    seed_manifest_path = Path(args.seed_manifest).expanduser().resolve() if args.seed_manifest else None
+        root_keys = list(await asyncio.gather(*(run(_dir_key, str(r)) for r in roots)))
+        tops = []
+        for root, key in zip(roots, root_keys):
+            if key is not None and key not in scheduled:
+                scheduled.add(key)
+                tops.append(visit(root, root, key))
+        await asyncio.gather(*tops)
+    return listings, root_keys
 
-    for r in roots:
-        if not r.exists() or not r.is_dir():
-            print(f"ERROR: root not found or not a directory: {r}", file=sys.stderr)
-            return 2
 
-    seed_items = load_seed_manifest(seed_manifest_path)
+def scan_roots_async(
+    roots: List[Path],
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    symlinks: str = "files",
+    concurrency: int = 32,
+) -> List[ScanEntry]:
+    """
+    scan_roots() for high-latency filesystems (network shares, cloud-synced folders).
+
+    Directory reads and per-file stat() calls are issued from an asyncio loop onto a bounded
+    thread pool, so up to `concurrency` round-trips are in flight instead of one. Listings
+    are then replayed in scan_roots()' sorted depth-first order with the same filters,
+    symlink policy and cycle handling, so the result is the same list.
+    """
+    include = include or []
+    exclude = exclude or []
+    listings, root_keys = asyncio.run(_gather_listings(roots, exclude, symlinks, max(1, concurrency)))
+    out: List[ScanEntry] = []
+    for root, root_key in zip(roots, root_keys):
+        visited: Set[DirKey] = set()
+        stack: List[Tuple[Path, Optional[DirKey]]] = [(root, root_key)]
+        while stack:
+            d, key = stack.pop()
+            if key is None or key in visited:
+                continue
+            visited.add(key)
+            if key in listings:
+                listing = listings[key]
+            else:
+                # Only reached through a path the concurrent pass saw as excluded; list it now.
+                scanned = _scan_dir(d, symlinks)
+                listing = None
+                if scanned is not None:
+                    files, subdirs = scanned
+                    listing = _make_listing(files, _stat_entries(files), subdirs, [_dir_key(e.path) for e in subdirs])
+                listings[key] = listing
+            if listing is None:
+                continue
+            for name, st in listing.files:
+                path = os.path.join(str(d), name)
+                rel = os.path.relpath(path, str(root)).replace("\\", "/")
+                if exclude and glob_match(rel, name, exclude):
+                    continue
+                if include and not glob_match(rel, name, include):
+                    continue
+                out.append((root, Path(path), st))
+            subdirs = []
+            for name, k in listing.subdirs:
+                path = os.path.join(str(d), name)
+                if not glob_match(os.path.relpath(path, str(root)).replace("\\", "/"), name, exclude):
+                    subdirs.append((Path(path), k))
+            stack.extend(reversed(subdirs))
+    return out
 
+
+def discover_filename_terms(names: Iterable[str]) -> List[str]:
     # Extra term discovery from filenames only (safe): take tokens that look like proper nouns/acronyms.
     extra_terms: List[str] = []
     stop = set(["exhibit", "case", "copy", "final", "packet", "cover", "sheet", "talking", "points"])
-    for _, f in walk_roots(roots):
-        for tok in tokenize_filename(f.name):
+    for name in names:
+        for tok in tokenize_filename(name):
             if len(tok) < 4:
                 continue
             if tok.lower() in stop:
                 continue
             if tok.isupper() and tok.isalpha():
                 extra_terms.append(tok)
-    aliases = build_entity_aliases(extra_terms=list(dict.fromkeys(extra_terms)))
+    return list(dict.fromkeys(extra_terms))
 
-    indexed: List[IndexedFile] = []
-    by_hash: Dict[str, List[int]] = {}
 
-    for root, f in walk_roots(roots):
-        rel = os.path.relpath(str(f), str(root)).replace("\\", "/")
-        ext = f.suffix.lower().lstrip(".") or "file"
-        st = f.stat()
-        mtime_iso = dt.datetime.fromtimestamp(st.st_mtime).isoformat()
-
-        do_hash = True
-        if args.max_bytes_for_hash and st.st_size > args.max_bytes_for_hash:
-            do_hash = False
-        file_hash = sha256_file(f) if do_hash else ""
-
-        dates_fn = extract_dates_from_filename(f.name)
-        content_text: Optional[str] = None
-        extracted = False
-        dates_content: List[str] = []
-        entity_hits: Dict[str, int] = {}
-
-        # Attempt content extraction for a limited set of types.
-        if ext == "docx":
-            content_text = extract_docx_text(f)
-        elif ext == "pdf":
-            content_text = extract_pdf_text_optional(f)
-        elif ext in ("txt", "md", "csv", "json"):
-            try:
-                content_text = f.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                content_text = None
+# Bump when an extractor changes what it derives from the same bytes.
+EXTRACT_VERSION = 1
 
-        if content_text is not None:
-            extracted = True
-            dates_content = find_dates(content_text)
-            entity_hits = count_entity_hits(content_text, aliases)
-        else:
-            # Still do filename-only entity hits (safe) so we can map at least by name.
-            entity_hits = count_entity_hits(f.name, aliases)
-
-        category = infer_category(f.name, rel)
-
-        rec = IndexedFile(
-            source_root=str(root),
-            full_path=str(f),
-            rel_path=rel,
-            name=f.name,
-            ext=ext,
-            size=st.st_size,
-            mtime_iso=mtime_iso,
-            sha256=file_hash,
-            category=category,
-            content_extracted=extracted,
-            dates_from_filename=dates_fn,
-            dates_from_content=dates_content,
-            entity_hits=entity_hits,
-        )
-        idx = len(indexed)
-        indexed.append(rec)
-        if file_hash:
-            by_hash.setdefault(file_hash, []).append(idx)
 
-    # Build duplicates report (same hash across roots/paths).
-    dups = {h: idxs for h, idxs in by_hash.items() if len(idxs) > 1}
+@dataclass
+class ScanConfig:
+    """Per-run settings that determine what index_file() derives from a file."""
 
-    # Build entity map: canonical -> list of {path, count, basis}.
-    entity_map: Dict[str, List[Dict[str, Any]]] = {}
-    for rec in indexed:
-        for ent, c in rec.entity_hits.items():
-            entity_map.setdefault(ent, []).append(
-                {
-                    "path": rec.full_path,
-                    "count": c,
-                    "basis": "content" if rec.content_extracted else "filename",
-                }
-            )
+    matcher: AliasMatcher
+    date_order: str = "mdy"
+    max_bytes_for_hash: int = 0
+    pdf_page_workers: int = 1
+    pdf_text_cache: Optional[PdfPageTextCache] = None
+    # "all": full sha256 for every file; "content": only files whose content is extracted
+    # (they are read anyway), leaving dedupe of everything else to staged_duplicates().
+    hash_policy: str = "all"
+    # Build doc_terms() postings for extracted text (--term-index), with term ids keyed by
+    # term_key (load_term_key()).
+    term_index: bool = False
+    term_key: bytes = field(default=b"", repr=False)
+    # Index ZIP members, descending into nested ZIPs this many levels (--archive-depth; 0 = off).
+    archive_depth: int = 0
+    # Capture dates from media container headers (media_dates(); off with --no-media-metadata).
+    media_metadata: bool = False
+    # Entity ids of the records built with this config.
+    entities: EntityNames = field(default_factory=EntityNames, repr=False, compare=False)
 
-    # Timeline rows: date string + event stub + basis + source file.
-    timeline_rows: List[Dict[str, Any]] = []
-    for rec in indexed:
-        for d in rec.dates_from_filename:
-            timeline_rows.append(
-                {
-                    "date": d,
-                    "event": f"(inferred from filename) {rec.name}",
-                    "basis": "filename",
-                    "source_path": rec.full_path,
-                }
-            )
-        for d in rec.dates_from_content:
-            timeline_rows.append(
-                {
-                    "date": d,
-                    "event": f"(confirmed from content) {rec.name}",
-                    "basis": "content",
-                    "source_path": rec.full_path,
-                }
-            )
+    def kind(self, ext: str, depth: int = 0) -> str:
+        # content_kind(), plus "zip" for archives scanned at this nesting depth and "media"
+        # for files whose headers are parsed.
+        kind = content_kind(ext)
+        if not kind and ext == "zip" and depth < self.archive_depth:
+            return "zip"
+        if not kind and self.media_metadata and ext in MEDIA_METADATA_EXTS:
+            return "media"
+        return kind
 
-    # Simple gaps checklist heuristics based on category presence and keyword presence.
-    hay_all = " ".join([r.name.lower() for r in indexed])
-    gaps: List[str] = []
-    if "police report" not in hay_all and "ocso" not in hay_all and "osco" not in hay_all:
-        gaps.append("Police report not found by filename keywords (check if stored elsewhere or named differently).")
-    if not re.search(r"\bvideo\b|\.mov\b|\.mp4\b|\.mkv\b", hay_all):
-        gaps.append("Video evidence not found by filename keywords/extensions.")
-    if not re.search(r"\bmedical\b|\ber\b|hospital|trinity|bill|diagnosis", hay_all):
-        gaps.append("Medical records/bills not found by filename keywords.")
-    if "foia" not in hay_all:
-        gaps.append("FOIA items not found by filename keyword.")
-    if "contact list" not in hay_all and "witness" not in hay_all:
-        gaps.append("Witness contact list not found by filename keyword.")
+    def should_hash(self, f: Path, st: os.stat_result) -> bool:
+        if self.max_bytes_for_hash and st.st_size > self.max_bytes_for_hash:
+            return False
+        # Media are not read in full for their headers, so "content" does not hash them.
+        return self.hash_policy == "all" or self.kind(file_ext(f)) not in ("", "media")
 
-    # EvidenceVault manifest: choose a single logical root name; use full path for now,
-    # but prefix with evidence-root-name so the app can keep it distinct.
-    # (User can later rebase these paths by regenerating with a different convention.)
-    evidence_root_name = safe_norm(args.evidence_root_name) or "evidence"
-    manifest: List[Dict[str, str]] = []
-    for rec in indexed:
-        manifest.append(
-            {
-                "name": rec.name,
-                "path": f"{evidence_root_name}:{rec.full_path}",
-                "ext": rec.ext,
-                "category": rec.category,
-            }
-        )
+    def content_key(self) -> str:
+        # What stored extraction results depend on besides the bytes and the content kind.
+        # The alias table is not part of it: ContentStore checks it per row, for entity hits.
+        parts: List[Any] = [EXTRACT_VERSION, self.date_order, self.matcher.word_boundaries]
+        if self.term_index:
+            parts.append(term_key_check(self.term_key))
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
 
-    # Write outputs
-    out_dir.mkdir(parents=True, exist_ok=True)
-    write_json(out_dir / "indexed_files.json", [asdict(x) for x in indexed])
-    write_json(out_dir / "duplicates_by_sha256.json", dups)
-    write_json(out_dir / "entity_map.json", entity_map)
-    write_csv(out_dir / "inventory.csv", [asdict(x) for x in indexed], fieldnames=list(asdict(indexed[0]).keys()) if indexed else [])
-    write_csv(out_dir / "timeline.csv", timeline_rows, fieldnames=["date", "event", "basis", "source_path"])
-    write_json(out_dir / "evidence_vault_manifest.json", manifest)
-    write_json(out_dir / "seed_manifest_parsed.json", [asdict(x) for x in seed_items])
-    (out_dir / "gaps_checklist.md").write_text(
+    def fingerprint(self) -> str:
+        # Everything that shaped a run's results, the alias table included.
+        parts: List[Any] = [self.matcher.fingerprint(), self.date_order]
+        if self.term_index:
+            parts.append(term_key_check(self.term_key))
+        return self._key(parts)
+
+    def cache_key(self) -> str:
+        # What every FingerprintCache entry depends on besides the file. The alias table,
+        # which grows with filename-derived terms, is checked per entry instead (lookup()).
+        return self._key([self.content_key()])
+
+    def _key(self, parts: List[Any]) -> str:
+        if self.archive_depth:
+            parts.append(self.archive_depth)
+        if self.media_metadata:
+            parts.append("media-metadata")
+        blob = json.dumps(parts, ensure_ascii=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+CACHE_VERSION = 5
+
+
+class FingerprintCache:
+    """
+    On-disk per-file cache keyed by (path, size, mtime_ns, inode).
+
+    Stores only derived, PII-safe fields (hash, dates, entity counts, category);
+    never raw document text.
+
+    Entity hits counted in a file's content also depend on the alias table, so each entry
+    records the table's fingerprint. When the table has changed (say, a new filename-derived
+    term), lookup() misses the files whose content was extracted and they are matched
+    again; other files keep their entries, since make_record() recounts their
+    filename-only hits against the current table anyway.
+    """
+
+    def __init__(self, path: Path, config_key: str, alias_key: str) -> None:
+        self.path = path
+        self.config_key = config_key
+        # AliasMatcher.fingerprint() of the table hits are counted with (--watch updates it).
+        self.alias_key = alias_key
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.seen: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    @staticmethod
+    def stat_key(st: os.stat_result) -> List[int]:
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def lookup(self, full_path: str, st: os.stat_result, want_hash: bool) -> Optional[Dict[str, Any]]:
+        self.seen.add(full_path)
+        e = self.entries.get(full_path)
+        if (
+            not e
+            or e.get("stat") != self.stat_key(st)
+            or e.get("config_key") != self.config_key
+            or (want_hash and not e.get("sha256"))
+            or (e.get("aliases") != self.alias_key and self.content_hits(e))
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return e
+
+    @staticmethod
+    def content_hits(e: Dict[str, Any]) -> bool:
+        # Whether entry e holds entity hits counted in content (its own or an archive member's).
+        return bool(e.get("content_extracted")) or any(m.get("content_extracted") for m in e.get("members") or [])
+
+    def reject(self) -> None:
+        # The last lookup() hit turned out unusable (e.g. missing term postings).
+        self.hits -= 1
+        self.misses += 1
+
+    def store(self, rec: IndexedFile, st: os.stat_result, content: ContentResult) -> None:
+        self.seen.add(rec.full_path)
+        entry = self.entries[rec.full_path] = {
+            "stat": self.stat_key(st),
+            "config_key": self.config_key,
+            "aliases": self.alias_key,
+            "sha256": rec.sha256,
+            "category": rec.category,
+            "content_extracted": rec.content_extracted,
+            "dates_from_content": rec.dates_from_content,
+            "entity_hits": rec.entity_hits,
+            "page_refs": rec.page_refs,
+        }
+        if content.members is not None:
+            entry["members"] = [m.cache_entry() for m in content.members]
+
+    def save(self) -> None:
+        # Drop entries for files that no longer exist under the scanned roots.
+        entries = {k: v for k, v in self.entries.items() if k in self.seen}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "entries": entries}, ensure_ascii=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# Process-pool workers receive the config (incl. compiled matcher) once via the initializer.
+_WORKER_CONFIG: Optional[ScanConfig] = None
+
+
+@dataclass
+class ContentResult:
+    content_extracted: bool
+    dates_from_content: List[str]
+    entity_hits: Dict[str, int]
+    page_refs: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+    # doc_terms() postings when ScanConfig.term_index is set; None means not computed.
+    terms: Optional[bytes] = None
+    # Archive members in central-directory order (nested members follow their archive).
+    members: Optional[List["ArchiveMember"]] = None
+
+
+def analyze_pdf_pages(pages: List[str], cfg: ScanConfig) -> ContentResult:
+    # Per-page matching so each date/entity can be attributed to the page(s) it came from.
+    dates: Dict[str, List[int]] = {}
+    entities: Dict[str, List[int]] = {}
+    hits: Dict[str, int] = {}
+    for page_no, text in enumerate(pages, start=1):
+        if not text:
+            continue
+        with perf_stage("dates"):
+            for d in find_dates(text, cfg.date_order):
+                dates.setdefault(d, []).append(page_no)
+        with perf_stage("entities"):
+            for canonical, c in cfg.matcher.count(text).items():
+                hits[canonical] = hits.get(canonical, 0) + c
+                entities.setdefault(canonical, []).append(page_no)
+    terms: Optional[bytes] = None
+    if cfg.term_index:
+        with perf_stage("terms"):
+            terms = doc_terms(pages, cfg.term_key)
+    return ContentResult(
+        content_extracted=True,
+        dates_from_content=list(dates),
+        entity_hits=cfg.matcher.ordered(hits),
+        page_refs={"dates": dates, "entities": entities},
+        terms=terms,
+    )
+
+
+TEXT_EXTS = ("txt", "md", "csv", "json")
+
+
+def content_kind(ext: str) -> str:
+    # Extraction routine for an extension; "" means content is never read.
+    if ext in ("docx", "pdf"):
+        return ext
+    if ext in TEXT_EXTS:
+        return "text"
+    return ""
+
+
+# Text files are scanned in windows of TEXT_CHUNK_BYTES; matches may straddle a window edge
+# by up to TEXT_CHUNK_OVERLAP characters (longer than any date, alias or sane token).
+TEXT_CHUNK_BYTES = 1024 * 1024
+TEXT_CHUNK_OVERLAP = 256
+# Text files at least this large are streamed from disk instead of read into a FileBuffer.
+TEXT_STREAM_MIN_BYTES = MMAP_MIN_BYTES
+
+
+class ChunkedFinder:
+    """
+    pattern.finditer() over text that arrives in chunks.
+
+    Yields the same matches as one pass over the concatenated text, as long as each match
+    (with its lookahead) fits in `overlap` characters: matches starting in the last `overlap`
+    characters of a chunk are deferred until the next chunk supplies their right context,
+    scanning resumes after the last yielded match (so nothing is counted twice), and `overlap`
+    characters of left context are kept for lookbehinds and \\b. Holds at most one chunk plus
+    the overlap. Match objects are only valid until the next feed().
+    """
+
+    def __init__(self, pattern: re.Pattern[str], overlap: int = TEXT_CHUNK_OVERLAP) -> None:
+        self.pattern = pattern
+        self.overlap = overlap
+        self.buf = ""
+        self.pos = 0
+
+    def feed(self, chunk: str, final: bool = False) -> Iterator[re.Match[str]]:
+        # Must be consumed fully; the carried window is updated at the end.
+        buf = self.buf + chunk if self.buf else chunk
+        limit = len(buf) if final else len(buf) - self.overlap
+        pos = self.pos
+        for m in self.pattern.finditer(buf, pos):
+            if m.start() >= limit:
+                break
+            yield m
+            pos = m.end()
+        pos = max(pos, limit)
+        keep = max(0, pos - self.overlap)
+        self.buf = buf[keep:]
+        self.pos = pos - keep
+
+
+def read_text_chunks(f: Path, size: int, hasher: Any = None, chunk_bytes: int = TEXT_CHUNK_BYTES) -> Iterator[str]:
+    # UTF-8 (errors ignored, as read_text did) decoded chunk by chunk; multibyte sequences split
+    # across reads are carried by the incremental decoder. hasher, if given, sees every byte.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    buf = bytearray(chunk_bytes)
+    remaining = size
+    with f.open("rb") as fh, memoryview(buf) as view:
+        while True:
+            with perf_stage("read", max(0, min(chunk_bytes, remaining))):
+                n = fh.readinto(view) or 0
+            if not n:
+                break
+            remaining -= n
+            if hasher is not None:
+                with perf_stage("hash"):
+                    hasher.update(view[:n])
+            with perf_stage("text"):
+                text = decoder.decode(view[:n])
+            yield text
+    tail = decoder.decode(b"", True)
+    if tail:
+        yield tail
+
+
+def analyze_text(chunks: Iterable[str], cfg: ScanConfig) -> ContentResult:
+    """
+    Dates, entity hits and (with term_index) postings for text supplied in chunks, with memory
+    bounded by the chunk size rather than the file size. Results are identical to scanning
+    the whole text at once; a single chunk is just the whole text.
+    """
+    dates: Dict[str, None] = {}
+    memo: Dict[str, Optional[str]] = {}
+    hits: Dict[str, int] = {}
+    date_finder = ChunkedFinder(DATE_SCANNER)
+    pattern = cfg.matcher.pattern
+    entity_finder = ChunkedFinder(pattern, max(TEXT_CHUNK_OVERLAP, cfg.matcher.longest + 16)) if pattern else None
+    terms = DocTerms(cfg.term_key) if cfg.term_index else None
+    token_finder = ChunkedFinder(TERM_TOKEN) if terms is not None else None
+
+    def scan(chunk: str, final: bool) -> None:
+        with perf_stage("dates"):
+            collect_dates(date_finder.feed(chunk, final), cfg.date_order, dates, memo)
+        if entity_finder is None and token_finder is None:
+            return
+        lower = chunk.lower()
+        if entity_finder is not None:
+            with perf_stage("entities"):
+                cfg.matcher.tally(entity_finder.feed(lower, final), hits)
+        if token_finder is not None:
+            with perf_stage("terms"):
+                terms.add(m.group(0) for m in token_finder.feed(lower, final))  # type: ignore[union-attr]
+
+    pending: Optional[str] = None
+    for chunk in chunks:
+        if pending is not None:
+            scan(pending, False)
+        pending = chunk
+    scan(pending or "", True)
+    encoded: Optional[bytes] = None
+    if terms is not None:
+        with perf_stage("terms"):
+            encoded = terms.encode()
+    return ContentResult(True, list(dates), cfg.matcher.ordered(hits), terms=encoded)
+
+
+# Media whose capture date is read from container headers (ScanConfig.media_metadata):
+# ISO base media (MP4/MOV/M4A/HEIC) mvhd creation time, iTunes-style ©day tags and HEIC
+# Exif items; JPEG Exif; WAV bext/INFO chunks.
+MEDIA_METADATA_EXTS = ("mov", "mp4", "m4v", "m4a", "3gp", "heic", "heif", "jpg", "jpeg", "wav")
+# Header bytes read per file at most; sample data (mdat, image scans, PCM) is seeked over.
+MEDIA_HEADER_MAX_BYTES = 1024 * 1024
+# Largest single box/segment/chunk parsed (an Exif APP1 segment is at most 64 KB).
+MEDIA_BOX_MAX_BYTES = 256 * 1024
+# ISO base media times count seconds from 1904-01-01 UTC.
+_BMFF_EPOCH = dt.datetime(1904, 1, 1, tzinfo=dt.timezone.utc)
+# Exif "YYYY:MM:DD hh:mm:ss", ISO 8601 tags, and the separators BWF allows in bext dates.
+_HEADER_DATE = re.compile(rb"\s*(\d{4})[-:_/. ](\d{2})[-:_/. ](\d{2})")
+
+
+class _HeaderReader:
+    """Positioned reads from a seekable media file, within a total byte budget."""
+
+    def __init__(self, fh: BinaryIO, budget: int = MEDIA_HEADER_MAX_BYTES) -> None:
+        self.fh = fh
+        fh.seek(0, io.SEEK_END)
+        self.size = fh.tell()
+        self.budget = budget
+
+    def read(self, pos: int, n: int) -> bytes:
+        # Short (possibly empty) once the file or the budget runs out.
+        n = max(0, min(n, self.size - pos, self.budget, MEDIA_BOX_MAX_BYTES))
+        if not n:
+            return b""
+        self.budget -= n
+        with perf_stage("media", n):
+            self.fh.seek(pos)
+            return self.fh.read(n)
+
+
+def _media_date(y: int, mo: int, d: int) -> Optional[str]:
+    # Unset camera clocks land on 1904/1970; those are not capture dates.
+    try:
+        day = dt.date(y, mo, d)
+    except ValueError:
+        return None
+    return day.isoformat() if day.year > 1970 else None
+
+
+def _header_date(raw: bytes) -> Optional[str]:
+    m = _HEADER_DATE.match(raw)
+    return _media_date(int(m.group(1)), int(m.group(2)), int(m.group(3))) if m else None
+
+
+def _bmff_boxes(r: _HeaderReader, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    # (type, payload start, box end) for the ISO base media boxes in [start, end).
+    pos = start
+    while pos + 8 <= end:
+        head = r.read(pos, 16)
+        if len(head) < 8:
+            return
+        size, kind = struct.unpack(">I4s", head[:8])
+        hdr = 8
+        if size == 1:
+            if len(head) < 16:
+                return
+            size, hdr = struct.unpack(">Q", head[8:16])[0], 16
+        elif size == 0:
+            size = end - pos
+        if size < hdr:
+            return
+        yield kind, pos + hdr, min(pos + size, end)
+        pos += size
+
+
+def _bmff_child(r: _HeaderReader, start: int, end: int, kind: bytes) -> Optional[Tuple[int, int]]:
+    for k, body, stop in _bmff_boxes(r, start, end):
+        if k == kind:
+            return body, stop
+    return None
+
+
+def _meta_children(r: _HeaderReader, body: int) -> int:
+    # MP4 'meta' is a full box (4 bytes of version/flags first); QuickTime's is not.
+    return body if r.read(body + 4, 4) == b"hdlr" else body + 4
+
+
+def _mvhd_date(data: bytes) -> Optional[str]:
+    if len(data) >= 12 and data[0] == 1:
+        secs = struct.unpack(">Q", data[4:12])[0]
+    elif len(data) >= 8:
+        secs = struct.unpack(">I", data[4:8])[0]
+    else:
+        return None
+    try:
+        when = _BMFF_EPOCH + dt.timedelta(seconds=secs)
+    except OverflowError:
+        return None
+    return _media_date(when.year, when.month, when.day)
+
+
+def _exif_dates(tiff: bytes) -> List[str]:
+    """
+    Capture date from a TIFF-structured Exif block: DateTimeOriginal, else DateTimeDigitized,
+    else the IFD0 DateTime. Values are camera wall-clock time, taken as written.
+    """
+    endian = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if endian is None or len(tiff) < 8:
+        return []
+
+    def entries(off: int) -> Dict[int, Tuple[int, int, bytes]]:
+        # tag -> (type, count, 4-byte value/offset field)
+        if off + 2 > len(tiff):
+            return {}
+        n = struct.unpack(endian + "H", tiff[off : off + 2])[0]
+        out: Dict[int, Tuple[int, int, bytes]] = {}
+        for i in range(n):
+            e = tiff[off + 2 + 12 * i : off + 14 + 12 * i]
+            if len(e) < 12:
+                break
+            tag, typ, count = struct.unpack(endian + "HHI", e[:8])
+            out[tag] = (typ, count, e[8:12])
+        return out
+
+    def ascii_date(entry: Optional[Tuple[int, int, bytes]]) -> Optional[str]:
+        if entry is None or entry[0] != 2:
+            return None
+        _, count, field = entry
+        if count <= 4:
+            raw = field[:count]
+        else:
+            off = struct.unpack(endian + "I", field)[0]
+            raw = tiff[off : off + count]
+        return _header_date(raw)
+
+    ifd0 = entries(struct.unpack(endian + "I", tiff[4:8])[0])
+    exif: Dict[int, Tuple[int, int, bytes]] = {}
+    if 0x8769 in ifd0:
+        exif = entries(struct.unpack(endian + "I", ifd0[0x8769][2])[0])
+    for d in (ascii_date(exif.get(0x9003)), ascii_date(exif.get(0x9004)), ascii_date(ifd0.get(0x0132))):
+        if d:
+            return [d]
+    return []
+
+
+def _bmff_dates(r: _HeaderReader) -> List[str]:
+    # Top-level boxes only are walked; mdat is skipped by its size, wherever moov sits.
+    out: List[str] = []
+    for kind, body, stop in _bmff_boxes(r, 0, r.size):
+        if kind == b"moov":
+            mvhd = _bmff_child(r, body, stop, b"mvhd")
+            if mvhd:
+                d = _mvhd_date(r.read(mvhd[0], 12))
+                if d:
+                    out.append(d)
+            udta = _bmff_child(r, body, stop, b"udta")
+            meta = _bmff_child(r, udta[0], udta[1], b"meta") if udta else None
+            ilst = _bmff_child(r, _meta_children(r, meta[0]), meta[1], b"ilst") if meta else None
+            day = _bmff_child(r, ilst[0], ilst[1], b"\xa9day") if ilst else None
+            data = _bmff_child(r, day[0], day[1], b"data") if day else None
+            # data box: 4 bytes type, 4 bytes locale, then the value ("2024-03-09T18:02:11Z").
+            d = _header_date(r.read(data[0] + 8, 32)) if data else None
+            if d:
+                out.append(d)
+        elif kind == b"meta":
+            out.extend(_heif_exif_dates(r, _meta_children(r, body), stop))
+    return out
+
+
+def _heif_exif_dates(r: _HeaderReader, start: int, end: int) -> List[str]:
+    # HEIC: the 'Exif' item named in iinf, located through iloc.
+    iinf = _bmff_child(r, start, end, b"iinf")
+    iloc = _bmff_child(r, start, end, b"iloc")
+    if not iinf or not iloc:
+        return []
+    version = r.read(iinf[0], 1)
+    first = iinf[0] + (6 if version == b"\x00" else 8)
+    item_id: Optional[int] = None
+    for kind, body, _ in _bmff_boxes(r, first, iinf[1]):
+        head = r.read(body, 12)
+        if kind != b"infe" or len(head) < 12 or head[0] < 2:
+            continue
+        if head[0] == 2:
+            iid, item_type = struct.unpack(">H", head[4:6])[0], head[8:12]
+        else:
+            iid, item_type = struct.unpack(">I", head[4:8])[0], r.read(body + 10, 4)
+        if item_type == b"Exif":
+            item_id = iid
+            break
+    if item_id is None:
+        return []
+    data = r.read(iloc[0], iloc[1] - iloc[0])
+    extent = _iloc_extent(data, item_id)
+    if extent is None:
+        return []
+    blob = r.read(*extent)
+    if len(blob) < 4:
+        return []
+    # Item payload: offset to the TIFF header (past "Exif\0\0"), then the Exif block.
+    return _exif_dates(blob[4 + struct.unpack(">I", blob[:4])[0] :])
+
+
+def _iloc_extent(data: bytes, item_id: int) -> Optional[Tuple[int, int]]:
+    # (file offset, length) of the first extent of item_id; None unless stored in this file.
+    version = data[0]
+    sizes = data[4] << 8 | data[5]
+    off_size, len_size, base_size = sizes >> 12, (sizes >> 8) & 0xF, (sizes >> 4) & 0xF
+    index_size = sizes & 0xF if version in (1, 2) else 0
+    pos = 6
+
+    def uint(n: int) -> int:
+        nonlocal pos
+        v = int.from_bytes(data[pos : pos + n], "big")
+        pos += n
+        return v
+
+    count = uint(2 if version < 2 else 4)
+    for _ in range(count):
+        iid = uint(2 if version < 2 else 4)
+        method = uint(2) & 0xF if version in (1, 2) else 0
+        uint(2)  # data_reference_index
+        base = uint(base_size)
+        extents = [(uint(index_size), uint(off_size), uint(len_size))[1:] for _ in range(uint(2))]
+        if pos > len(data):
+            return None
+        if iid == item_id:
+            return (base + extents[0][0], extents[0][1]) if method == 0 and extents else None
+    return None
+
+
+def _jpeg_dates(r: _HeaderReader) -> List[str]:
+    # Marker segments up to the start of scan; Exif lives in an APP1 segment.
+    pos = 2
+    while True:
+        head = r.read(pos, 4)
+        if len(head) < 2 or head[0] != 0xFF:
+            return []
+        marker = head[1]
+        if marker == 0xFF:
+            pos += 1  # fill byte
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            pos += 2  # no length field
+            continue
+        if marker in (0xD9, 0xDA) or len(head) < 4:
+            return []
+        length = struct.unpack(">H", head[2:4])[0]
+        if marker == 0xE1:
+            seg = r.read(pos + 4, length - 2)
+            if seg.startswith(b"Exif\x00\x00"):
+                return _exif_dates(seg[6:])
+        pos += 2 + length
+
+
+def _wav_dates(r: _HeaderReader) -> List[str]:
+    # Broadcast WAV bext OriginationDate and LIST/INFO ICRD; the data chunk is skipped by size.
+    if r.read(8, 4) != b"WAVE":
+        return []
+    out: List[str] = []
+    pos = 12
+    while pos + 8 <= r.size:
+        head = r.read(pos, 8)
+        if len(head) < 8:
+            break
+        cid, size = head[:4], struct.unpack("<I", head[4:8])[0]
+        body = pos + 8
+        if cid == b"bext":
+            # Description(256) Originator(32) OriginatorReference(32), then "yyyy-mm-dd".
+            d = _header_date(r.read(body + 320, 10))
+            if d:
+                out.append(d)
+        elif cid == b"LIST" and r.read(body, 4) == b"INFO":
+            sub, stop = body + 4, body + size
+            while sub + 8 <= stop:
+                shead = r.read(sub, 8)
+                if len(shead) < 8:
+                    break
+                ssize = struct.unpack("<I", shead[4:8])[0]
+                if shead[:4] == b"ICRD":
+                    d = _header_date(r.read(sub + 8, min(ssize, 32)))
+                    if d:
+                        out.append(d)
+                sub += 8 + ssize + (ssize & 1)
+        pos = body + size + (size & 1)
+    return out
+
+
+def media_dates(fh: BinaryIO, ext: str) -> List[str]:
+    """
+    Capture dates (ISO, de-duped) from a media file's container headers. Only box, segment
+    and chunk headers plus the few small metadata payloads are read (at most
+    MEDIA_HEADER_MAX_BYTES), so the cost does not grow with the size of the recording.
+    Malformed headers yield no dates.
+    """
+    r = _HeaderReader(fh)
+    try:
+        if ext in ("jpg", "jpeg"):
+            found = _jpeg_dates(r) if r.read(0, 2) == b"\xff\xd8" else []
+        elif ext == "wav":
+            found = _wav_dates(r) if r.read(0, 4) == b"RIFF" else []
+        else:
+            found = _bmff_dates(r)
+    except (struct.error, IndexError, ValueError):
+        return []
+    return list(dict.fromkeys(found))
+
+
+def analyze_content(
+    f: Path, ext: str, cfg: ScanConfig, file_hash: str = "", fb: Optional[Union[FileBuffer, BytesBuffer]] = None
+) -> ContentResult:
+    """
+    Derive dates/entity hits from file content only, so the result is a pure function of
+    (bytes, content kind, ScanConfig) and can be shared by every copy with the same sha256.
+    Filename-based fallbacks are applied later, in make_record(). With fb, content is taken
+    from the already-read buffer rather than reopening the file.
+    """
+    content_text: Optional[str] = None
+    kind = cfg.kind(ext)
+
+    # Attempt content extraction for a limited set of types.
+    if kind == "docx":
+        with perf_stage("docx"):
+            content_text = extract_docx_text(fb.stream() if fb else f)
+    elif kind == "pdf":
+        # Inside a --workers process, parallelism is already across files; don't nest pools.
+        page_workers = cfg.pdf_page_workers if _WORKER_CONFIG is None else 1
+        with perf_stage("pdf"):
+            pages = extract_pdf_pages(
+                f,
+                page_workers=page_workers,
+                file_hash=file_hash,
+                text_cache=cfg.pdf_text_cache,
+                stream=fb.stream() if fb else None,
+            )
+        if pages is not None:
+            return analyze_pdf_pages(pages, cfg)
+    elif kind == "media":
+        # Nothing is extracted as text; the capture dates stand in for content dates.
+        try:
+            with fb.stream() if fb else f.open("rb") as fh:
+                dates = media_dates(fh, ext)
+        except OSError:
+            dates = []
+        return ContentResult(False, dates, {})
+    elif kind == "text":
+        try:
+            if fb is None:
+                return analyze_text(read_text_chunks(f, f.stat().st_size), cfg)
+            with perf_stage("text"):
+                content_text = fb.text()
+        except Exception:
+            content_text = None
+
+    if content_text is not None:
+        return analyze_text([content_text], cfg)
+    return ContentResult(False, [], {})
+
+
+# Separates an archive's path from a member's path inside it: bundle.zip!/dir/file.docx.
+ARCHIVE_SEP = "!/"
+# Members up to this size are decompressed into memory, hashed and extracted from there;
+# larger ones are streamed (text is still scanned in chunks, other kinds are only hashed).
+ARCHIVE_MEMBER_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class ArchiveMember:
+    inner: str  # path inside the top-level archive, nested levels joined by ARCHIVE_SEP
+    size: int
+    mtime: float
+    sha256: str
+    content: ContentResult
+    from_store: bool = False
+
+    def cache_entry(self) -> Dict[str, Any]:
+        # The member as FingerprintCache keeps it; from_cache() reads back these keys.
+        return {
+            "inner": self.inner,
+            "size": self.size,
+            "mtime": self.mtime,
+            "sha256": self.sha256,
+            "content_extracted": self.content.content_extracted,
+            "dates_from_content": self.content.dates_from_content,
+            "entity_hits": self.content.entity_hits,
+            "page_refs": self.content.page_refs,
+        }
+
+    @classmethod
+    def from_cache(cls, e: Dict[str, Any], terms: Optional[bytes] = None) -> "ArchiveMember":
+        # terms: the member's postings, which the cache does not hold (lookup_cached() gets
+        # them from the content store).
+        content = ContentResult(
+            content_extracted=bool(e["content_extracted"]),
+            dates_from_content=list(e["dates_from_content"]),
+            entity_hits=dict(e["entity_hits"]),
+            page_refs=dict(e["page_refs"]),
+            terms=terms,
+        )
+        return cls(e["inner"], int(e["size"]), float(e["mtime"]), e["sha256"], content, from_store=True)
+
+
+def _zip_mtime(info: zipfile.ZipInfo) -> float:
+    # ZIP timestamps are local wall-clock time, like the fromtimestamp() in make_record().
+    try:
+        return time.mktime(info.date_time + (0, 0, -1))
+    except (OverflowError, ValueError):
+        return 0.0
+
+
+def _stream_member(fh: BinaryIO, hasher: Any, chunk_bytes: int = TEXT_CHUNK_BYTES) -> Iterator[bytes]:
+    while True:
+        with perf_stage("archive"):
+            chunk = fh.read(chunk_bytes)
+        if not chunk:
+            return
+        with perf_stage("hash"):
+            hasher.update(chunk)
+        yield chunk
+
+
+def _decode_chunks(chunks: Iterable[bytes]) -> Iterator[str]:
+    # Same decoding as read_text_chunks(), for bytes that do not come from a file on disk.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    for chunk in chunks:
+        with perf_stage("text"):
+            text = decoder.decode(chunk)
+        yield text
+    tail = decoder.decode(b"", True)
+    if tail:
+        yield tail
+
+
+def scan_archive(
+    stream: Any, cfg: ScanConfig, store: Optional[ContentStore] = None, depth: int = 1, prefix: str = ""
+) -> List[ArchiveMember]:
+    """
+    Hash and extract every member of a ZIP read from `stream`, walking the central directory
+    and decompressing members in memory (nothing is written to disk).
+
+    Members whose sha256 is already in the store skip extraction, as files do. ZIP members
+    are descended into while depth < cfg.archive_depth. Encrypted or unreadable members are
+    listed with an empty sha256 and no content; a stream that is not a readable ZIP yields
+    no members.
+    """
+    members: List[ArchiveMember] = []
+    # Page fan-out needs a real path; members are parsed from memory.
+    member_cfg = replace(cfg, pdf_page_workers=1) if cfg.pdf_page_workers > 1 else cfg
+    try:
+        zf = zipfile.ZipFile(stream)
+    except Exception:
+        return members
+    with zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            inner = prefix + info.filename
+            ext = file_ext(Path(info.filename))
+            kind = cfg.kind(ext, depth)
+            m = ArchiveMember(inner, info.file_size, _zip_mtime(info), "", ContentResult(False, [], {}))
+            members.append(m)
+            nested: List[ArchiveMember] = []
+            if info.flag_bits & 0x1:
+                continue  # encrypted: listed, never read
+            try:
+                with zf.open(info) as fh:
+                    if kind and info.file_size <= ARCHIVE_MEMBER_MAX_BYTES:
+                        with perf_stage("archive", info.file_size):
+                            buf = BytesBuffer(fh.read(ARCHIVE_MEMBER_MAX_BYTES + 1))
+                        if buf.size > ARCHIVE_MEMBER_MAX_BYTES:
+                            # Declared size was wrong (or a decompression bomb): hash only.
+                            hasher = hashlib.sha256(buf.view)
+                            for _ in _stream_member(fh, hasher):
+                                pass
+                            m.sha256 = hasher.hexdigest()
+                            continue
+                        with perf_stage("hash"):
+                            m.sha256 = buf.sha256()
+                        if kind == "zip":
+                            nested = scan_archive(buf.stream(), cfg, store, depth + 1, inner + ARCHIVE_SEP)
+                            continue
+                        stored = None
+                        if store is not None and kind != "media":
+                            with perf_stage("store"):
+                                stored = store.peek(m.sha256, kind, want_terms=cfg.term_index)
+                        if stored is not None:
+                            m.content, m.from_store = stored, True
+                        else:
+                            m.content = analyze_content(Path(info.filename), ext, member_cfg, m.sha256, buf)
+                    else:
+                        hasher = hashlib.sha256()
+                        if kind == "text":
+                            m.content = analyze_text(_decode_chunks(_stream_member(fh, hasher)), cfg)
+                        else:
+                            for _ in _stream_member(fh, hasher):
+                                pass
+                        m.sha256 = hasher.hexdigest()
+            except Exception:
+                # Bad CRC, unsupported compression, truncated archive.
+                m.sha256, m.content = "", ContentResult(False, [], {})
+            finally:
+                members.extend(nested)
+    return members
+
+
+class ContentStore:
+    """
+    Content-addressed SQLite sidecar: extraction results keyed by (sha256, content kind,
+    ScanConfig.content_key()).
+
+    A file whose hash is already known (from an earlier copy in this run, or any previous run)
+    skips extraction entirely. Entity hits found in content also depend on the alias table,
+    so each row records the table's fingerprint; when the table has changed (typically a
+    new filename-derived term), rows with extracted content miss and are re-extracted and
+    replaced. Holds only derived, PII-safe fields -- never raw text (term postings are hashes
+    keyed with --term-key). Written from the main thread only; --workers processes open it read-only (WAL mode lets
+    them read while the main thread writes) so they can skip extraction for known hashes.
+    """
+
+    # Commit often enough that worker processes see recent results.
+    COMMIT_EVERY = 64
+
+    def __init__(self, path: Path, config_key: str, alias_key: str, readonly: bool = False) -> None:
+        self.path = path
+        self.config_key = config_key
+        # AliasMatcher.fingerprint() of the run's alias table.
+        self.alias_key = alias_key
+        self.hits = 0
+        self.misses = 0
+        self._uncommitted = 0
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS content ("
+            " sha256 TEXT NOT NULL, kind TEXT NOT NULL, config_key TEXT NOT NULL,"
+            " extracted INTEGER NOT NULL, dates TEXT NOT NULL, entity_hits TEXT NOT NULL, page_refs TEXT NOT NULL,"
+            " PRIMARY KEY (sha256, kind, config_key)) WITHOUT ROWID"
+        )
+        # Columns added after the first schema: term postings (hashed terms, see doc_terms; NULL
+        # when extracted without --term-index) and the alias table the hits were counted with.
+        for column in ("terms BLOB", "aliases TEXT"):
+            try:
+                self.conn.execute(f"ALTER TABLE content ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass
+
+    def peek(self, sha256: str, kind: str, want_terms: bool = False) -> Optional[ContentResult]:
+        row = self.conn.execute(
+            "SELECT extracted, dates, entity_hits, page_refs, terms, aliases FROM content WHERE sha256=? AND kind=? AND config_key=?",
+            (sha256, kind, self.config_key),
+        ).fetchone()
+        if row is None or (want_terms and row[0] and row[4] is None) or (row[0] and row[5] != self.alias_key):
+            return None
+        terms = bytes(row[4]) if row[4] is not None else None
+        return ContentResult(bool(row[0]), json.loads(row[1]), json.loads(row[2]), json.loads(row[3]), terms=terms)
+
+    def count(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def put(self, sha256: str, kind: str, res: ContentResult) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO content (sha256, kind, config_key, extracted, dates, entity_hits, page_refs, terms, aliases)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                sha256,
+                kind,
+                self.config_key,
+                int(res.content_extracted),
+                json.dumps(res.dates_from_content, ensure_ascii=True),
+                json.dumps(res.entity_hits, ensure_ascii=True),
+                json.dumps(res.page_refs, ensure_ascii=True),
+                res.terms,
+                self.alias_key,
+            ),
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_EVERY:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+
+def file_ext(f: Path) -> str:
+    return f.suffix.lower().lstrip(".") or "file"
+
+
+def make_record(
+    root: Path,
+    f: Path,
+    st: os.stat_result,
+    cfg: ScanConfig,
+    file_hash: str,
+    content: ContentResult,
+    category: Optional[str] = None,
+) -> IndexedFile:
+    rel = os.path.relpath(str(f), str(root)).replace("\\", "/")
+    entity_hits = content.entity_hits
+    if not content.content_extracted:
+        # Still do filename-only entity hits (safe) so we can map at least by name.
+        entity_hits = count_entity_hits(f.name, cfg.matcher)
+    return IndexedFile(
+        source_root=str(root),
+        full_path=str(f),
+        rel_path=rel,
+        name=f.name,
+        ext=file_ext(f),
+        size=st.st_size,
+        mtime_iso=dt.datetime.fromtimestamp(st.st_mtime).isoformat(),
+        sha256=file_hash,
+        category=category or infer_category(f.name, rel),
+        content_extracted=content.content_extracted,
+        dates_from_filename=extract_dates_from_filename(f.name, cfg.date_order),
+        dates_from_content=content.dates_from_content,
+        entity_hits=entity_hits,
+        page_refs=content.page_refs,
+        entities=cfg.entities,
+    )
+
+
+def record_from_cache(
+    root: Path, f: Path, st: os.stat_result, cfg: ScanConfig, cached: Dict[str, Any], do_hash: bool
+) -> IndexedFile:
+    content = ContentResult(
+        content_extracted=bool(cached["content_extracted"]),
+        dates_from_content=list(cached["dates_from_content"]),
+        entity_hits=dict(cached["entity_hits"]),
+        page_refs=dict(cached.get("page_refs") or {}),
+    )
+    return make_record(root, f, st, cfg, cached["sha256"] if do_hash else "", content, category=cached["category"])
+
+
+def member_record(container: IndexedFile, m: ArchiveMember, cfg: ScanConfig) -> IndexedFile:
+    # make_record() for an archive member: a virtual path under its container, fields from the ZIP entry.
+    name = m.inner.rsplit("/", 1)[-1]
+    rel = container.rel_path + ARCHIVE_SEP + m.inner
+    content = m.content
+    entity_hits = content.entity_hits if content.content_extracted else count_entity_hits(name, cfg.matcher)
+    return IndexedFile(
+        source_root=container.source_root,
+        full_path=container.full_path + ARCHIVE_SEP + m.inner,
+        rel_path=rel,
+        name=name,
+        ext=file_ext(Path(name)),
+        size=m.size,
+        mtime_iso=dt.datetime.fromtimestamp(m.mtime).isoformat(),
+        sha256=m.sha256,
+        category=infer_category(name, rel),
+        content_extracted=content.content_extracted,
+        dates_from_filename=extract_dates_from_filename(name, cfg.date_order),
+        dates_from_content=content.dates_from_content,
+        entity_hits=entity_hits,
+        page_refs=content.page_refs,
+        entities=cfg.entities,
+    )
+
+
+def hash_and_analyze(
+    f: Path,
+    st: os.stat_result,
+    cfg: ScanConfig,
+    do_hash: bool,
+    store: Optional[ContentStore] = None,
+) -> Tuple[str, ContentResult, bool]:
+    """
+    Hash and extract a file from a single read. Returns (sha256, content, from_store).
+
+    Files whose content is extracted are read once into a FileBuffer; the digest is taken
+    from that buffer and, unless the store already knows it, the extractors parse the same
+    memory. Other files are only streamed through sha256_file(). Text files of
+    TEXT_STREAM_MIN_BYTES or more are hashed and scanned chunk by chunk in one pass instead;
+    their digest is only known at the end, so a store entry cannot spare the scan. ZIPs
+    (with --archive-depth) are read the same way and their members scanned by scan_archive().
+    Media only have their headers parsed; hashing them, if asked for, is a separate stream.
+    """
+    ext = file_ext(f)
+    kind = cfg.kind(ext)
+    if not kind:
+        return hash_file(f, st.st_size, do_hash), ContentResult(False, [], {}), False
+    if kind == "media":
+        return hash_file(f, st.st_size, do_hash), analyze_content(f, ext, cfg), False
+    if kind == "text" and st.st_size >= TEXT_STREAM_MIN_BYTES:
+        hasher = hashlib.sha256() if do_hash else None
+        content = analyze_text(read_text_chunks(f, st.st_size, hasher), cfg)
+        return (hasher.hexdigest() if hasher else ""), content, False
+    with FileBuffer(f, st.st_size) as fb:
+        file_hash = ""
+        if do_hash:
+            with perf_stage("hash"):
+                file_hash = fb.sha256()
+        if kind == "zip":
+            return file_hash, ContentResult(False, [], {}, members=scan_archive(fb.stream(), cfg, store)), False
+        if store is not None and file_hash:
+            with perf_stage("store"):
+                stored = store.peek(file_hash, kind, want_terms=cfg.term_index)
+            if stored is not None:
+                return file_hash, stored, True
+        return file_hash, analyze_content(f, ext, cfg, file_hash, fb), False
+
+
+def hash_file(f: Path, size: int, do_hash: bool) -> str:
+    # Hash-only path (no content extraction); streamed, so the read counts as hashing.
+    if not do_hash:
+        return ""
+    with perf_stage("hash", size):
+        return sha256_file(f)
+
+
+def _hash_with_stages(f: Path, size: int, profile: bool) -> Tuple[str, Optional[FileStages]]:
+    # Thread-pool task for hash-only files; returns the thread's stage timings with the digest.
+    begin_file_stages(profile)
+    return hash_file(f, size, True), end_file_stages()
+
+
+def keep_result(store: Optional[ContentStore], f: Path, file_hash: str, content: ContentResult, from_store: bool) -> None:
+    # Archives themselves are not stored (their members are, one by one), nor are media
+    # header dates (a few small reads; cheaper than the lookup).
+    kind = content_kind(file_ext(f))
+    if store is None or not file_hash or not kind:
+        return
+    store.count(from_store)
+    if not from_store:
+        store.put(file_hash, kind, content)
+
+
+def lookup_cached(
+    cache: Optional[FingerprintCache],
+    store: Optional[ContentStore],
+    cfg: ScanConfig,
+    f: Path,
+    st: os.stat_result,
+    do_hash: bool,
+) -> Optional[Dict[str, Any]]:
+    # Fingerprint-cache hit, completed with term postings from the content store when a term
+    # index is being built: "terms" for the file, "member_terms" for its archive members
+    # (aligned with "members"). Without stored postings the file has to be re-extracted.
+    cached = cache.lookup(str(f), st, want_hash=do_hash) if cache else None
+    if cached is None or not cfg.term_index:
+        return cached
+
+    def stored_terms(sha256: str, path: Path) -> Optional[bytes]:
+        stored = store.peek(sha256, content_kind(file_ext(path)), want_terms=True) if store and sha256 else None
+        return stored.terms if stored is not None else None
+
+    if cached.get("content_extracted"):
+        terms = stored_terms(cached["sha256"], f)
+        if terms is None:
+            cache.reject()  # type: ignore[union-attr]
+            return None
+        cached = {**cached, "terms": terms}
+    if cached.get("members"):
+        member_terms: List[Optional[bytes]] = []
+        for e in cached["members"]:
+            terms = None
+            if e["content_extracted"]:
+                terms = stored_terms(e["sha256"], Path(e["inner"]))
+                if terms is None:
+                    cache.reject()  # type: ignore[union-attr]
+                    return None
+            member_terms.append(terms)
+        cached = {**cached, "member_terms": member_terms}
+    return cached
+
+
+def build_records(
+    root: Path,
+    f: Path,
+    st: os.stat_result,
+    cfg: ScanConfig,
+    do_hash: bool,
+    cached: Optional[Dict[str, Any]],
+    result: Optional[Tuple[str, ContentResult, bool]],
+    cache: Optional[FingerprintCache] = None,
+    store: Optional[ContentStore] = None,
+    term_index: Optional[TermIndexWriter] = None,
+) -> List[IndexedFile]:
+    """
+    Main-thread half of indexing one walked file: the record from a cache hit or from a
+    hash_and_analyze() result, followed by one record per archive member. Updates the store,
+    the fingerprint cache and the term index in that same order.
+    """
+    if cached is not None:
+        if term_index is not None:
+            term_index.add(cached.get("terms"))
+        rec = record_from_cache(root, f, st, cfg, cached, do_hash)
+        entries = cached.get("members") or []
+        member_terms = cached.get("member_terms") or [None] * len(entries)
+        members = [ArchiveMember.from_cache(e, terms) for e, terms in zip(entries, member_terms)]
+    else:
+        file_hash, content, from_store = result or ("", ContentResult(False, [], {}), False)
+        keep_result(store, f, file_hash, content, from_store)
+        if term_index is not None:
+            term_index.add(content.terms)
+        rec = make_record(root, f, st, cfg, file_hash, content)
+        members = content.members or []
+        for m in members:
+            keep_result(store, Path(m.inner), m.sha256, m.content, m.from_store)
+        if cache:
+            cache.store(rec, st, content)
+    recs = [rec]
+    for m in members:
+        if term_index is not None:
+            term_index.add(m.content.terms)
+        recs.append(member_record(rec, m, cfg))
+    return recs
+
+
+def index_file(
+    root: Path,
+    f: Path,
+    st: os.stat_result,
+    cfg: ScanConfig,
+    cache: Optional[FingerprintCache] = None,
+    store: Optional[ContentStore] = None,
+    term_index: Optional[TermIndexWriter] = None,
+    perf: Optional[PerfRecorder] = None,
+) -> List[IndexedFile]:
+    # The file's record, then its archive members' (see build_records).
+    begin_file_stages(perf is not None)
+    do_hash = cfg.should_hash(f, st)
+    with perf_stage("cache"):
+        cached = lookup_cached(cache, store, cfg, f, st, do_hash)
+    result = hash_and_analyze(f, st, cfg, do_hash, store) if cached is None else None
+    with perf_stage("record"):
+        recs = build_records(root, f, st, cfg, do_hash, cached, result, cache, store, term_index)
+    if perf is not None:
+        perf.add_file(recs[0].full_path, recs[0].ext, recs[0].size, end_file_stages())
+    return recs
+
+
+_WORKER_STORE: Optional[ContentStore] = None
+_WORKER_PROFILE = False
+
+
+def _init_worker(cfg: ScanConfig, store_path: Optional[Path], profile: bool = False) -> None:
+    global _WORKER_CONFIG, _WORKER_STORE, _WORKER_PROFILE
+    _WORKER_CONFIG = cfg
+    _WORKER_PROFILE = profile
+    if store_path is not None:
+        _WORKER_STORE = ContentStore(store_path, cfg.content_key(), cfg.matcher.fingerprint(), readonly=True)
+
+
+def _process_in_worker(
+    path: str, st: os.stat_result, do_hash: bool
+) -> Tuple[str, ContentResult, bool, Optional[FileStages]]:
+    assert _WORKER_CONFIG is not None
+    begin_file_stages(_WORKER_PROFILE)
+    file_hash, content, from_store = hash_and_analyze(Path(path), st, _WORKER_CONFIG, do_hash, _WORKER_STORE)
+    return file_hash, content, from_store, end_file_stages()
+
+
+def _thread_store(path: Path, config_key: str, alias_key: str) -> ContentStore:
+    # SQLite connections are per thread; each I/O thread keeps its own read-only one.
+    store = getattr(_tls, "store", None)
+    if store is None or store.path != path or store.alias_key != alias_key:
+        store = _tls.store = ContentStore(path, config_key, alias_key, readonly=True)
+    return store
+
+
+def _analyze_in_thread(
+    f: Path, st: os.stat_result, cfg: ScanConfig, do_hash: bool, store_ref: Optional[Tuple[Path, str, str]], profile: bool
+) -> Tuple[str, ContentResult, bool, Optional[FileStages]]:
+    # I/O-thread counterpart of _process_in_worker for --io-concurrency without --workers.
+    # store_ref is (store path, config key, alias key).
+    begin_file_stages(profile)
+    store = _thread_store(*store_ref) if store_ref is not None else None
+    file_hash, content, from_store = hash_and_analyze(f, st, cfg, do_hash, store)
+    return file_hash, content, from_store, end_file_stages()
+
+
+@dataclass
+class _Job:
+    root: Path
+    f: Path
+    st: os.stat_result
+    do_hash: bool
+    cached: Optional[Dict[str, Any]] = None
+    hash_fut: Any = None
+    work_fut: Any = None
+    stages: Optional[FileStages] = None
+
+
+def index_files(
+    items: Iterable[ScanEntry],
+    cfg: ScanConfig,
+    cache: Optional[FingerprintCache] = None,
+    workers: int = 1,
+    store: Optional[ContentStore] = None,
+    term_index: Optional[TermIndexWriter] = None,
+    perf: Optional[PerfRecorder] = None,
+    io_concurrency: int = 0,
+) -> Iterator[IndexedFile]:
+    """
+    Yield one IndexedFile per (root, path, stat) item, in input order; with
+    cfg.archive_depth, a ZIP's record is followed by one record per member.
+
+    With workers > 1, files whose content is extracted go to a process pool that hashes
+    and extracts from a single read (CPU-bound); other files are only hashed, on a thread
+    pool (I/O-bound; hashlib releases the GIL). Workers consult the content store read-only
+    before extracting. A bounded in-flight window keeps memory flat and results are yielded
+    in submission order, so outputs are identical to the serial path. With term_index, each
+    file's postings are added in that same order, so term-index ids are walk-order indices.
+    With perf, per-file stage timings from workers are merged with the main thread's.
+
+    io_concurrency > 0 is for high-latency filesystems: up to that many files are opened,
+    read and hashed at once on the thread pool, and without --workers content extraction
+    runs there too (each thread with its own read-only store connection), so per-file
+    round-trips overlap instead of adding up.
+    """
+    if workers <= 1 and io_concurrency <= 0:
+        for root, f, st in items:
+            yield from index_file(root, f, st, cfg, cache, store, term_index, perf)
+        return
+
+    threads = max(workers, io_concurrency)
+    window = max(workers * 4, io_concurrency * 2)
+    pending: Deque[_Job] = deque()
+    profile = perf is not None
+    store_path = store.path if store else None
+    # Extraction threads must not each start a PDF page pool.
+    thread_cfg = replace(cfg, pdf_page_workers=1)
+    store_ref = (store.path, store.config_key, store.alias_key) if store else None
+
+    def finish(job: _Job) -> List[IndexedFile]:
+        remote: Optional[FileStages] = None
+        result: Optional[Tuple[str, ContentResult, bool]] = None
+        begin_file_stages(profile)
+        if job.cached is None:
+            if job.work_fut is not None:
+                file_hash, content, from_store, remote = job.work_fut.result()
+                result = (file_hash, content, from_store)
+            elif job.hash_fut is not None:
+                file_hash, remote = job.hash_fut.result()
+                result = (file_hash, ContentResult(False, [], {}), False)
+        with perf_stage("record"):
+            recs = build_records(job.root, job.f, job.st, cfg, job.do_hash, job.cached, result, cache, store, term_index)
+        if perf is not None:
+            perf.add_file(recs[0].full_path, recs[0].ext, recs[0].size, job.stages, remote, end_file_stages())
+        return recs
+
+    with contextlib.ExitStack() as pools:
+        hash_pool = pools.enter_context(ThreadPoolExecutor(max_workers=threads))
+        extract_pool: Optional[ProcessPoolExecutor] = None
+        if workers > 1:
+            extract_pool = pools.enter_context(
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cfg, store_path, profile))
+            )
+        for root, f, st in items:
+            do_hash = cfg.should_hash(f, st)
+            job = _Job(root=root, f=f, st=st, do_hash=do_hash)
+            begin_file_stages(profile)
+            with perf_stage("cache"):
+                job.cached = lookup_cached(cache, store, cfg, f, st, do_hash)
+            job.stages = end_file_stages()
+            if job.cached is None:
+                if cfg.kind(file_ext(f)):
+                    if extract_pool is not None:
+                        job.work_fut = extract_pool.submit(_process_in_worker, str(f), st, do_hash)
+                    else:
+                        job.work_fut = hash_pool.submit(_analyze_in_thread, f, st, thread_cfg, do_hash, store_ref, profile)
+                elif do_hash:
+                    job.hash_fut = hash_pool.submit(_hash_with_stages, f, st.st_size, profile)
+            pending.append(job)
+            while len(pending) >= window:
+                yield from finish(pending.popleft())
+        while pending:
+            yield from finish(pending.popleft())
+
+
+PARTIAL_BLOCK = 64 * 1024
+
+
+def partial_digest(path: Path, size: int, block: int = PARTIAL_BLOCK) -> str:
+    # sha256 over (size, first block, last block): cheap to compute and enough to split size
+    # buckets; equal partial digests are always confirmed by a full hash.
+    h = hashlib.sha256(str(size).encode("ascii"))
+    with path.open("rb") as f:
+        h.update(f.read(block))
+        if size > block:
+            f.seek(max(block, size - block))
+            h.update(f.read(block))
+    return h.hexdigest()
+
+
+def _hash_many(fn: Any, jobs: List[Tuple[int, Path, int]], workers: int) -> Dict[int, str]:
+    # Map idx -> digest; files that vanish or cannot be read are left out.
+    def one(job: Tuple[int, Path, int]) -> Tuple[int, str]:
+        idx, path, size = job
+        try:
+            return idx, fn(path, size)
+        except OSError:
+            return idx, ""
+
+    if workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(one, jobs))
+    else:
+        results = [one(j) for j in jobs]
+    return {idx: d for idx, d in results if d}
+
+
+# (full_path, size, sha256): the only per-file state kept for dedupe once records are written.
+DedupeKey = Tuple[str, int, str]
+
+
+def staged_duplicates(
+    keys: List[DedupeKey], workers: int = 1, partials: Optional[Dict[int, str]] = None
+) -> Tuple[Dict[str, List[int]], Dict[str, int]]:
+    """
+    Duplicate groups keyed by full sha256, computed in stages:
+    1. bucket by size (no I/O); files with a unique size cannot have a duplicate;
+    2. within colliding buckets, compare head/tail partial digests;
+    3. full sha256 only for files that still collide (and do not already have one).
+
+    Large unique media are therefore never read in full. Full hashes computed here are
+    written back into `keys`. `partials` are partial digests already known by idx (from
+    --shard runs); only the missing ones are read. Returns (groups, stage counters).
+    """
+    by_size: Dict[int, List[int]] = {}
+    for idx, (path, size, sha) in enumerate(keys):
+        if not sha and ARCHIVE_SEP in path:
+            continue  # unreadable archive member: nothing on disk to hash
+        by_size.setdefault(size, []).append(idx)
+    size_collisions = [idxs for idxs in by_size.values() if len(idxs) > 1]
+
+    def needs_partial(idx: int) -> bool:
+        # Already-hashed files, and small ones whose full hash costs the same, skip stage 2.
+        _, size, sha = keys[idx]
+        return not sha and size > 2 * PARTIAL_BLOCK
+
+    partial_jobs = [
+        (idx, Path(keys[idx][0]), keys[idx][1])
+        for idxs in size_collisions
+        for idx in idxs
+        if needs_partial(idx)
+    ]
+    known = partials or {}
+    partials = {idx: known[idx] for idx, _, _ in partial_jobs if idx in known}
+    partials.update(_hash_many(partial_digest, [j for j in partial_jobs if j[0] not in partials], workers))
+
+    full_jobs: List[Tuple[int, Path, int]] = []
+    for idxs in size_collisions:
+        buckets: Dict[str, List[int]] = {}
+        for idx in idxs:
+            key = partials.get(idx, "") if needs_partial(idx) else "unsplit"
+            if key:
+                buckets.setdefault(key, []).append(idx)
+        for members in buckets.values():
+            if len(members) > 1:
+                full_jobs.extend((idx, Path(keys[idx][0]), keys[idx][1]) for idx in members if not keys[idx][2])
+    fulls = _hash_many(lambda path, size: sha256_file(path), full_jobs, workers)
+    for idx, digest in fulls.items():
+        keys[idx] = (keys[idx][0], keys[idx][1], digest)
+
+    by_hash: Dict[str, List[int]] = {}
+    for idxs in size_collisions:
+        for idx in idxs:
+            if keys[idx][2]:
+                by_hash.setdefault(keys[idx][2], []).append(idx)
+    # Same shape and key order as the full-hash path: by first occurrence in walk order.
+    groups = sorted((sorted(idxs) for idxs in by_hash.values() if len(idxs) > 1), key=lambda g: g[0])
+    stats = {
+        "size_collision_files": sum(len(x) for x in size_collisions),
+        "partial_hashed": len(partial_jobs),
+        "full_hashed": len(fulls),
+    }
+    return {keys[g[0]][2]: g for g in groups}, stats
+
+
+def update_merkle_tree(path: Path, names: List[str], keys: List[DedupeKey]) -> Dict[str, Any]:
+    """
+    Bring the saved tree at path (if any) in line with a run's (path, size, sha256) keys,
+    names[i] being the merkle_key() of keys[i], and save it. Returns the summary entry.
+    """
+    em = sibling_module("evidence_merkle")
+    tree = em.MerkleTree()
+    if path.is_file():
+        try:
+            tree = em.MerkleTree.load(path)
+        except (OSError, ValueError, KeyError):
+            tree = em.MerkleTree()
+    changed = tree.sync({name: em.merkle_leaf(sha, size) for name, (_, size, sha) in zip(names, keys)})
+    tree.save(path)
+    return {
+        "path": str(path),
+        "root": tree.root(),
+        "files": len(tree.leaves),
+        "changed": changed,
+        "dirs_rehashed": tree.rehashed_dirs,
+        "unhashed": sum(1 for _, _, sha in keys if not sha),
+    }
+
+
+def write_json(path: Path, obj: Any) -> None:
+    # Written under a .tmp name and renamed, so readers (and --watch consumers) never see a partial file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj, indent=2, ensure_ascii=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+OUTPUT_FORMATS = ("json", "jsonl")
+
+
+def open_output(path: Path, compress: bool = False) -> TextIO:
+    # Text handle for a streamed output; with compress the file gets a .gz suffix. The gzip
+    # header carries no name or mtime so identical records give identical bytes. Data goes
+    # to a .tmp name that close_output() renames into place.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    final = Path(str(path) + ".gz") if compress else path
+    tmp = final.with_name(final.name + ".tmp")
+    fh: Any
+    if not compress:
+        fh = tmp.open("w", newline="", encoding="utf-8")
+    else:
+        raw = tmp.open("wb")
+        gz = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+        fh = io.TextIOWrapper(gz, encoding="utf-8", newline="")
+        fh.raw_file = raw  # GzipFile does not close a passed fileobj
+    fh.final_path = final
+    return fh
+
+
+def close_output(fh: TextIO) -> None:
+    fh.close()
+    raw = getattr(fh, "raw_file", None)
+    if raw is not None:
+        raw.close()
+    final = getattr(fh, "final_path", None)
+    if final is not None:
+        os.replace(final.with_name(final.name + ".tmp"), final)
+
+
+def _dumps_at(obj: Any, depth: int) -> str:
+    # json.dumps(indent=2) re-indented for nesting depth; encoded strings never contain a raw newline.
+    text = json.dumps(obj, indent=2, ensure_ascii=True)
+    return text.replace("\n", "\n" + "  " * depth) if depth else text
+
+
+class JsonStreamWriter:
+    """
+    Writes one JSON array or object an element at a time.
+
+    Only the current element is ever serialized, and the bytes equal
+    json.dumps(container, indent=2) for the same content, so readers of the
+    non-streamed files see no difference.
+    """
+
+    def __init__(self, fh: TextIO, kind: str = "array", depth: int = 0):
+        self.fh = fh
+        self.open_char, self.close_char = ("[", "]") if kind == "array" else ("{", "}")
+        self.depth = depth
+        self.count = 0
+
+    def _next(self) -> None:
+        self.fh.write((",\n" if self.count else self.open_char + "\n") + "  " * (self.depth + 1))
+        self.count += 1
+
+    def append(self, obj: Any) -> None:
+        self._next()
+        self.fh.write(_dumps_at(obj, self.depth + 1))
+
+    def put(self, key: str, obj: Any) -> None:
+        self._next()
+        self.fh.write(json.dumps(key, ensure_ascii=True) + ": " + _dumps_at(obj, self.depth + 1))
+
+    def put_array(self, key: str, items: Iterable[Any]) -> None:
+        # Object member whose array value is itself streamed.
+        self._next()
+        self.fh.write(json.dumps(key, ensure_ascii=True) + ": ")
+        inner = JsonStreamWriter(self.fh, "array", self.depth + 1)
+        for item in items:
+            inner.append(item)
+        inner.finish()
+
+    def finish(self) -> None:
+        if self.count:
+            self.fh.write("\n" + "  " * self.depth + self.close_char)
+        else:
+            self.fh.write(self.open_char + self.close_char)
+
+
+class JsonlWriter:
+    """One compact JSON document per line; grouped outputs become flat rows."""
+
+    def __init__(self, fh: TextIO):
+        self.fh = fh
+        self.count = 0
+
+    def append(self, obj: Any) -> None:
+        self.fh.write(json.dumps(obj, ensure_ascii=True, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def finish(self) -> None:
+        pass
+
+
+class GroupSpill:
+    """
+    Groups (key, value) pairs on disk for outputs keyed by something other than walk order
+    (entity_map.json). Keys come back in first-seen order, values in insertion order; only
+    the key table stays in memory.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.unlink(missing_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE spill (grp INTEGER NOT NULL, seq INTEGER PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.execute("CREATE INDEX spill_grp ON spill (grp, seq)")
+        self.keys: Dict[str, int] = {}
+
+    def add(self, key: str, value: Any) -> None:
+        grp = self.keys.setdefault(key, len(self.keys))
+        self.conn.execute("INSERT INTO spill (grp, value) VALUES (?, ?)", (grp, json.dumps(value, ensure_ascii=True)))
+
+    def groups(self) -> Iterator[Tuple[str, Iterator[Any]]]:
+        self.conn.commit()
+        for key, grp in self.keys.items():
+            rows = self.conn.execute("SELECT value FROM spill WHERE grp = ? ORDER BY seq", (grp,))
+            yield key, (json.loads(v) for (v,) in rows)
+
+    def close(self) -> None:
+        self.conn.close()
+        self.path.unlink(missing_ok=True)
+
+
+TIMELINE_FIELDS = ["date", "event", "basis", "source_path", "pages", "sha256", "also_in"]
+TIMELINE_LABELS = {
+    "content": "(confirmed from content)",
+    "media-metadata": "(captured per media metadata)",
+    "filename": "(inferred from filename)",
+}
+
+
+class TimelineSpill:
+    """
+    Timeline hits parked on disk during the walk, then read back chronologically with
+    duplicate copies merged.
+
+    Copies with the same sha256 (known only after dedupe) collapse into one row per
+    (date, basis): the first copy in walk order is the source and the others are listed in
+    also_in. Rows sort by date, then by first source in walk order (filename before content
+    for the same file, as before), so equal inputs always give the same order.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.unlink(missing_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE hits (date TEXT NOT NULL, basis TEXT NOT NULL, idx INTEGER NOT NULL, pages TEXT NOT NULL)")
+        self.hits = 0
+
+    def add(self, date: str, basis: str, idx: int, pages: List[int]) -> None:
+        self.conn.execute("INSERT INTO hits VALUES (?, ?, ?, ?)", (date, basis, idx, ";".join(str(p) for p in pages)))
+        self.hits += 1
+
+    def rows(self, keys: List[DedupeKey]) -> Iterator[Dict[str, Any]]:
+        # keys[idx] = (full_path, size, sha256); files without a hash only merge with themselves.
+        self.conn.execute("CREATE TABLE files (idx INTEGER PRIMARY KEY, content TEXT NOT NULL)")
+        self.conn.executemany(
+            "INSERT INTO files VALUES (?, ?)", ((i, sha or f"path:{p}") for i, (p, _, sha) in enumerate(keys))
+        )
+        self.conn.commit()
+        # One sort by (date, walk order); rows sharing a date are few, so they are grouped in
+        # memory one date at a time. The first row of a group is its earliest copy.
+        cur = self.conn.execute(
+            "SELECT h.date, h.basis, f.content, h.idx, h.pages FROM hits h JOIN files f ON f.idx = h.idx"
+            " ORDER BY h.date, h.idx, h.rowid"
+        )
+        for date, day in itertools.groupby(cur, key=lambda r: r[0]):
+            groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for _, basis, content, idx, pages in day:
+                path, _, sha = keys[idx]
+                row = groups.get((basis, content))
+                if row is None:
+                    groups[(basis, content)] = {
+                        "date": date,
+                        "event": f"{TIMELINE_LABELS[basis]} {os.path.basename(path)}",
+                        "basis": basis,
+                        "source_path": path,
+                        "pages": [int(p) for p in pages.split(";")] if pages else [],
+                        "sha256": sha,
+                        "also_in": [],
+                    }
+                elif path != row["source_path"] and path not in row["also_in"]:
+                    row["also_in"].append(path)
+            yield from groups.values()
+
+    def close(self) -> None:
+        self.conn.close()
+        self.path.unlink(missing_ok=True)
+
+
+class OutputSet:
+    """
+    Streaming writers for the per-record outputs. Each output is a JSON array/object
+    (--format json, byte-identical to the old in-memory dump) or JSON Lines
+    (--format jsonl), optionally gzipped; CSVs are written row by row either way.
+    """
+
+    def __init__(self, out_dir: Path, fmt: str = "json", compress: bool = False):
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.compress = compress
+        self._handles: List[TextIO] = []
+        self._writers: List[Union[JsonStreamWriter, JsonlWriter]] = []
+
+    def _open(self, name: str) -> TextIO:
+        fh = open_output(self.out_dir / name, self.compress)
+        self._handles.append(fh)
+        return fh
+
+    def records(self, stem: str, kind: str = "array") -> Union[JsonStreamWriter, JsonlWriter]:
+        w: Union[JsonStreamWriter, JsonlWriter]
+        if self.fmt == "jsonl":
+            w = JsonlWriter(self._open(stem + ".jsonl"))
+        else:
+            w = JsonStreamWriter(self._open(stem + ".json"), kind)
+        self._writers.append(w)
+        return w
+
+    def table(self, name: str, fieldnames: List[str]) -> "csv.DictWriter[str]":
+        w = csv.DictWriter(self._open(name), fieldnames=fieldnames, restval="", extrasaction="ignore")
+        w.writeheader()
+        return w
+
+    def close(self) -> None:
+        for w in self._writers:
+            w.finish()
+        for fh in self._handles:
+            close_output(fh)
+        self._writers, self._handles = [], []
+
+
+GAP_CHECKS: List[Tuple[re.Pattern, str]] = [
+    (
+        re.compile(r"police report|ocso|osco"),
+        "Police report not found by filename keywords (check if stored elsewhere or named differently).",
+    ),
+    (re.compile(r"\bvideo\b|\.mov\b|\.mp4\b|\.mkv\b"), "Video evidence not found by filename keywords/extensions."),
+    (re.compile(r"\bmedical\b|\ber\b|hospital|trinity|bill|diagnosis"), "Medical records/bills not found by filename keywords."),
+    (re.compile(r"foia"), "FOIA items not found by filename keyword."),
+    (re.compile(r"contact list|witness"), "Witness contact list not found by filename keyword."),
+]
+
+
+class GapTracker:
+    """Filename keyword checks fed one name at a time instead of joining every name."""
+
+    def __init__(self) -> None:
+        self.pending = list(GAP_CHECKS)
+
+    def feed(self, name: str) -> None:
+        if self.pending:
+            low = name.lower()
+            self.pending = [(rx, msg) for rx, msg in self.pending if not rx.search(low)]
+
+    def gaps(self) -> List[str]:
+        return [msg for _, msg in self.pending]
+
+
+def _peak_rss_mb(who: str = "self") -> Optional[float]:
+    # Process high-water mark; None where the resource module is unavailable (Windows).
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return round(usage.ru_maxrss / (1e6 if sys.platform == "darwin" else 1024), 2)
+
+
+def _stage_totals(parts: Iterable[Optional[FileStages]]) -> FileStages:
+    merged: FileStages = {}
+    for part in parts:
+        for name, (wall, cpu, nbytes) in (part or {}).items():
+            m = merged.setdefault(name, [0.0, 0.0, 0])
+            m[0] += wall
+            m[1] += cpu
+            m[2] += nbytes
+    return merged
+
+
+def _stage_json(totals: FileStages) -> Dict[str, Dict[str, Any]]:
+    return {k: {"wall_s": round(w, 4), "cpu_s": round(c, 4), "bytes": int(b)} for k, (w, c, b) in sorted(totals.items())}
+
+
+class PerfRecorder:
+    """
+    --profile: wall/CPU time and peak memory per run stage, per-file stage totals (wall, CPU,
+    bytes read) overall and by file type, and the slowest files with their breakdown.
+
+    Run stages are timed in the main process; per-file stages are timed on whichever
+    thread or worker process did the work, so in --workers mode their CPU is worker CPU.
+    With trace_memory, tracemalloc also reports each run stage's peak Python allocation.
+    """
+
+    def __init__(self, top_n: int = 20, trace_memory: bool = False) -> None:
+        self.top_n = top_n
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.file_stages: FileStages = {}
+        self.by_type: Dict[str, Dict[str, Any]] = {}
+        self.files = 0
+        self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._t0 = time.perf_counter()
+        self._c0 = time.process_time()
+        if trace_memory:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        w0, c0 = time.perf_counter(), time.process_time()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            self.charge(name, time.perf_counter() - w0, time.process_time() - c0)
+
+    def charge(self, name: str, wall: float, cpu: float) -> None:
+        st = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+        st["wall_s"] += wall
+        st["cpu_s"] += cpu
+        st["calls"] += 1
+        st["peak_rss_mb"] = _peak_rss_mb()
+        if self.trace_memory:
+            st["peak_traced_mb"] = max(st.get("peak_traced_mb", 0.0), round(tracemalloc.get_traced_memory()[1] / 1e6, 2))
+
+    def timed(self, items: Iterable[Any], name: str) -> Iterator[Any]:
+        # Charge only the time spent producing each item, not the consumer's loop body.
+        it = iter(items)
+        while True:
+            w0, c0 = time.perf_counter(), time.process_time()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.charge(name, time.perf_counter() - w0, time.process_time() - c0)
+                return
+            self.charge(name, time.perf_counter() - w0, time.process_time() - c0)
+            yield item
+
+    def add_file(self, path: str, ext: str, size: int, *parts: Optional[FileStages]) -> None:
+        totals = _stage_totals(parts)
+        wall = sum(v[0] for v in totals.values())
+        self.files += 1
+        self.file_stages = _stage_totals([self.file_stages, totals])
+        t = self.by_type.setdefault(ext, {"files": 0, "size_bytes": 0, "stages": {}})
+        t["files"] += 1
+        t["size_bytes"] += size
+        t["stages"] = _stage_totals([t["stages"], totals])
+        entry = {"path": path, "ext": ext, "size": size, "wall_s": round(wall, 4), "stages": _stage_json(totals)}
+        heapq.heappush(self._slowest, (wall, self.files, entry))
+        if len(self._slowest) > self.top_n:
+            heapq.heappop(self._slowest)
+
+    def report(self, workers: int) -> Dict[str, Any]:
+        by_type = {
+            ext: {
+                "files": t["files"],
+                "size_bytes": t["size_bytes"],
+                "wall_s": round(sum(v[0] for v in t["stages"].values()), 4),
+                "stages": _stage_json(t["stages"]),
+            }
+            for ext, t in sorted(self.by_type.items(), key=lambda kv: -sum(v[0] for v in kv[1]["stages"].values()))
+        }
+        return {
+            "wall_s": round(time.perf_counter() - self._t0, 4),
+            "cpu_s": round(time.process_time() - self._c0, 4),
+            "workers": workers,
+            "files": self.files,
+            "stages": {
+                k: {**v, "wall_s": round(v["wall_s"], 4), "cpu_s": round(v["cpu_s"], 4)} for k, v in self.stages.items()
+            },
+            "file_stages": _stage_json(self.file_stages),
+            "by_type": by_type,
+            "slowest_files": [e for _, _, e in sorted(self._slowest, key=lambda x: (-x[0], x[1]))],
+            "peak_rss_mb": {"self": _peak_rss_mb(), "workers": _peak_rss_mb("children")},
+        }
+
+
+INDEX_SCHEMA_VERSION = 2
+
+
+class EvidenceIndexDb:
+    """
+    --sqlite output: files, dates, entity hits and duplicate groups in indexed tables, plus an
+    FTS5 table over file names/paths/categories (never document text) and the run's alias
+    table (lowercased alias -> canonical entity), so `query --entity` accepts aliases.
+
+    Rows are buffered and bulk-inserted in large transactions; secondary indexes are built
+    once after loading. The database is written to a temp name and renamed into place on
+    close, so `query` never sees a half-built index.
+    """
+
+    BATCH = 5000
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path.unlink(missing_ok=True)
+        self.conn = sqlite3.connect(str(self.tmp_path))
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.executescript(
+            """
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE files (
+                id INTEGER PRIMARY KEY, source_root TEXT NOT NULL, full_path TEXT NOT NULL, rel_path TEXT NOT NULL,
+                name TEXT NOT NULL, ext TEXT NOT NULL, size INTEGER NOT NULL, mtime_iso TEXT NOT NULL,
+                sha256 TEXT NOT NULL, category TEXT NOT NULL, content_extracted INTEGER NOT NULL
+            );
+            CREATE TABLE file_dates (file_id INTEGER NOT NULL, date TEXT NOT NULL, basis TEXT NOT NULL, pages TEXT NOT NULL);
+            CREATE TABLE entity_hits (
+                file_id INTEGER NOT NULL, entity TEXT NOT NULL, count INTEGER NOT NULL, basis TEXT NOT NULL, pages TEXT NOT NULL
+            );
+            CREATE TABLE duplicates (sha256 TEXT NOT NULL, file_id INTEGER NOT NULL);
+            CREATE TABLE entity_aliases (alias TEXT NOT NULL, entity TEXT NOT NULL);
+            """
+        )
+        try:
+            self.conn.execute("CREATE VIRTUAL TABLE files_fts USING fts5(name, rel_path, category)")
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: everything except --text still works.
+            self.fts = False
+        self._files: List[Tuple[Any, ...]] = []
+        self._dates: List[Tuple[Any, ...]] = []
+        self._hits: List[Tuple[Any, ...]] = []
+
+    def add(self, idx: int, rec: IndexedFile) -> None:
+        self._files.append(
+            (idx, rec.source_root, rec.full_path, rec.rel_path, rec.name, rec.ext, rec.size, rec.mtime_iso,
+             rec.sha256, rec.category, int(rec.content_extracted))
+        )
+        for d in rec.dates_from_filename:
+            self._dates.append((idx, d, "filename", ""))
+        date_pages = rec.page_refs.get("dates", {})
+        date_basis = content_date_basis(rec)
+        for d in rec.dates_from_content:
+            self._dates.append((idx, d, date_basis, ";".join(str(p) for p in date_pages.get(d, []))))
+        basis = "content" if rec.content_extracted else "filename"
+        ent_pages = rec.page_refs.get("entities", {})
+        for ent, c in rec.entity_hits.items():
+            self._hits.append((idx, ent, c, basis, ";".join(str(p) for p in ent_pages.get(ent, []))))
+        if len(self._files) >= self.BATCH:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self.conn:
+            self.conn.executemany("INSERT INTO files VALUES (?,?,?,?,?,?,?,?,?,?,?)", self._files)
+            if self.fts:
+                self.conn.executemany(
+                    "INSERT INTO files_fts (rowid, name, rel_path, category) VALUES (?,?,?,?)",
+                    [(r[0], r[4], r[3], r[9]) for r in self._files],
+                )
+            self.conn.executemany("INSERT INTO file_dates VALUES (?,?,?,?)", self._dates)
+            self.conn.executemany("INSERT INTO entity_hits VALUES (?,?,?,?,?)", self._hits)
+        self._files, self._dates, self._hits = [], [], []
+
+    def set_hashes(self, keys: List[DedupeKey]) -> None:
+        # Staged dedupe fills in sha256 after the walk.
+        self._flush()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE files SET sha256 = ? WHERE id = ? AND sha256 = ''",
+                ((sha, idx) for idx, (_, _, sha) in enumerate(keys) if sha),
+            )
+
+    def finish(self, dups: Dict[str, List[int]], meta: Dict[str, Any], canonicals: Dict[str, List[str]]) -> None:
+        # canonicals: AliasMatcher.canonicals of the run.
+        self._flush()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO duplicates VALUES (?, ?)", ((h, idx) for h, idxs in dups.items() for idx in idxs)
+            )
+            self.conn.executemany(
+                "INSERT INTO entity_aliases VALUES (?, ?)", ((a, c) for a, cs in canonicals.items() for c in cs)
+            )
+            meta = {"schema_version": INDEX_SCHEMA_VERSION, "fts5": self.fts, **meta}
+            self.conn.executemany("INSERT INTO meta VALUES (?, ?)", ((k, json.dumps(v)) for k, v in meta.items()))
+            self.conn.executescript(
+                """
+                CREATE INDEX files_sha256 ON files (sha256);
+                CREATE INDEX files_category ON files (category);
+                CREATE INDEX file_dates_date ON file_dates (date, file_id);
+                CREATE INDEX file_dates_file ON file_dates (file_id);
+                CREATE INDEX entity_hits_entity ON entity_hits (entity COLLATE NOCASE, file_id);
+                CREATE INDEX entity_hits_file ON entity_hits (file_id);
+                CREATE INDEX duplicates_sha256 ON duplicates (sha256);
+                CREATE INDEX duplicates_file ON duplicates (file_id);
+                CREATE INDEX entity_aliases_alias ON entity_aliases (alias);
+                """
+            )
+        self.conn.execute("ANALYZE")
+        self.conn.close()
+        os.replace(self.tmp_path, self.path)
+
+
+def date_bounds(lo: str, hi: str) -> Tuple[str, str]:
+    # Date range bounds for `query` and `timeline`. ISO prefixes compare lexicographically:
+    # --to 2025-12 must still include 2025-12-31.
+    return lo or "0000", (hi + "\x7f") if hi else "9999\x7f"
+
+
+TERM_INDEX_MAGIC = b"DDTERMS2"
+# n_terms, dictionary offset, file-table offset, file-table length, term_key_check()
+TERM_INDEX_HEADER = struct.Struct("<QQQQQ")
+# term id, postings offset, postings length, document count
+TERM_INDEX_ENTRY = struct.Struct("<QQII")
+# Spilled segment record: term id, document count, last document, payload length
+_SEGMENT_ENTRY = struct.Struct("<QIII")
+
+
+class TermIndexWriter:
+    """
+    --term-index output: positional inverted index term -> (file id, token positions).
+
+    Postings are varint-encoded with delta-coded file ids and positions; terms are hashes
+    keyed with the matter's --term-key (term_id), so the file holds no strings and cannot be
+    read back into words without the key. Word frequencies and positions are still there,
+    so keep the index as confidential as the evidence. Files are added in walk order and
+    each file's doc_terms() entries are appended verbatim. When the in-memory postings pass
+    SEGMENT_BYTES they are spilled as a sorted segment; finish() merges the segments into
+    the final file (header, postings, sorted term dictionary, file table).
+    """
+
+    SEGMENT_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, path: Path, key_check: int) -> None:
+        self.path = path
+        self.key_check = key_check
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.docs = 0
+        self.indexed_docs = 0
+        # term id -> [document count, last document, postings]
+        self._terms: Dict[int, List[Any]] = {}
+        self._bytes = 0
+        self._segments: List[Path] = []
+
+    def add(self, terms: Optional[bytes]) -> None:
+        doc = self.docs
+        self.docs += 1
+        if not terms:
+            return
+        self.indexed_docs += 1
+        n, pos = get_varint(terms, 0)
+        tid = 0
+        for _ in range(n):
+            delta, pos = get_varint(terms, pos)
+            size, pos = get_varint(terms, pos)
+            tid += delta
+            state = self._terms.get(tid)
+            if state is None:
+                state = self._terms[tid] = [0, 0, bytearray()]
+                self._bytes += 96  # rough per-term dict/list overhead
+            buf = state[2]
+            before = len(buf)
+            # First entry of a segment is absolute (last document starts at 0).
+            put_varint(buf, doc - state[1])
+            buf += terms[pos : pos + size]
+            pos += size
+            state[0] += 1
+            state[1] = doc
+            self._bytes += len(buf) - before
+        if self._bytes >= self.SEGMENT_BYTES:
+            self._spill()
+
+    def _memory_segment(self) -> Iterator[Tuple[int, int, int, bytes]]:
+        for tid in sorted(self._terms):
+            count, last, buf = self._terms[tid]
+            yield tid, count, last, bytes(buf)
+
+    def _spill(self) -> None:
+        seg = self.path.with_name(f"{self.path.name}.seg{len(self._segments)}.tmp")
+        with seg.open("wb") as f:
+            for tid, count, last, payload in self._memory_segment():
+                f.write(_SEGMENT_ENTRY.pack(tid, count, last, len(payload)))
+                f.write(payload)
+        self._segments.append(seg)
+        self._terms = {}
+        self._bytes = 0
+
+    @staticmethod
+    def _read_segment(seg: Path) -> Iterator[Tuple[int, int, int, bytes]]:
+        with seg.open("rb") as f:
+            while True:
+                head = f.read(_SEGMENT_ENTRY.size)
+                if not head:
+                    return
+                tid, count, last, size = _SEGMENT_ENTRY.unpack(head)
+                yield tid, count, last, f.read(size)
+
+    def finish(self, paths: List[str]) -> Dict[str, Any]:
+        # paths[i] is the full path of file id i (walk order).
+        sources = [self._read_segment(s) for s in self._segments] + [self._memory_segment()]
+        dictionary = bytearray()
+        n_terms = 0
+        with self.tmp_path.open("wb") as f:
+            f.write(TERM_INDEX_MAGIC + bytes(TERM_INDEX_HEADER.size))
+            # heapq.merge is stable, so a term's segments come back in document order.
+            merged = heapq.merge(*sources, key=lambda e: e[0])
+            for tid, group in itertools.groupby(merged, key=lambda e: e[0]):
+                offset = f.tell()
+                docs = 0
+                prev_last: Optional[int] = None
+                for _, count, last, payload in group:
+                    if prev_last is None:
+                        f.write(payload)
+                    else:
+                        # Re-base the segment's absolute first document on the previous segment.
+                        first, p = get_varint(payload, 0)
+                        head = bytearray()
+                        put_varint(head, first - prev_last)
+                        f.write(head)
+                        f.write(payload[p:])
+                    docs += count
+                    prev_last = last
+                dictionary += TERM_INDEX_ENTRY.pack(tid, offset, f.tell() - offset, docs)
+                n_terms += 1
+            dict_off = f.tell()
+            f.write(dictionary)
+            files_off = f.tell()
+            files_blob = json.dumps(paths, ensure_ascii=True).encode("utf-8")
+            f.write(files_blob)
+            f.seek(len(TERM_INDEX_MAGIC))
+            f.write(TERM_INDEX_HEADER.pack(n_terms, dict_off, files_off, len(files_blob), self.key_check))
+        for seg in self._segments:
+            seg.unlink(missing_ok=True)
+        os.replace(self.tmp_path, self.path)
+        return {
+            "path": str(self.path),
+            "files_indexed": self.indexed_docs,
+            "terms": n_terms,
+            "segments": len(self._segments) + 1,
+            "bytes": self.path.stat().st_size,
+        }
+
+
+WATCH_BACKENDS = ("auto", "inotify", "poll")
+
+# <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """
+    Recursive Linux inotify watch over the evidence roots (via libc, no extra dependency).
+
+    One watch per directory; directories created or moved in later are added as they
+    appear. wait() returns the set of changed paths ("*" after a queue overflow, when
+    individual events were lost).
+    """
+
+    MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+    def __init__(self, roots: List[Path], ignore: Any, follow_symlinks: bool = False) -> None:
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._ctypes = ctypes
+        self.ignore = ignore
+        self.follow_symlinks = follow_symlinks
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.wds: Dict[int, str] = {}
+        try:
+            for root in roots:
+                self._add_tree(str(root))
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, d: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(d), self.MASK | IN_ONLYDIR)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            if err == errno.ENOSPC:
+                # fs.inotify.max_user_watches exhausted; the caller falls back to polling.
+                raise OSError(err, "inotify watch limit reached")
+            return
+        self.wds[wd] = d
+
+    def _add_tree(self, top: str) -> None:
+        for dirpath, dirnames, _ in os.walk(top, followlinks=self.follow_symlinks):
+            dirnames[:] = [n for n in dirnames if not self.ignore(os.path.join(dirpath, n))]
+            self._add(dirpath)
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        changed: Set[str] = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, name_len = _INOTIFY_EVENT.unpack_from(data, pos)
+                pos += _INOTIFY_EVENT.size
+                name = data[pos : pos + name_len].rstrip(b"\0")
+                pos += name_len
+                if mask & IN_Q_OVERFLOW:
+                    changed.add("*")
+                    continue
+                base = self.wds.get(wd)
+                if mask & IN_IGNORED:
+                    self.wds.pop(wd, None)
+                if base is None:
+                    continue
+                path = os.path.join(base, os.fsdecode(name)) if name else base
+                if self.ignore(path):
+                    continue
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path)
+                changed.add(path)
+            ready, _, _ = select.select([self.fd], [], [], 0)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollWatcher:
+    """Fallback watcher: compares (size, mtime_ns, inode) snapshots of the scan walk."""
+
+    INTERVAL = 2.0
+
+    def __init__(
+        self, roots: List[Path], ignore: Any, include: List[str], exclude: List[str], symlinks: str, io_concurrency: int = 0
+    ) -> None:
+        self.roots = roots
+        self.ignore = ignore
+        self.include = include
+        self.exclude = exclude
+        self.symlinks = symlinks
+        self.io_concurrency = io_concurrency
+        self.state = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int, int]]:
+        if self.io_concurrency > 0:
+            entries: Iterable[ScanEntry] = scan_roots_async(self.roots, self.include, self.exclude, self.symlinks, self.io_concurrency)
+        else:
+            entries = scan_roots(self.roots, include=self.include, exclude=self.exclude, symlinks=self.symlinks)
+        return {str(f): (st.st_size, st.st_mtime_ns, st.st_ino) for _, f, st in entries if not self.ignore(str(f))}
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.INTERVAL if deadline is None else max(0.0, min(self.INTERVAL, deadline - time.monotonic()))
+            time.sleep(delay)
+            now = self._snapshot()
+            changed = {p for p in now.keys() | self.state.keys() if now.get(p) != self.state.get(p)}
+            self.state = now
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+
+# Under continuous churn, rescan at least this often instead of waiting for a quiet period.
+WATCH_MAX_DELAY = 30.0
+# Default --watch-max-files: WatchIndex keeps every record in memory (about 1 KB each) and
+# rewrites every output per rescan, which stops being interactive well before this.
+WATCH_MAX_FILES = 200_000
+
+# A path's place in scan_roots() order: the root's index, then (1, name) per directory and
+# (0, name) for the file, as a directory's files are listed before its subdirectories.
+WalkKey = Tuple[Any, ...]
+
+
+def walk_key(root_index: int, parts: List[str], is_dir: bool = False) -> WalkKey:
+    # parts: the root-relative path components.
+    if is_dir:
+        return (root_index, *((1, name) for name in parts))
+    return (root_index, *((1, name) for name in parts[:-1]), (0, parts[-1]))
+
+
+def scan_path(root: Path, path: str, include: List[str], exclude: List[str], symlinks: str) -> List[ScanEntry]:
+    # What scan_roots() lists at path under root as things stand now: the file, everything
+    # under the directory, or nothing (gone, filtered out, or below a pruned directory).
+    parts = os.path.relpath(path, str(root)).split(os.sep)
+    if parts == ["."]:
+        return list(scan_tree(root, root, include, exclude, symlinks))
+    d = str(root)
+    for i, name in enumerate(parts[:-1]):
+        d = os.path.join(d, name)
+        if glob_match("/".join(parts[: i + 1]), name, exclude) or (symlinks != "follow" and os.path.islink(d)):
+            return []
+    rel, name, f = "/".join(parts), parts[-1], Path(path)
+    try:
+        if f.is_symlink() and symlinks == "skip":
+            return []
+        if f.is_dir() and (symlinks == "follow" or not f.is_symlink()):
+            return [] if glob_match(rel, name, exclude) else list(scan_tree(root, f, include, exclude, symlinks))
+        if not f.is_file():
+            return []
+        st = f.stat()
+    except OSError:
+        return []
+    if exclude and glob_match(rel, name, exclude):
+        return []
+    if include and not glob_match(rel, name, include):
+        return []
+    return [(root, f, st)]
+
+
+@dataclass
+class _Watched:
+    entry: ScanEntry
+    records: List[IndexedFile] = field(default_factory=list)
+    terms: List[Optional[bytes]] = field(default_factory=list)
+
+
+class WatchIndex:
+    """
+    --watch state between rescans: every listed file, in walk order, with its records and
+    term postings. A batch of changed paths is re-listed and re-indexed on its own (all
+    files only when the batch changes the filename-derived alias table, and then through
+    the fingerprint cache, which only misses files with content hits). The outputs are rewritten
+    from memory, since duplicates, entity map and timeline span every file, and the batch's
+    manifest changes are written as evidence_vault_delta.json (see diff_manifests()).
+
+    So memory and the per-rescan output cost grow with the whole corpus, not the batch:
+    every record stays resident (roughly 1 KB per file) and every output is rewritten on
+    each rescan. --watch-max-files caps the listing; past it load() and rescan() raise
+    ValueError and the watch stops, leaving the last complete outputs in place. Corpora
+    that large are better served by --incremental runs on a schedule.
+    """
+
+    def __init__(self, args: argparse.Namespace, roots: List[Path], out_dir: Path, seed_items: List[EvidenceItem]) -> None:
+        self.args = args
+        self.roots = roots
+        self.out_dir = out_dir
+        self.seed_items = seed_items
+        self.root_name = safe_norm(args.evidence_root_name) or "evidence"
+        self.keys: List[WalkKey] = []
+        self.files: Dict[WalkKey, _Watched] = {}
+        self.cfg = scan_config(args, [])
+        self.cache = open_cache(args, out_dir, self.cfg)
+        self.snapshot: ManifestSnapshot = {}
+
+    def load(self) -> int:
+        # List and index everything (the files were just indexed, so from the cache).
+        if self.args.io_concurrency > 0:
+            entries = scan_roots_async(self.roots, self.args.include, self.args.exclude, self.args.symlinks, self.args.io_concurrency)
+        else:
+            entries = list(scan_roots(self.roots, self.args.include, self.args.exclude, self.args.symlinks))
+        index = {root: i for i, root in enumerate(self.roots)}
+        self.files = {}
+        for root, f, st in entries:
+            parts = os.path.relpath(str(f), str(root)).split(os.sep)
+            self.files[walk_key(index[root], parts)] = _Watched((root, f, st))
+        self.keys = sorted(self.files)
+        self._check_size()
+        self._set_config()
+        self._index(self.keys)
+        self.snapshot = self._snapshot()
+        return len(self.keys)
+
+    def _check_size(self) -> None:
+        if len(self.keys) > self.args.watch_max_files:
+            raise ValueError(
+                f"--watch holds every record in memory and the roots list {len(self.keys)} files, "
+                f"over --watch-max-files {self.args.watch_max_files}; use --incremental runs instead"
+            )
+
+    def _set_config(self) -> bool:
+        # The ScanConfig for the listed file names; True if its alias table changed.
+        cfg = scan_config(self.args, discover_filename_terms(self.files[key].entry[1].name for key in self.keys))
+        changed = cfg.matcher.fingerprint() != self.cfg.matcher.fingerprint()
+        self.cfg = cfg
+        if changed:
+            self.cache.alias_key = cfg.matcher.fingerprint()
+        return changed
+
+    def _relist(self, changed: Set[str]) -> List[WalkKey]:
+        # Drop what was listed at or under each changed path, then list it again; returns
+        # the keys of the files listed again, in walk order.
+        found: Dict[WalkKey, ScanEntry] = {}
+        for i, root in enumerate(self.roots):
+            for path in changed:
+                parts = os.path.relpath(path, str(root)).split(os.sep)
+                if parts[0] == os.pardir:
+                    continue
+                parts = [] if parts == ["."] else parts
+                self._drop(i, parts)
+                for entry in scan_path(root, path, self.args.include, self.args.exclude, self.args.symlinks):
+                    found[walk_key(i, os.path.relpath(str(entry[1]), str(root)).split(os.sep))] = entry
+        for key, entry in found.items():
+            bisect.insort(self.keys, key)
+            self.files[key] = _Watched(entry)
+        return sorted(found)
+
+    def _drop(self, root_index: int, parts: List[str]) -> None:
+        # The file at parts, and the contiguous run of keys under a directory there.
+        lo = bisect.bisect_left(self.keys, walk_key(root_index, parts, is_dir=True))
+        end = walk_key(root_index, parts[:-1], is_dir=True) + ((1, parts[-1] + "\0"),) if parts else (root_index + 1,)
+        hi = bisect.bisect_left(self.keys, end)
+        for key in self.keys[lo:hi]:
+            del self.files[key]
+        del self.keys[lo:hi]
+        if parts:
+            key = walk_key(root_index, parts)
+            i = bisect.bisect_left(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                del self.files[key]
+                del self.keys[i]
+
+    def _index(self, keys: List[WalkKey]) -> Optional[Dict[str, Any]]:
+        # (Re-)index the files at keys; returns the content store's counts.
+        store = open_store(self.args, self.out_dir, self.cfg)
+        terms = ShardTerms() if self.args.term_index else None
+        entries = [self.files[key].entry for key in keys]
+        records = index_files(
+            entries, self.cfg, self.cache, self.args.workers, store, terms, io_concurrency=self.args.io_concurrency
+        )
+        k = -1
+        watched: Optional[_Watched] = None
+        for rec in records:
+            # A file's record is followed by its archive members' (see index_files).
+            if k + 1 < len(keys) and rec.full_path == str(entries[k + 1][1]):
+                k += 1
+                watched = self.files[keys[k]]
+                watched.records, watched.terms = [], []
+            watched.records.append(rec)  # type: ignore[union-attr]
+            watched.terms.append(terms.pending.popleft() if terms else None)  # type: ignore[union-attr]
+        if store is None:
+            return None
+        store.close()
+        return {"path": str(store.path), "hits": store.hits, "misses": store.misses}
+
+    def _records(self, term_writer: Optional[TermIndexWriter]) -> Iterator[IndexedFile]:
+        for key in self.keys:
+            watched = self.files[key]
+            for rec, terms in zip(watched.records, watched.terms):
+                if term_writer is not None:
+                    term_writer.add(terms)
+                yield rec
+
+    def _snapshot(self) -> ManifestSnapshot:
+        # load_manifest_snapshot() of the outputs written from these records.
+        snapshot: ManifestSnapshot = {}
+        for rec in self._records(None):
+            entry = manifest_entry(rec, self.root_name)
+            snapshot[entry["path"]] = (entry, rec.sha256, rec.size, rec.mtime_iso)
+        return snapshot
+
+    def rescan(self, changed: Set[str]) -> Dict[str, Any]:
+        """Apply one debounced batch of changed paths; rewrites the outputs and returns the summary."""
+        self.cache.hits = self.cache.misses = 0
+        if "*" in changed:
+            # inotify dropped events: list everything again.
+            changed = {str(root) for root in self.roots}
+        fresh = self._relist(changed)
+        self._check_size()
+        redo = list(self.keys) if self._set_config() else fresh
+        store_counts = self._index(redo)
+
+        term_writer: Optional[TermIndexWriter] = None
+        if self.args.term_index:
+            term_path = self.out_dir / Path(self.args.term_index).expanduser()
+            term_writer = TermIndexWriter(term_path, term_key_check(self.cfg.term_key))
+        records = self._records(term_writer)
+        summary = write_outputs(
+            self.args, self.roots, self.out_dir, self.seed_items, records, term_writer, canonicals=self.cfg.matcher.canonicals
+        )
+        base, self.snapshot = self.snapshot, self._snapshot()
+        if store_counts is not None:
+            summary["content_store"] = store_counts
+        self.cache.seen = {str(watched.entry[1]) for watched in self.files.values()}
+        self.cache.save()
+        summary["cache"] = {"path": str(self.cache.path), "hits": self.cache.hits, "misses": self.cache.misses}
+        summary["delta"] = write_manifest_delta(self.out_dir, self.out_dir, base=base, target=self.snapshot)
+        summary["reindexed"] = len(redo)
+        write_json(self.out_dir / "SUMMARY.json", summary)
+        return summary
+
+
+def watch_main(args: argparse.Namespace, roots: List[Path], out_dir: Path, seed_manifest_path: Optional[Path]) -> int:
+    """
+    --watch: after the initial pass, wait for changes under the roots, debounce bursts and
+    re-index only the changed paths (see WatchIndex); outputs are replaced atomically and
+    each rescan writes its manifest delta. Stops on Ctrl-C.
+    """
+    own = [str(out_dir) + os.sep]
+    if args.cache_file:
+        own.append(str(Path(args.cache_file).expanduser().resolve()))
+    if args.content_store:
+        own.append(str(Path(args.content_store).expanduser().resolve()))
+
+    def ignore(path: str) -> bool:
+        # Our own outputs/caches may live under a root; never react to them.
+        return path + os.sep == own[0] or any(path.startswith(p) for p in own)
+
+    watcher: Union[InotifyWatcher, PollWatcher]
+    try:
+        if args.watch_backend == "poll":
+            raise OSError("polling requested")
+        watcher = InotifyWatcher(roots, ignore, follow_symlinks=args.symlinks == "follow")
+    except OSError as e:
+        if args.watch_backend == "inotify":
+            print(f"ERROR: inotify unavailable: {e}", file=sys.stderr)
+            return 2
+        watcher = PollWatcher(roots, ignore, args.include, args.exclude, args.symlinks, args.io_concurrency)
+    backend = "inotify" if isinstance(watcher, InotifyWatcher) else "poll"
+    index = WatchIndex(args, roots, out_dir, load_seed_manifest(seed_manifest_path))
+    try:
+        index.load()
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps({"watch": "ready", "backend": backend, "debounce_s": args.watch_debounce}), flush=True)
+
+    try:
+        while True:
+            changed = watcher.wait(None)
+            if not changed:
+                continue
+            first = time.monotonic()
+            while time.monotonic() - first < WATCH_MAX_DELAY:
+                more = watcher.wait(args.watch_debounce)
+                if not more:
+                    break
+                changed |= more
+            t0 = time.perf_counter()
+            try:
+                summary = index.rescan(changed)
+            except ValueError as e:
+                print(f"ERROR: {e}", file=sys.stderr)
+                return 2
+            delta = dict(summary["delta"])
+            delta.pop("path")
+            print(
+                json.dumps(
+                    {
+                        "watch": "rescan",
+                        "changed_paths": len(changed),
+                        "reindexed": summary["reindexed"],
+                        "indexed_count": summary["indexed_count"],
+                        "reprocessed": summary["cache"]["misses"],
+                        "delta": delta,
+                        "elapsed_s": round(time.perf_counter() - t0, 3),
+                    }
+                ),
+                flush=True,
+            )
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        if isinstance(watcher, InotifyWatcher):
+            watcher.close()
+
+
+# Subcommand -> the sibling module whose main() runs it (loaded only when used).
+SUBCOMMANDS = {
+    "query": "evidence_query",
+    "terms": "evidence_terms",
+    "timeline": "evidence_timeline",
+    "merge": "evidence_merge",
+    "diff": "evidence_diff",
+    "merkle": "evidence_merkle",
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    # Subcommands come first; anything else is the original flat scan CLI.
+    if argv and argv[0] in SUBCOMMANDS:
+        return sibling_module(SUBCOMMANDS[argv[0]]).main(argv[1:])
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--root", action="append", required=True, help="Evidence root directory (repeatable).")
+    ap.add_argument("--seed-manifest", default="", help="Optional seed manifest JSON (array of {name,path,ext,category}).")
+    ap.add_argument("--out-dir", required=True, help="Output directory for reports/manifests (local-only).")
+    ap.add_argument("--evidence-root-name", default="evidence", help="Logical name used for manifest paths.")
+    ap.add_argument("--max-bytes-for-hash", type=int, default=0, help="If >0, only hash files <= this size (bytes).")
+    ap.add_argument("--include", action="append", default=[], help="Only index files matching this glob (repeatable; rel path or name).")
+    ap.add_argument("--exclude", action="append", default=[], help="Skip files/directories matching this glob (repeatable; rel path or name).")
+    ap.add_argument("--symlinks", choices=SYMLINK_POLICIES, default="files", help="Symlink policy: files (default), follow, or skip.")
+    ap.add_argument(
+        "--archive-depth",
+        type=int,
+        default=0,
+        help="Index ZIP members as <zip>!/<member> records (hashed, dated, entity-matched in memory), "
+        "descending into nested ZIPs up to N levels. 0 = off (ZIPs are opaque files).",
+    )
+    ap.add_argument("--no-word-boundaries", action="store_true", help="Let entity aliases match inside words (substring matching).")
+    ap.add_argument("--date-order", choices=DATE_ORDERS, default="mdy", help="Field order for numeric dates like 1/7/26 (mdy or dmy).")
+    ap.add_argument("--pdf-page-workers", type=int, default=1, help=f"Processes per long PDF (>= {PDF_FANOUT_MIN_PAGES} pages) when --workers is 1.")
+    ap.add_argument(
+        "--pdf-text-cache",
+        default="",
+        help="Opt-in directory caching extracted PDF page text by sha256+page. Contains raw text: keep local.",
+    )
+    ap.add_argument(
+        "--content-store",
+        default="",
+        help="SQLite extraction store keyed by sha256 (default: <out-dir>/.deepdive_content.sqlite).",
+    )
+    ap.add_argument("--no-content-store", action="store_true", help="Disable the sha256-keyed extraction store.")
+    ap.add_argument(
+        "--no-media-metadata",
+        action="store_true",
+        help="Do not read capture dates from photo/video/audio headers (MP4/MOV/M4A/HEIC, JPEG Exif, WAV).",
+    )
+    ap.add_argument(
+        "--dedupe",
+        choices=("full", "staged"),
+        default="full",
+        help="full: sha256 every file (default). staged: size buckets -> head/tail digest -> sha256 only on collision.",
+    )
+    ap.add_argument("--full-hash", action="store_true", help="With --dedupe staged, still record sha256 for every file.")
+    ap.add_argument(
+        "--merkle",
+        action="store_true",
+        help="Hash every file and keep a directory-shaped Merkle tree in <out-dir>/evidence_merkle.json (updated in place on "
+        "rescans), keyed by root name + path under the root; its root goes into SUMMARY.json. See `merkle --help`.",
+    )
+    ap.add_argument("--incremental", action="store_true", help="Reuse cached results for files unchanged since the last run.")
+    ap.add_argument("--workers", type=int, default=1, help="Parallel hash/extract workers (1 = serial). Output order is unchanged.")
+    ap.add_argument(
+        "--io-concurrency",
+        type=int,
+        default=0,
+        help="For network/cloud-synced roots: keep up to N stat/open/read calls in flight (async walk, threaded reads). "
+        "0 = off. Output is unchanged.",
+    )
+    ap.add_argument("--cache-file", default="", help="Fingerprint cache path for --incremental (default: <out-dir>/.deepdive_cache.json).")
+    ap.add_argument(
+        "--shard",
+        default="",
+        help="i/N: index only the files whose path hashes to slice i of N and write SHARD.jsonl; "
+        "combine the N shard out-dirs with `merge --help`.",
+    )
+    ap.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="json: arrays/objects as before (streamed). jsonl: one record per line (entity_map/duplicates as flat rows).",
+    )
+    ap.add_argument("--gzip", action="store_true", help="Gzip the per-record outputs (JSON/JSONL/CSV get a .gz suffix).")
+    ap.add_argument(
+        "--sqlite",
+        nargs="?",
+        const="evidence_index.sqlite",
+        default="",
+        help="Also write a queryable SQLite index (default name: <out-dir>/evidence_index.sqlite); see `query --help`.",
+    )
+    ap.add_argument(
+        "--term-index",
+        nargs="?",
+        const="evidence_terms.idx",
+        default="",
+        help="Also write a positional term index of extracted text (default name: <out-dir>/evidence_terms.idx); needs --term-key. See `terms --help`.",
+    )
+    ap.add_argument(
+        "--term-key",
+        default="",
+        help="Secret key file for --term-index term ids, one per matter (generated if missing); must live outside --out-dir. Queries need it too.",
+    )
+    ap.add_argument("--profile", action="store_true", help="Write PERF.json: time, CPU, bytes read and peak memory per stage and file type.")
+    ap.add_argument("--profile-top", type=int, default=20, help="Slowest files listed in PERF.json with their stage breakdown.")
+    ap.add_argument(
+        "--profile-dump",
+        action="append",
+        choices=("cprofile", "tracemalloc"),
+        default=[],
+        help="With --profile, also write PERF.cprofile (pstats) and/or PERF.tracemalloc (snapshot; adds per-stage Python peaks).",
+    )
+    ap.add_argument(
+        "--diff-against",
+        default="",
+        help=f"Out-dir of an earlier run (may be --out-dir itself) to diff this run against; writes <out-dir>/{DELTA_FILE}. See `diff --help`.",
+    )
+    ap.add_argument("--watch", action="store_true", help="Keep running and rescan changed files as they appear (implies --incremental).")
+    ap.add_argument("--watch-debounce", type=float, default=1.0, help="Seconds without further changes before a --watch rescan.")
+    ap.add_argument("--watch-backend", choices=WATCH_BACKENDS, default="auto", help="auto: inotify, else polling.")
+    ap.add_argument(
+        "--watch-max-files",
+        type=int,
+        default=WATCH_MAX_FILES,
+        help="Stop --watch once the roots list more files than this (every record is kept in memory and all outputs are rewritten per rescan).",
+    )
+    args = ap.parse_args(argv)
+
+    roots = [Path(r).expanduser().resolve() for r in args.root]
+    out_dir = Path(args.out_dir).expanduser().resolve()
+    seed_manifest_path = Path(args.seed_manifest).expanduser().resolve() if args.seed_manifest else None
+
+    for r in roots:
+        if not r.exists() or not r.is_dir():
+            print(f"ERROR: root not found or not a directory: {r}", file=sys.stderr)
+            return 2
+    if args.term_index:
+        if not args.term_key:
+            print("ERROR: --term-index needs --term-key (a secret key file kept outside --out-dir)", file=sys.stderr)
+            return 2
+        key_path = Path(args.term_key).expanduser().resolve()
+        if out_dir in key_path.parents:
+            print("ERROR: --term-key must live outside --out-dir, so the index can be shared without it", file=sys.stderr)
+            return 2
+        try:
+            load_term_key(key_path, create=True)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 2
+    if args.merkle and args.max_bytes_for_hash:
+        print("ERROR: --merkle commits to every file's sha256 and cannot be combined with --max-bytes-for-hash", file=sys.stderr)
+        return 2
+    if args.shard:
+        try:
+            parse_shard(args.shard)
+        except ValueError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 2
+        if args.watch:
+            print("ERROR: --shard cannot be combined with --watch", file=sys.stderr)
+            return 2
+        if args.diff_against:
+            print("ERROR: --diff-against applies to full runs; diff the merged out-dir instead", file=sys.stderr)
+            return 2
+    if args.diff_against and not Path(args.diff_against).expanduser().is_dir():
+        print(f"ERROR: --diff-against out-dir not found: {args.diff_against}", file=sys.stderr)
+        return 2
+    if args.watch:
+        # Every rescan after the first reuses the fingerprint cache and content store.
+        args.incremental = True
+
+    summary = run_deepdive(args, roots, out_dir, seed_manifest_path)
+    print(json.dumps(summary, indent=2))
+    if args.watch:
+        return watch_main(args, roots, out_dir, seed_manifest_path)
+    return 0
+
+
+def scan_config(args: argparse.Namespace, filename_terms: List[str]) -> ScanConfig:
+    # The ScanConfig for args, with the alias table extended by filename-derived terms.
+    aliases = build_entity_aliases(extra_terms=filename_terms)
+    return ScanConfig(
+        matcher=AliasMatcher(aliases, word_boundaries=not args.no_word_boundaries),
+        date_order=args.date_order,
+        max_bytes_for_hash=args.max_bytes_for_hash,
+        pdf_page_workers=args.pdf_page_workers,
+        pdf_text_cache=PdfPageTextCache(Path(args.pdf_text_cache).expanduser().resolve()) if args.pdf_text_cache else None,
+        hash_policy="all" if args.dedupe == "full" or args.full_hash or args.merkle else "content",
+        term_index=bool(args.term_index),
+        term_key=load_term_key(Path(args.term_key).expanduser()) if args.term_index else b"",
+        archive_depth=max(0, args.archive_depth),
+        media_metadata=not args.no_media_metadata,
+    )
+
+
+def open_cache(args: argparse.Namespace, out_dir: Path, cfg: ScanConfig) -> FingerprintCache:
+    cache_path = Path(args.cache_file).expanduser().resolve() if args.cache_file else out_dir / ".deepdive_cache.json"
+    cache = FingerprintCache(cache_path, cfg.cache_key(), cfg.matcher.fingerprint())
+    cache.load()
+    return cache
+
+
+def open_store(args: argparse.Namespace, out_dir: Path, cfg: ScanConfig) -> Optional[ContentStore]:
+    if args.no_content_store:
+        return None
+    store_path = Path(args.content_store).expanduser().resolve() if args.content_store else out_dir / ".deepdive_content.sqlite"
+    return ContentStore(store_path, cfg.content_key(), cfg.matcher.fingerprint())
+
+
+def run_deepdive(args: argparse.Namespace, roots: List[Path], out_dir: Path, seed_manifest_path: Optional[Path]) -> Dict[str, Any]:
+    """One full deep-dive pass over roots; writes every output (or, with --shard, SHARD.jsonl) and returns the summary."""
+    perf: Optional[PerfRecorder] = None
+    profiler: Any = None
+    if args.profile:
+        perf = PerfRecorder(args.profile_top, trace_memory="tracemalloc" in args.profile_dump)
+        if "cprofile" in args.profile_dump:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+    stage: Any = perf.stage if perf else (lambda name: contextlib.nullcontext())
+    seed_items = load_seed_manifest(seed_manifest_path)
+
+    # Walk once: the same listing feeds filename-term discovery and indexing.
+    with stage("walk"):
+        if args.io_concurrency > 0:
+            entries = scan_roots_async(roots, args.include, args.exclude, args.symlinks, args.io_concurrency)
+        else:
+            entries = list(scan_roots(roots, include=args.include, exclude=args.exclude, symlinks=args.symlinks))
+    with stage("aliases"):
+        cfg = scan_config(args, discover_filename_terms(f.name for _, f, _ in entries))
+
+    shard: Optional[Tuple[int, int]] = parse_shard(args.shard) if args.shard else None
+    listing = entries
+    positions: List[int] = []
+    if shard:
+        # Every shard walks everything (aliases come from all file names); each indexes its slice.
+        positions = [i for i, (root, f, _) in enumerate(listing) if shard_of(root, f, shard[1]) == shard[0] - 1]
+        entries = [listing[i] for i in positions]
+
+    with stage("setup"):
+        cache: Optional[FingerprintCache] = None
+        if args.incremental:
+            cache = open_cache(args, out_dir, cfg)
+        store = open_store(args, out_dir, cfg)
+
+        # Read before this run overwrites it when --diff-against is the out-dir itself.
+        previous: Optional[ManifestSnapshot] = None
+        if args.diff_against and not shard:
+            previous = load_manifest_snapshot(Path(args.diff_against).expanduser().resolve())
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    term_writer: Any = None
+    if args.term_index:
+        term_path = out_dir / Path(args.term_index).expanduser()
+        term_writer = ShardTerms() if shard else TermIndexWriter(term_path, term_key_check(cfg.term_key))
+
+    records: Iterable[IndexedFile] = index_files(
+        entries, cfg, cache, workers=args.workers, store=store, term_index=term_writer, perf=perf, io_concurrency=args.io_concurrency
+    )
+    if perf:
+        # "index" is time spent waiting for records; the rest of the loop is output writing.
+        records = perf.timed(records, "index")
+    if shard:
+        summary = write_shard(args, roots, out_dir, seed_items, cfg, shard, listing, positions, records, term_writer, stage)
+    else:
+        summary = write_outputs(args, roots, out_dir, seed_items, records, term_writer, perf, canonicals=cfg.matcher.canonicals)
+    with stage("finalize"):
+        if store:
+            store.close()
+            summary["content_store"] = {"path": str(store.path), "hits": store.hits, "misses": store.misses}
+        if cache:
+            cache.save()
+            summary["cache"] = {"path": str(cache.path), "hits": cache.hits, "misses": cache.misses}
+        if previous is not None:
+            summary["delta"] = write_manifest_delta(Path(args.diff_against).expanduser().resolve(), out_dir, base=previous)
+    if perf:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(str(out_dir / "PERF.cprofile"))
+        report = perf.report(args.workers)
+        if perf.trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            snapshot.dump(str(out_dir / "PERF.tracemalloc"))
+            report["tracemalloc_top"] = [
+                {"site": str(st.traceback), "size_mb": round(st.size / 1e6, 3), "count": st.count}
+                for st in snapshot.statistics("lineno")[:25]
+            ]
+        write_json(out_dir / "PERF.json", report)
+        summary["perf"] = str(out_dir / "PERF.json")
+    write_json(out_dir / "SUMMARY.json", summary)
+    return summary
+
+
+def manifest_entry(rec: IndexedFile, evidence_root_name: str) -> Dict[str, Any]:
+    return {
+        "name": rec.name,
+        "path": f"{evidence_root_name}:{rec.full_path}",
+        "ext": rec.ext,
+        "category": rec.category,
+    }
+
+
+def write_outputs(
+    args: argparse.Namespace,
+    roots: List[Path],
+    out_dir: Path,
+    seed_items: List[EvidenceItem],
+    records: Iterable[IndexedFile],
+    term_writer: Optional[TermIndexWriter] = None,
+    perf: Optional[PerfRecorder] = None,
+    partials: Optional[Dict[int, str]] = None,
+    canonicals: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Every deep-dive output from records in walk order (a scan, or merged --shard runs).
+    term_writer must already hold (or be fed, as records arrive) each record's postings in
+    the same order. canonicals is the run's AliasMatcher.canonicals, for the --sqlite
+    index. Returns the summary.
+    """
+    stage: Any = perf.stage if perf else (lambda name: contextlib.nullcontext())
+    keys: List[DedupeKey] = []
+    by_hash: Dict[str, List[int]] = {}
+    merkle_names: List[str] = []
+    em = sibling_module("evidence_merkle") if args.merkle else None
+
+    # Outputs are streamed as records arrive; only dedupe keys and small per-entity state
+    # stay in memory, so peak memory does not grow with the corpus.
+    out_dir.mkdir(parents=True, exist_ok=True)
+    outputs = OutputSet(out_dir, fmt=args.format, compress=args.gzip)
+    inventory_fields = list(INDEXED_FIELDS)
+    indexed_out = outputs.records("indexed_files")
+    inventory_out = outputs.table("inventory.csv", inventory_fields)
+    manifest_out = outputs.records("evidence_vault_manifest")
+    entity_rows = outputs.records("entity_map") if args.format == "jsonl" else None
+    entity_spill = None if entity_rows else GroupSpill(out_dir / ".entity_map.spill.sqlite")
+    entity_keys: Set[str] = set()
+    timeline_spill = TimelineSpill(out_dir / ".timeline.spill.sqlite")
+    index_db: Optional[EvidenceIndexDb] = None
+    if args.sqlite:
+        index_db = EvidenceIndexDb(out_dir / Path(args.sqlite).expanduser())
+    gap_tracker = GapTracker()
+
+    # EvidenceVault manifest: choose a single logical root name; use full path for now,
+    # but prefix with evidence-root-name so the app can keep it distinct.
+    # (User can later rebase these paths by regenerating with a different convention.)
+    evidence_root_name = safe_norm(args.evidence_root_name) or "evidence"
+
+    def emit_record(row: Dict[str, Any]) -> None:
+        indexed_out.append(row)
+        inventory_out.writerow(row)
+
+    # Staged dedupe fills in sha256 only after the walk, so records are parked in a spill
+    # file and replayed with their final hashes.
+    record_spill: Optional[TextIO] = None
+    record_spill_path = out_dir / ".indexed_files.spill.jsonl"
+    if args.dedupe == "staged":
+        record_spill = record_spill_path.open("w+", encoding="utf-8")
+
+    loop_w0, loop_c0 = time.perf_counter(), time.process_time()
+    archive_members = 0
+    for rec in records:
+        file_hash = rec.sha256
+        idx = len(keys)
+        keys.append((rec.full_path, rec.size, file_hash))
+        if args.merkle:
+            merkle_names.append(em.merkle_key(Path(rec.source_root).name, rec.rel_path))
+        if args.archive_depth > 0 and ARCHIVE_SEP in rec.rel_path:
+            archive_members += 1
+        if file_hash:
+            by_hash.setdefault(file_hash, []).append(idx)
+        if index_db:
+            index_db.add(idx, rec)
+        row = rec.row()
+        if record_spill:
+            record_spill.write(json.dumps(row, ensure_ascii=True) + "\n")
+        else:
+            emit_record(row)
+
+        # Entity map: canonical -> list of {path, count, basis}.
+        for ent, c in rec.entity_hits.items():
+            entry: Dict[str, Any] = {
+                "path": rec.full_path,
+                "count": c,
+                "basis": "content" if rec.content_extracted else "filename",
+            }
+            pages = rec.page_refs.get("entities", {}).get(ent)
+            if pages:
+                entry["pages"] = pages
+            entity_keys.add(ent)
+            if entity_rows:
+                entity_rows.append({"entity": ent, **entry})
+            else:
+                entity_spill.add(ent, entry)
+
+        # Timeline hits are sorted and merged across duplicate copies after the walk.
+        for d in rec.dates_from_filename:
+            timeline_spill.add(d, "filename", idx, [])
+        date_pages = rec.page_refs.get("dates", {})
+        date_basis = content_date_basis(rec)
+        for d in rec.dates_from_content:
+            timeline_spill.add(d, date_basis, idx, date_pages.get(d, []))
+
+        manifest_out.append(manifest_entry(rec, evidence_root_name))
+        # Simple gaps checklist heuristics based on category presence and keyword presence.
+        gap_tracker.feed(rec.name)
+    if perf:
+        index_stage = perf.stages.get("index", {"wall_s": 0.0, "cpu_s": 0.0})
+        perf.charge(
+            "output",
+            time.perf_counter() - loop_w0 - index_stage["wall_s"],
+            time.process_time() - loop_c0 - index_stage["cpu_s"],
+        )
+
+    # Build duplicates report (same hash across roots/paths).
+    with stage("dedupe"):
+        dedupe_stats: Dict[str, int] = {}
+        if args.dedupe == "staged":
+            dups, dedupe_stats = staged_duplicates(keys, max(args.workers, args.io_concurrency), partials)
+            if index_db:
+                index_db.set_hashes(keys)
+        else:
+            dups = {h: idxs for h, idxs in by_hash.items() if len(idxs) > 1}
+
+    merkle: Optional[Dict[str, Any]] = None
+    if args.merkle:
+        with stage("merkle"):
+            merkle = update_merkle_tree(out_dir / em.MERKLE_FILE, merkle_names, keys)
+
+    with stage("output"):
+        if record_spill:
+            record_spill.seek(0)
+            for idx, line in enumerate(record_spill):
+                row = json.loads(line)
+                row["sha256"] = keys[idx][2]
+                emit_record(row)
+            record_spill.close()
+            record_spill_path.unlink()
+
+        dups_out = outputs.records("duplicates_by_sha256", kind="object")
+        for h, idxs in dups.items():
+            if isinstance(dups_out, JsonStreamWriter):
+                dups_out.put(h, idxs)
+            else:
+                dups_out.append({"sha256": h, "indices": idxs})
+        if entity_spill:
+            entity_out = outputs.records("entity_map", kind="object")
+            for ent, ent_entries in entity_spill.groups():
+                entity_out.put_array(ent, ent_entries)  # type: ignore[union-attr]
+            entity_spill.close()
+    with stage("timeline"):
+        # Chronological timeline, one row per (date, basis, content); CSV and JSON carry the same rows.
+        timeline_csv = outputs.table("timeline.csv", TIMELINE_FIELDS)
+        timeline_out = outputs.records("timeline")
+        timeline_count = 0
+        for trow in timeline_spill.rows(keys):
+            timeline_out.append(trow)
+            timeline_csv.writerow({**trow, "pages": ";".join(str(p) for p in trow["pages"]), "also_in": ";".join(trow["also_in"])})
+            timeline_count += 1
+        timeline_hits = timeline_spill.hits
+        timeline_spill.close()
+    with stage("output"):
+        outputs.close()
+
+    write_json(out_dir / "seed_manifest_parsed.json", [asdict(x) for x in seed_items])
+    gaps = gap_tracker.gaps()
+    (out_dir / "gaps_checklist.md").write_text(
         "# Gaps Checklist (Heuristic)\n\n"
         + "\n".join([f"- {g}" for g in gaps] or ["- No gaps flagged by current heuristics."])
         + "\n",
@@ -440,22 +4228,293 @@ def main() -> int:
 
     summary = {
         "roots": [str(r) for r in roots],
-        "indexed_count": len(indexed),
+        "indexed_count": len(keys),
         "duplicate_hash_groups": len(dups),
-        "entity_keys": len(entity_map.keys()),
-        "timeline_rows": len(timeline_rows),
+        "dedupe": {"mode": args.dedupe, **dedupe_stats},
+        "entity_keys": len(entity_keys),
+        "timeline_rows": timeline_count,
+        "timeline_hits": timeline_hits,
+        **({"archive_members": archive_members} if args.archive_depth > 0 else {}),
+        **({"merkle": merkle} if merkle else {}),
         "out_dir": str(out_dir),
+        "output": {"format": args.format, "gzip": args.gzip},
         "notes": [
             "PII-safe default: outputs do not include raw document text.",
             "PDF content extraction requires optional dependency pypdf; if missing, PDF-based entity/date hits come from filenames only.",
             "Manifest paths are prefixed with evidence-root-name and include full paths to keep them stable and local-only.",
         ],
     }
-    write_json(out_dir / "SUMMARY.json", summary)
-    print(json.dumps(summary, indent=2))
-    return 0
+    with stage("finalize"):
+        if index_db:
+            meta = {"roots": summary["roots"], "generated_at": dt.datetime.now().isoformat(timespec="seconds")}
+            index_db.finish(dups, meta, canonicals or {})
+            summary["sqlite_index"] = str(index_db.path)
+        if term_writer:
+            summary["term_index"] = term_writer.finish([k[0] for k in keys])
+    return summary
+
+
+# --shard i/N: each node walks every root, indexes the files whose path hashes to slice i and
+# writes SHARD.jsonl; `merge` interleaves the shard files back into walk order and writes the
+# outputs a single run would have written.
+SHARD_FILE = "SHARD.jsonl"
+SHARD_VERSION = 2
+# Scan options that only shape the outputs; a merge takes them from the shards.
+SHARD_OPTIONS = (
+    "format",
+    "gzip",
+    "sqlite",
+    "term_index",
+    "dedupe",
+    "evidence_root_name",
+    "archive_depth",
+    "merkle",
+    "workers",
+    "io_concurrency",
+)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    # "i/N", 1-based: (i, N).
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard must look like i/N (e.g. 2/8), got {spec!r}") from None
+    if not 1 <= i <= n:
+        raise ValueError(f"--shard {spec}: need 1 <= i <= N")
+    return i, n
+
+
+def shard_of(root: Path, f: Path, n: int) -> int:
+    # 0-based slice of a file: a hash of its path relative to its root, so every node splits
+    # the listing the same way.
+    rel = os.path.relpath(str(f), str(root)).replace("\\", "/")
+    return int.from_bytes(hashlib.sha256(os.fsencode(rel)).digest()[:8], "big") % n
+
+
+def listing_digest(entries: List[ScanEntry]) -> str:
+    # Shards can only be merged if they walked the same files.
+    h = hashlib.sha256()
+    for _, f, st in entries:
+        h.update(os.fsencode(str(f)) + b"\0" + str(st.st_size).encode("ascii") + b"\n")
+    return h.hexdigest()
+
+
+class ShardTerms:
+    """TermIndexWriter stand-in for --shard and --watch: each record's postings, in order."""
+
+    def __init__(self) -> None:
+        self.pending: Deque[Optional[bytes]] = deque()
+
+    def add(self, terms: Optional[bytes]) -> None:
+        self.pending.append(terms)
+
+
+def write_shard(
+    args: argparse.Namespace,
+    roots: List[Path],
+    out_dir: Path,
+    seed_items: List[EvidenceItem],
+    cfg: ScanConfig,
+    shard: Tuple[int, int],
+    listing: List[ScanEntry],
+    positions: List[int],
+    records: Iterable[IndexedFile],
+    terms: Optional[ShardTerms],
+    stage: Any,
+) -> Dict[str, Any]:
+    """
+    SHARD.jsonl: a header line (shard, config fingerprint, listing digest, output options),
+    one line per record with its place in the full walk ([listing position, member number])
+    and its term postings, then the partial digests of this shard's files for staged dedupe.
+    Written under a .tmp name, so an existing SHARD.jsonl is always complete.
+    """
+    header = {
+        "version": SHARD_VERSION,
+        "shard": shard[0],
+        "shards": shard[1],
+        "config_key": cfg.fingerprint(),
+        "term_key_check": term_key_check(cfg.term_key) if cfg.term_index else None,
+        "canonicals": cfg.matcher.canonicals,
+        "listing": listing_digest(listing),
+        "roots": [str(r) for r in roots],
+        "seed_items": [asdict(x) for x in seed_items],
+        "options": {k: getattr(args, k) for k in SHARD_OPTIONS},
+    }
+    # Files sharing a size with any other listed file will need a partial digest in a staged
+    # merge; taking it here spreads that I/O over the shards.
+    size_count: Dict[int, int] = {}
+    if args.dedupe == "staged":
+        for _, _, st in listing:
+            size_count[st.st_size] = size_count.get(st.st_size, 0) + 1
+    partial_jobs: List[Tuple[int, Path, int]] = []
+    fh = open_output(out_dir / SHARD_FILE, compress=args.gzip)
+    fh.write(json.dumps(header, ensure_ascii=True) + "\n")
+    k, sub, count = -1, 0, 0
+    for rec in records:
+        # A file's record is followed by its archive members' (see index_files).
+        if k + 1 < len(positions) and rec.full_path == str(listing[positions[k + 1]][1]):
+            k, sub = k + 1, 0
+        else:
+            sub += 1
+        line: Dict[str, Any] = {"pos": [positions[k], sub], "record": rec.row()}
+        if terms is not None:
+            postings = terms.pending.popleft()
+            if postings:
+                line["terms"] = base64.b64encode(postings).decode("ascii")
+        fh.write(json.dumps(line, ensure_ascii=True) + "\n")
+        count += 1
+        if sub == 0 and not rec.sha256 and rec.size > 2 * PARTIAL_BLOCK and size_count.get(rec.size, 0) > 1:
+            partial_jobs.append((positions[k], Path(rec.full_path), rec.size))
+    with stage("dedupe"):
+        partials = _hash_many(partial_digest, partial_jobs, max(args.workers, args.io_concurrency))
+    fh.write(json.dumps({"partials": {str(p): d for p, d in sorted(partials.items())}}, ensure_ascii=True) + "\n")
+    close_output(fh)
+    return {
+        "roots": header["roots"],
+        "shard": f"{shard[0]}/{shard[1]}",
+        "listed_count": len(listing),
+        "indexed_count": count,
+        "partial_hashed": len(partial_jobs),
+        "shard_file": str(getattr(fh, "final_path")),
+        "out_dir": str(out_dir),
+    }
+
+
+DELTA_FILE = "evidence_vault_delta.json"
+DELTA_KIND = "evidence_vault_delta"
+DELTA_VERSION = 1
+
+# Manifest path -> (manifest entry, sha256, size, mtime_iso)
+ManifestSnapshot = Dict[str, Tuple[Dict[str, Any], str, int, str]]
+
+
+def output_path(out_dir: Path, stem: str) -> Optional[Path]:
+    # The newest of <stem>.json / .jsonl (either optionally .gz): a directory rescanned
+    # with a different --format keeps the older file around.
+    found = [out_dir / (stem + s) for s in (".json", ".jsonl", ".json.gz", ".jsonl.gz") if (out_dir / (stem + s)).is_file()]
+    return max(found, key=lambda f: f.stat().st_mtime_ns) if found else None
+
+
+def _output_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    opener: Any = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        if path.name.endswith((".jsonl", ".jsonl.gz")):
+            yield from (json.loads(line) for line in f if line.strip())
+        else:
+            yield from json.load(f)
+
+
+def load_manifest_snapshot(out_dir: Path) -> ManifestSnapshot:
+    """
+    A finished run's EvidenceVault manifest keyed by manifest path, each entry paired with
+    the content fields of its indexed_files row (the two are written in the same order).
+    An out-dir without outputs yet gives an empty snapshot.
+    """
+    manifest_path = output_path(out_dir, "evidence_vault_manifest")
+    indexed_path = output_path(out_dir, "indexed_files")
+    if manifest_path is None or indexed_path is None:
+        return {}
+    snapshot: ManifestSnapshot = {}
+    for entry, rec in itertools.zip_longest(_output_rows(manifest_path), _output_rows(indexed_path)):
+        if entry is None or rec is None:
+            raise ValueError(f"{manifest_path.name} and {indexed_path.name} in {out_dir} have different lengths")
+        snapshot[entry["path"]] = (entry, rec["sha256"], rec["size"], rec["mtime_iso"])
+    return snapshot
+
+
+def _content_key(item: Tuple[Dict[str, Any], str, int, str]) -> str:
+    # What a moved file keeps: its sha256, or for unhashed files name + size + mtime.
+    entry, sha, size, mtime = item
+    return sha or f"{entry['name']}\0{size}\0{mtime}"
+
+
+def diff_manifests(old: ManifestSnapshot, new: ManifestSnapshot) -> Dict[str, Any]:
+    """
+    Run-to-run change sets in O(n) dict lookups: added, removed, moved (same content at a
+    new path; paired in walk order when copies are duplicated), modified (same path, other
+    content; sha256 when both runs hashed the file, else size + mtime) and recategorized
+    (same content, other manifest entry). remove/upsert are the manifest edits that turn
+    the old manifest into the new one.
+    """
+    gone: Dict[str, Deque[str]] = {}
+    for path, item in old.items():
+        if path not in new:
+            gone.setdefault(_content_key(item), deque()).append(path)
+
+    added: List[str] = []
+    moved: List[Dict[str, str]] = []
+    modified: List[str] = []
+    recategorized: List[str] = []
+    upsert: List[Dict[str, Any]] = []
+    unchanged = 0
+    for path, item in new.items():
+        prev = old.get(path)
+        if prev is None:
+            sources = gone.get(_content_key(item))
+            if sources:
+                moved.append({"from": sources.popleft(), "to": path})
+            else:
+                added.append(path)
+        elif (item[1] != prev[1]) if item[1] and prev[1] else (item[2:] != prev[2:]):
+            modified.append(path)
+        elif item[0] != prev[0]:
+            recategorized.append(path)
+        else:
+            unchanged += 1
+            continue
+        upsert.append(item[0])
+    moved_from = {m["from"] for m in moved}
+    removed = [path for path in old if path not in new and path not in moved_from]
+    return {
+        "counts": {
+            "added": len(added),
+            "removed": len(removed),
+            "moved": len(moved),
+            "modified": len(modified),
+            "recategorized": len(recategorized),
+            "unchanged": unchanged,
+        },
+        "remove": removed + [m["from"] for m in moved],
+        "upsert": upsert,
+        "added": added,
+        "removed": removed,
+        "moved": moved,
+        "modified": modified,
+        "recategorized": recategorized,
+    }
+
+
+def write_manifest_delta(
+    base_dir: Path,
+    target_dir: Path,
+    delta_path: Optional[Path] = None,
+    base: Optional[ManifestSnapshot] = None,
+    target: Optional[ManifestSnapshot] = None,
+) -> Dict[str, Any]:
+    """
+    Diff target_dir's outputs against base_dir's and write the delta (default:
+    <target_dir>/evidence_vault_delta.json). Pass base when base_dir is about to be (or has
+    been) overwritten by the target run, and target when its snapshot is already at hand.
+    Returns the delta path and counts.
+    """
+    old = load_manifest_snapshot(base_dir) if base is None else base
+    new = load_manifest_snapshot(target_dir) if target is None else target
+    delta = {
+        "kind": DELTA_KIND,
+        "version": DELTA_VERSION,
+        "base": {"out_dir": str(base_dir), "files": len(old)},
+        "target": {"out_dir": str(target_dir), "files": len(new)},
+        **diff_manifests(old, new),
+    }
+    path = delta_path or target_dir / DELTA_FILE
+    write_json(path, delta)
+    return {"path": str(path), **delta["counts"]}
 
 
 if __name__ == "__main__":
+    # The subcommand modules import this file as evidence_deepdive; give them this copy
+    # rather than a second one.
+    sys.modules.setdefault("evidence_deepdive", sys.modules[__name__])
     raise SystemExit(main())
 
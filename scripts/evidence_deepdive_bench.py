@@ -0,0 +1,1381 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for evidence_deepdive.py hot paths.
+
+Runs entirely on synthetic data (in memory or in a temp dir); never touches real evidence.
+Each benchmark compares the current implementation against the legacy approach
+it replaced and prints a JSON result.
+
+`corpus` writes a reproducible synthetic evidence folder (DOCX, PDF, text, dummy media,
+planted duplicates, dates in every supported format). `suite` scans such corpora end to end
+at several sizes and reports files/s, MB/s and peak RSS. Save its output and pass it back
+with --baseline to compare one change against the last.
+"""
+
+from __future__ import annotations
+
+import argparse
+import calendar
+import contextlib
+import csv
+import functools
+import gc
+import datetime as dt
+import hashlib
+import io
+import json
+import math
+import random
+import os
+import re
+import shlex
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import evidence_deepdive as ed  # noqa: E402
+import evidence_diff as edf  # noqa: E402
+import evidence_merkle as em  # noqa: E402
+import evidence_query as eq  # noqa: E402
+import evidence_terms as et  # noqa: E402
+import evidence_timeline as etl  # noqa: E402
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def legacy_count_entity_hits(text: str, aliases: Dict[str, List[str]]) -> Dict[str, int]:
+    # Pre-AliasMatcher implementation: one re.findall per alias over the lowercased text.
+    hits: Dict[str, int] = {}
+    lower = text.lower()
+    for canonical, alist in aliases.items():
+        c = 0
+        for a in alist:
+            a = a.strip()
+            if not a:
+                continue
+            c += len(re.findall(re.escape(a.lower()), lower))
+        if c:
+            hits[canonical] = c
+    return hits
+
+
+LEGACY_DATE_PATTERNS: List[re.Pattern[str]] = [
+    re.compile(r"\b(20\d{2}-\d{2}-\d{2})\b"),
+    re.compile(
+        r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),\s+(20\d{2})\b",
+        re.IGNORECASE,
+    ),
+    re.compile(r"\b(\d{1,2})/(\d{1,2})/(20\d{2})\b"),
+]
+
+
+def legacy_find_dates(text: str) -> List[str]:
+    # Pre-DATE_SCANNER implementation: three full regex passes, raw strings, no normalization.
+    hits: List[str] = []
+    for pat in LEGACY_DATE_PATTERNS:
+        for m in pat.finditer(text):
+            hits.append(m.group(0))
+    return list(dict.fromkeys(h.lower() for h in hits))
+
+
+def legacy_extract_docx_text(path: Path, max_chars: int = 1_000_000) -> Optional[str]:
+    # Pre-streaming implementation: whole word/document.xml in memory, DOTALL regex over <w:t>.
+    try:
+        with zipfile.ZipFile(path, "r") as zf:
+            with zf.open("word/document.xml") as f:
+                xml = f.read()
+    except Exception:
+        return None
+    s = xml.decode("utf-8", errors="ignore")
+    texts = re.findall(r"<w:t[^>]*>(.*?)</w:t>", s, flags=re.IGNORECASE | re.DOTALL)
+    if not texts:
+        return ""
+    joined = ed.safe_norm(" ".join(re.sub(r"<[^>]+>", "", t) for t in texts))
+    return joined[:max_chars]
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Tuple[float, int]:
+    # (best wall seconds, peak traced bytes of a separate run)
+    seconds = best_of(fn, repeat)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def synthetic_terms(rng: random.Random, n: int) -> List[str]:
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(n)]
+
+
+def synthetic_text(rng: random.Random, aliases: Dict[str, List[str]], size: int) -> str:
+    filler = [
+        "the", "and", "report", "hearing", "on", "her", "water", "officer", "statement",
+        "January 6, 2026", "1/7/2026", "1/7/26", "2025-12-30", "Aug. 3rd 2025", "12", "2025",
+    ]
+    vocab = [a for alist in aliases.values() for a in alist] + filler * 10
+    parts: List[str] = []
+    n = 0
+    while n < size:
+        w = rng.choice(vocab)
+        parts.append(w)
+        n += len(w) + 1
+    return " ".join(parts)[:size]
+
+
+def bench_entities(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    aliases = ed.build_entity_aliases(synthetic_terms(rng, args.extra_terms))
+    text = synthetic_text(rng, aliases, int(args.size_mb * 1024 * 1024))
+
+    t0 = time.perf_counter()
+    matcher = ed.AliasMatcher(aliases)
+    compile_s = time.perf_counter() - t0
+
+    legacy_s = best_of(lambda: legacy_count_entity_hits(text, aliases), args.repeat)
+    matcher_s = best_of(lambda: matcher.count(text), args.repeat)
+    return {
+        "benchmark": "entities",
+        "text_chars": len(text),
+        "canonical_entities": len(aliases),
+        "aliases": sum(len(v) for v in aliases.values()),
+        "legacy_per_alias_regex_s": round(legacy_s, 4),
+        "alias_matcher_s": round(matcher_s, 4),
+        "alias_matcher_compile_s": round(compile_s, 4),
+        "speedup": round(legacy_s / matcher_s, 2) if matcher_s else None,
+    }
+
+
+def bench_dates(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    aliases = ed.build_entity_aliases([])
+    text = synthetic_text(rng, aliases, int(args.size_mb * 1024 * 1024))
+
+    legacy_s = best_of(lambda: legacy_find_dates(text), args.repeat)
+    scanner_s = best_of(lambda: ed.find_dates(text), args.repeat)
+    return {
+        "benchmark": "dates",
+        "text_chars": len(text),
+        "legacy_unique_dates": len(legacy_find_dates(text)),
+        "scanner_unique_dates": len(ed.find_dates(text)),
+        "legacy_three_pass_s": round(legacy_s, 4),
+        "date_scanner_s": round(scanner_s, 4),
+        "speedup": round(legacy_s / scanner_s, 2) if scanner_s else None,
+    }
+
+
+W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def write_synthetic_docx(path: Path, rng: random.Random, paragraphs: int) -> None:
+    aliases = ed.build_entity_aliases([])
+    write_docx(path, [synthetic_text(rng, aliases, 200) for _ in range(paragraphs)])
+
+
+def write_docx(path: Path, paragraphs: List[str]) -> None:
+    body: List[str] = []
+    for i, text in enumerate(paragraphs):
+        words = text.split(" ")
+        runs = "".join('<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">%s </w:t></w:r>' % w for w in words)
+        if i % 10 == 0:
+            # Tables wrap paragraphs in extra markup, like exhibit schedules do.
+            body.append("<w:tbl><w:tr><w:tc><w:p>%s</w:p></w:tc><w:tc><w:p>%s</w:p></w:tc></w:tr></w:tbl>" % (runs, runs))
+        else:
+            body.append("<w:p>%s</w:p>" % runs)
+    parts = {
+        "word/document.xml": '<?xml version="1.0"?><w:document %s><w:body>%s</w:body></w:document>' % (W_NS, "".join(body)),
+        "word/header1.xml": "<w:hdr %s><w:p><w:r><w:t>OCSO 2025-08-01</w:t></w:r></w:p></w:hdr>" % W_NS,
+        "word/footnotes.xml": "<w:footnotes %s><w:footnote><w:p><w:r><w:t>Snyder</w:t></w:r></w:p></w:footnote></w:footnotes>" % W_NS,
+    }
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, xml in parts.items():
+            # Fixed member timestamps keep generated files byte-identical from run to run.
+            zf.writestr(zipfile.ZipInfo(name, date_time=(2025, 1, 1, 0, 0, 0)), xml, compress_type=zipfile.ZIP_DEFLATED)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_synthetic_pdf(path: Path, page_texts: List[str]) -> None:
+    # Minimal hand-written PDF (one Helvetica text line per page); no PDF library needed.
+    objs: List[str] = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "",  # pages tree, filled below
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids: List[str] = []
+    for text in page_texts:
+        content = "BT /F1 10 Tf 36 750 Td (%s) Tj ET" % _pdf_escape(text)
+        page_id = len(objs) + 1
+        kids.append("%d 0 R" % page_id)
+        objs.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            "/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objs.append("<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+    objs[1] = "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets: List[int] = []
+    for i, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += ("%d 0 obj\n%s\nendobj\n" % (i, body)).encode("latin-1", errors="replace")
+    xref = len(out)
+    out += ("xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)).encode("ascii")
+    for off in offsets:
+        out += ("%010d 00000 n \n" % off).encode("ascii")
+    out += ("trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)).encode("ascii")
+    path.write_bytes(bytes(out))
+
+
+# One renderer per surface form DATE_PATTERNS accepts (numeric forms assume --date-order mdy).
+SYNTHETIC_DATE_FORMATS: Dict[str, Callable[[dt.date], str]] = {
+    "iso": lambda d: d.isoformat(),
+    "iso_slash": lambda d: d.strftime("%Y/%m/%d"),
+    "month_day_year": lambda d: f"{calendar.month_name[d.month]} {d.day}, {d.year}",
+    "mon_ordinal_year": lambda d: f"{calendar.month_abbr[d.month]}. {d.day}{_ordinal(d.day)} {d.year}",
+    "mon_day_short_year": lambda d: f"{calendar.month_abbr[d.month]} {d.day}, '{d.year % 100:02d}",
+    "day_month_year": lambda d: f"{d.day} {calendar.month_name[d.month]} {d.year}",
+    "day_ordinal_mon": lambda d: f"{d.day}{_ordinal(d.day)} {calendar.month_abbr[d.month]}, {d.year}",
+    "numeric": lambda d: f"{d.month}/{d.day}/{d.year}",
+    "numeric_short": lambda d: f"{d.month}/{d.day}/{d.year % 100:02d}",
+    "numeric_dash_short": lambda d: f"{d.month:02d}-{d.day:02d}-{d.year % 100:02d}",
+}
+
+CORPUS_FILLER = (
+    "the and of to in report officer statement hearing called stated that was on at with after before "
+    "incident vehicle scene notes follow up request record office received copy attached page reviewed"
+).split()
+CORPUS_NAME_WORDS = [
+    "police_report", "witness_statement", "medical_bill", "court_filing", "foia_request",
+    "call_log", "timeline", "notes", "summons", "therapy_notes",
+]
+CORPUS_TEXT_EXTS = ("txt", "csv", "json", "md")
+CORPUS_MEDIA: Dict[str, bytes] = {
+    # Just enough of each container's signature that the files look like what their extension says.
+    "jpg": b"\xff\xd8\xff\xe0\x00\x10JFIF\x00",
+    "png": b"\x89PNG\r\n\x1a\n",
+    "mp4": b"\x00\x00\x00\x18ftypmp42",
+    "mov": b"\x00\x00\x00\x14ftypqt  ",
+    "wav": b"RIFF\x00\x00\x00\x00WAVEfmt ",
+}
+
+
+def _ordinal(n: int) -> str:
+    return "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+
+
+def corpus_lines(rng: random.Random, aliases: Dict[str, List[str]], n: int) -> Tuple[List[str], Set[str]]:
+    """
+    Pool of synthetic sentences that corpus files are assembled from: filler words, entity
+    aliases and dates in every SYNTHETIC_DATE_FORMATS form. Returns (lines, planted ISO dates).
+
+    Every rendered date is checked against ed.find_dates, so a scanner change that stops
+    recognizing one of the forms fails here instead of quietly skewing the benchmark.
+    """
+    alias_list = [a for alist in aliases.values() for a in alist]
+    formats = list(SYNTHETIC_DATE_FORMATS.items())
+    lo = dt.date(2019, 1, 1).toordinal()
+    hi = dt.date(2026, 12, 31).toordinal()
+    lines: List[str] = []
+    planted: Set[str] = set()
+    for i in range(n):
+        words = rng.choices(CORPUS_FILLER, k=rng.randint(6, 14))
+        if rng.random() < 0.6:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(alias_list))
+        if rng.random() < 0.4:
+            d = dt.date.fromordinal(rng.randint(lo, hi))
+            name, render = formats[i % len(formats)]
+            text = render(d)
+            if ed.find_dates(text) != [d.isoformat()]:
+                raise AssertionError(f"date format {name!r} no longer scans: {text!r}")
+            planted.add(d.isoformat())
+            words.insert(rng.randrange(len(words) + 1), text)
+        lines.append(" ".join(words))
+    return lines, planted
+
+
+def write_corpus(
+    out: Path,
+    files: int,
+    seed: int,
+    text_kb: int = 8,
+    paragraphs: int = 40,
+    pdf_pages: int = 4,
+    media_kb: int = 64,
+    dup_pct: float = 5.0,
+) -> Dict[str, Any]:
+    """
+    Build a synthetic evidence folder of `files` files under out/evidence and describe it in out/CORPUS.json.
+
+    Mix: about 50% text (txt/csv/json/md), 20% DOCX, 15% PDF, 15% dummy media, spread over
+    nested box/folder directories. dup_pct percent of the files are byte copies of distinct
+    earlier files under copies/, so a scan should report exactly `duplicate_groups` sha256
+    groups. The same (files, seed, sizes) always produce the same bytes.
+    """
+    rng = random.Random(seed)
+    aliases = ed.build_entity_aliases([])
+    lines, planted = corpus_lines(rng, aliases, 4000)
+    root = out / "evidence"
+    root.mkdir(parents=True, exist_ok=True)
+    originals: List[Path] = []
+    counts: Dict[str, int] = {}
+    total = dups = 0
+    for i in range(files):
+        if originals and rng.random() * 100 < dup_pct:
+            src = originals.pop()  # each original is copied at most once: one group per copy
+            dst = root / "copies" / f"{i % 50:02d}" / f"copy_{i:07d}_{src.name}"
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(src, dst)
+            dups += 1
+            total += dst.stat().st_size
+            continue
+        roll = rng.random()
+        ext = (
+            rng.choice(CORPUS_TEXT_EXTS) if roll < 0.5
+            else "docx" if roll < 0.7
+            else "pdf" if roll < 0.85
+            else rng.choice(sorted(CORPUS_MEDIA))
+        )
+        stem = f"{rng.choice(CORPUS_NAME_WORDS)}_{i:07d}"
+        if i % 3 == 0:
+            d = dt.date(2019, 1, 1) + dt.timedelta(days=rng.randrange(8 * 365))
+            stem += "_" + d.isoformat()
+            planted.add(d.isoformat())
+        path = root / f"box{i % 97:02d}" / f"folder{i % 7}" / f"{stem}.{ext}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if ext in CORPUS_TEXT_EXTS:
+            body: List[str] = []
+            budget = rng.randint(text_kb * 512, text_kb * 1536)
+            while budget > 0:
+                line = rng.choice(lines)
+                body.append(line)
+                budget -= len(line) + 1
+            if ext == "csv":
+                text = "row,note\n" + "".join(f"{n},{line}\n" for n, line in enumerate(body))
+            elif ext == "json":
+                text = json.dumps({"entries": [{"row": n, "note": line} for n, line in enumerate(body)]}, indent=1)
+            elif ext == "md":
+                text = f"# {stem}\n\n" + "\n\n".join(body) + "\n"
+            else:
+                text = "\n".join(body) + "\n"
+            path.write_text(text, encoding="utf-8")
+        elif ext == "docx":
+            write_docx(path, [" ".join(rng.choices(lines, k=2)) for _ in range(rng.randint(paragraphs // 2, paragraphs * 2))])
+        elif ext == "pdf":
+            write_synthetic_pdf(path, [" ".join(rng.choices(lines, k=4)) for _ in range(rng.randint(1, pdf_pages * 2))])
+        else:
+            path.write_bytes(CORPUS_MEDIA[ext] + rng.randbytes(rng.randint(media_kb * 512, media_kb * 1536)))
+        counts[ext] = counts.get(ext, 0) + 1
+        total += path.stat().st_size
+        originals.append(path)
+    info = {
+        "files": files,
+        "seed": seed,
+        "bytes": total,
+        "by_ext": dict(sorted(counts.items())),
+        "duplicate_groups": dups,
+        "planted_dates": len(planted),
+        "date_formats": list(SYNTHETIC_DATE_FORMATS),
+        "params": {"text_kb": text_kb, "paragraphs": paragraphs, "pdf_pages": pdf_pages, "media_kb": media_kb, "dup_pct": dup_pct},
+    }
+    (out / "CORPUS.json").write_text(json.dumps(info, indent=2), encoding="utf-8")
+    return info
+
+
+def bench_docx(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.docx"
+        write_synthetic_docx(path, rng, args.paragraphs)
+        with zipfile.ZipFile(path) as zf:
+            xml_bytes = zf.getinfo("word/document.xml").file_size
+        result: Dict[str, Any] = {"benchmark": "docx", "document_xml_bytes": xml_bytes, "max_chars": args.max_chars}
+        for label, fn in (
+            ("legacy_regex", lambda: legacy_extract_docx_text(path, args.max_chars)),
+            ("streaming", lambda: ed.extract_docx_text(path, args.max_chars)),
+        ):
+            seconds, peak = measure(fn, args.repeat)
+            result[f"{label}_s"] = round(seconds, 4)
+            result[f"{label}_peak_bytes"] = peak
+            result[f"{label}_chars"] = len(fn() or "")
+        result["speedup"] = round(result["legacy_regex_s"] / result["streaming_s"], 2) if result["streaming_s"] else None
+        return result
+
+
+def bench_io(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    aliases = ed.build_entity_aliases([])
+    cfg = ed.ScanConfig(matcher=ed.AliasMatcher(aliases))
+    with tempfile.TemporaryDirectory() as tmp:
+        files: List[Path] = []
+        for i in range(args.files):
+            kind = i % 3
+            if kind == 0:
+                p = Path(tmp) / f"exhibit_{i}.docx"
+                write_synthetic_docx(p, rng, args.paragraphs)
+            elif kind == 1:
+                p = Path(tmp) / f"packet_{i}.pdf"
+                write_synthetic_pdf(p, [synthetic_text(rng, aliases, 400) for _ in range(args.pdf_pages)])
+            else:
+                p = Path(tmp) / f"calls_{i}.csv"
+                p.write_text(synthetic_text(rng, aliases, args.text_kb * 1024), encoding="utf-8")
+            files.append(p)
+        total_bytes = sum(p.stat().st_size for p in files)
+        stats = [(p, p.stat()) for p in files]
+
+        def two_pass() -> None:
+            for p, st in stats:
+                ed.sha256_file(p)
+                ed.analyze_content(p, ed.file_ext(p), cfg)
+
+        def single_pass() -> None:
+            for p, st in stats:
+                ed.hash_and_analyze(p, st, cfg, do_hash=True)
+
+        def hash_only_legacy() -> None:
+            for p, _ in stats:
+                ed.sha256_file(p)
+
+        def hash_only_buffer() -> None:
+            for p, st in stats:
+                with ed.FileBuffer(p, st.st_size) as fb:
+                    fb.sha256()
+
+        result: Dict[str, Any] = {"benchmark": "io", "files": len(files), "total_mb": round(total_bytes / 1e6, 2)}
+        for label, fn in (
+            ("two_pass", two_pass),
+            ("single_pass", single_pass),
+            ("hash_chunked_read", hash_only_legacy),
+            ("hash_file_buffer", hash_only_buffer),
+        ):
+            seconds = best_of(fn, args.repeat)
+            result[f"{label}_mb_per_s"] = round(total_bytes / 1e6 / seconds, 1) if seconds else None
+        result["note"] = "Files are page-cache warm after generation; gains are larger when the second read hits disk/network."
+        return result
+
+
+def bench_text(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    aliases = ed.build_entity_aliases([])
+    cfg = ed.ScanConfig(matcher=ed.AliasMatcher(aliases))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "phone_records.csv"
+        block = synthetic_text(rng, aliases, 1024 * 1024) + "\n"
+        with path.open("w", encoding="utf-8") as fh:
+            for _ in range(args.size_mb):
+                fh.write(block)
+        st = path.stat()
+
+        def legacy() -> Tuple[str, List[str], Dict[str, int]]:
+            # Pre-chunking text path: the whole file as one str, then full-text scans.
+            text = path.read_text(encoding="utf-8", errors="ignore")
+            return ed.sha256_file(path), ed.find_dates(text), cfg.matcher.count(text)
+
+        def chunked() -> Tuple[str, List[str], Dict[str, int]]:
+            digest, res, _ = ed.hash_and_analyze(path, st, cfg, do_hash=True)
+            return digest, res.dates_from_content, res.entity_hits
+
+        result: Dict[str, Any] = {"benchmark": "text", "file_mb": round(st.st_size / 1e6, 1), "chunk_bytes": ed.TEXT_CHUNK_BYTES}
+        for label, fn in (("legacy_read_text", legacy), ("chunked_stream", chunked)):
+            seconds, peak = measure(fn, args.repeat)
+            result[f"{label}_s"] = round(seconds, 3)
+            result[f"{label}_peak_mb"] = round(peak / 1e6, 1)
+        result["same_result"] = legacy() == chunked()
+        return result
+
+
+def _bmff_box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def write_synthetic_video(path: Path, mdat_bytes: int, when: dt.datetime) -> None:
+    # ftyp, a sparse 64-bit mdat, then moov at the end (camera-style, the worst case for a
+    # header reader): mvhd creation time plus a ©day tag.
+    secs = int((when - dt.datetime(1904, 1, 1, tzinfo=dt.timezone.utc)).total_seconds())
+    mvhd = _bmff_box(b"mvhd", bytes(4) + struct.pack(">II", secs, secs) + bytes(88))
+    day = _bmff_box(b"\xa9day", _bmff_box(b"data", struct.pack(">II", 1, 0) + when.strftime("%Y-%m-%dT%H:%M:%SZ").encode()))
+    meta = _bmff_box(b"meta", bytes(4) + _bmff_box(b"hdlr", bytes(25)) + _bmff_box(b"ilst", day))
+    moov = _bmff_box(b"moov", mvhd + _bmff_box(b"trak", bytes(4096)) + _bmff_box(b"udta", meta))
+    with path.open("wb") as fh:
+        fh.write(_bmff_box(b"ftyp", b"isom\0\0\0\0isommp41"))
+        fh.write(struct.pack(">I4sQ", 1, b"mdat", 16 + mdat_bytes))
+        fh.truncate(fh.tell() + mdat_bytes)
+        fh.seek(0, io.SEEK_END)
+        fh.write(moov)
+
+
+def legacy_video_date(path: Path) -> List[str]:
+    # What a naive parser does: read the whole file, then look for the mvhd box.
+    data = path.read_bytes()
+    i = data.rfind(b"mvhd")
+    if i < 0:
+        return []
+    secs = struct.unpack(">I", data[i + 8 : i + 12])[0]
+    return [(dt.datetime(1904, 1, 1) + dt.timedelta(seconds=secs)).date().isoformat()]
+
+
+def bench_media(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths: List[Path] = []
+        for i in range(args.files):
+            when = dt.datetime(2025, 8, 1, tzinfo=dt.timezone.utc) + dt.timedelta(seconds=rng.randint(0, 150 * 86400))
+            path = Path(tmp) / f"IMG_{i:04d}.MOV"
+            write_synthetic_video(path, args.size_mb * 1024 * 1024, when)
+            paths.append(path)
+
+        def legacy() -> List[List[str]]:
+            return [legacy_video_date(p) for p in paths]
+
+        def header_only() -> List[List[str]]:
+            out: List[List[str]] = []
+            for p in paths:
+                with p.open("rb") as fh:
+                    out.append(ed.media_dates(fh, "mov")[:1])
+            return out
+
+        ed.begin_file_stages(True)
+        header_only()
+        stages = ed.end_file_stages() or {}
+        result: Dict[str, Any] = {
+            "benchmark": "media",
+            "files": args.files,
+            "file_mb": round(paths[0].stat().st_size / 1e6, 1),
+            "header_bytes_read": int(stages.get("media", (0.0, 0.0, 0))[2]),
+        }
+        for label, fn in (("legacy_full_read", legacy), ("header_only", header_only)):
+            seconds, peak = measure(fn, args.repeat)
+            result[f"{label}_s"] = round(seconds, 4)
+            result[f"{label}_peak_mb"] = round(peak / 1e6, 1)
+        result["same_result"] = legacy() == header_only()
+        return result
+
+
+def synthetic_records(rng: random.Random, n: int) -> Iterator[ed.IndexedFile]:
+    entities = ed.EntityNames()
+    for i in range(n):
+        name = f"exhibit_{i:07d}_OCSO_2025-08-{1 + i % 28:02d}.pdf"
+        yield ed.IndexedFile(
+            source_root="/evidence",
+            full_path=f"/evidence/box{i % 97}/{name}",
+            rel_path=f"box{i % 97}/{name}",
+            name=name,
+            ext="pdf",
+            size=rng.randint(1_000, 50_000_000),
+            mtime_iso="2025-08-01T12:00:00",
+            sha256="%064x" % rng.getrandbits(256),
+            category="police_report",
+            content_extracted=True,
+            dates_from_filename=[f"2025-08-{1 + i % 28:02d}"],
+            dates_from_content=["2025-08-01", "2025-12-30"],
+            entity_hits={"OCSO": 3, "Jeffery Snyder": 1},
+            page_refs={"entities": {"OCSO": [1, 2]}, "dates": {"2025-08-01": [1]}},
+            entities=entities,
+        )
+
+
+@dataclass
+class LegacyIndexedFile:
+    # IndexedFile as it was before the compact layout: a plain dataclass, serialized with asdict().
+    source_root: str
+    full_path: str
+    rel_path: str
+    name: str
+    ext: str
+    size: int
+    mtime_iso: str
+    sha256: str
+    category: str
+    content_extracted: bool
+    dates_from_filename: List[str]
+    dates_from_content: List[str]
+    entity_hits: Dict[str, int]
+    page_refs: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+
+
+def realistic_record_args(rng: random.Random, n: int) -> Iterator[Dict[str, Any]]:
+    # Field values as a scan produces them: a fresh string object per record for the root,
+    # extension, dates and entity names (str(root), file_ext(), JSON-loaded cache/store
+    # entries), categories from infer_category()'s literals, PDFs with page refs.
+    canon = sorted(ed.build_entity_aliases([]))
+    for i in range(n):
+        root = "".join(["/evidence/", "matter-2291"])
+        ext = rng.choice(["pdf", "docx", "txt", "jpg", "mov", "eml"])
+        rel = f"box{i % 97}/custodian_{i % 13}/exhibit_{i:07d}_scan.{ext}"
+        dates = [f"2025-{1 + rng.randint(0, 11):02d}-{1 + rng.randint(0, 27):02d}" for _ in range(rng.randint(0, 3))]
+        hits = {"".join([c]): rng.randint(1, 9) for c in rng.sample(canon, rng.randint(0, 3))}
+        refs: Dict[str, Any] = {}
+        if ext == "pdf" and (dates or hits):
+            refs = {"dates": {d: [rng.randint(1, 40)] for d in dates}, "entities": {e: [rng.randint(1, 40)] for e in hits}}
+        yield {
+            "source_root": root,
+            "full_path": f"{root}/{rel}",
+            "rel_path": rel,
+            "name": rel.rsplit("/", 1)[-1],
+            "ext": "".join([ext]),
+            "size": rng.randint(1_000, 50_000_000),
+            "mtime_iso": f"2025-08-{1 + i % 28:02d}T12:{i % 60:02d}:{(i * 7) % 60:02d}.{i % 1000000:06d}",
+            "sha256": "%064x" % rng.getrandbits(256),
+            "category": rng.choice(["Medical", "Filings & Notices", "Media", "Other"]),
+            "content_extracted": bool(hits) and ext in ("pdf", "docx", "txt"),
+            "dates_from_filename": dates[:1],
+            "dates_from_content": dates[1:],
+            "entity_hits": hits,
+            "page_refs": refs,
+        }
+
+
+def bench_records(args: argparse.Namespace) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"benchmark": "records", "records": args.records}
+    kept: Dict[str, List[Any]] = {}
+    compact = functools.partial(ed.IndexedFile, entities=ed.EntityNames())
+    for label, cls in (("legacy_dataclass", LegacyIndexedFile), ("compact", compact)):
+        gc.collect()
+        tracemalloc.start()
+        recs = [cls(**kw) for kw in realistic_record_args(random.Random(args.seed), args.records)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        kept[label] = recs
+        result[f"{label}_bytes_per_file"] = round(current / args.records)
+    result["bytes_saved_pct"] = round(100 * (1 - result["compact_bytes_per_file"] / result["legacy_dataclass_bytes_per_file"]), 1)
+
+    legacy, compact = kept["legacy_dataclass"], kept["compact"]
+    result["asdict_s"] = round(best_of(lambda: [asdict(r) for r in legacy], args.repeat), 3)
+    result["row_s"] = round(best_of(lambda: [r.row() for r in compact], args.repeat), 3)
+    result["same_rows"] = all(asdict(a) == b.row() for a, b in zip(legacy, compact))
+    return result
+
+
+def bench_output(args: argparse.Namespace) -> Dict[str, Any]:
+    rng_seed = args.seed
+    fieldnames = list(ed.INDEXED_FIELDS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+
+        def legacy() -> None:
+            # The pre-streaming main(): keep every record, then dump each file in one string.
+            rows = [r.row() for r in synthetic_records(random.Random(rng_seed), args.records)]
+            ed.write_json(out / "legacy" / "indexed_files.json", rows)
+            (out / "legacy").mkdir(exist_ok=True)
+            with (out / "legacy" / "inventory.csv").open("w", newline="", encoding="utf-8") as f:
+                w = csv.DictWriter(f, fieldnames=fieldnames)
+                w.writeheader()
+                for r in rows:
+                    w.writerow(r)
+
+        def streaming(fmt: str, compress: bool) -> Callable[[], None]:
+            def run() -> None:
+                outputs = ed.OutputSet(out / f"{fmt}{'_gz' if compress else ''}", fmt=fmt, compress=compress)
+                records = outputs.records("indexed_files")
+                table = outputs.table("inventory.csv", fieldnames)
+                for rec in synthetic_records(random.Random(rng_seed), args.records):
+                    row = rec.row()
+                    records.append(row)
+                    table.writerow(row)
+                outputs.close()
+
+            return run
+
+        result: Dict[str, Any] = {"benchmark": "output", "records": args.records}
+        for label, fn in (
+            ("legacy_in_memory", legacy),
+            ("stream_json", streaming("json", False)),
+            ("stream_jsonl", streaming("jsonl", False)),
+            ("stream_jsonl_gzip", streaming("jsonl", True)),
+        ):
+            seconds, peak = measure(fn, args.repeat)
+            result[f"{label}_s"] = round(seconds, 3)
+            result[f"{label}_peak_mb"] = round(peak / 1e6, 2)
+        same = (out / "legacy" / "indexed_files.json").read_bytes() == (out / "json" / "indexed_files.json").read_bytes()
+        result["json_byte_identical"] = same
+        return result
+
+
+def bench_query(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        t0 = time.perf_counter()
+        db = ed.EvidenceIndexDb(out / "evidence_index.sqlite")
+        outputs = ed.OutputSet(out)
+        records = outputs.records("indexed_files")
+        for idx, rec in enumerate(synthetic_records(random.Random(args.seed), args.records)):
+            if idx % 3 == 0:
+                rec.entity_hits = {"Jeffery Snyder": 2}
+            db.add(idx, rec)
+            records.append(rec.row())
+        # The query below asks for the alias "snyder", as a user would.
+        db.finish({}, {}, ed.AliasMatcher(ed.build_entity_aliases([])).canonicals)
+        outputs.close()
+        build_s = time.perf_counter() - t0
+
+        def legacy() -> List[str]:
+            # What answering the question took before: load the JSON, filter in Python.
+            rows = json.loads((out / "indexed_files.json").read_text(encoding="utf-8"))
+            return [
+                r["full_path"]
+                for r in rows
+                if "Jeffery Snyder" in r["entity_hits"]
+                and any("2025-08-10" <= d <= "2025-08-12" for d in r["dates_from_filename"] + r["dates_from_content"])
+            ]
+
+        def indexed() -> List[str]:
+            rows = eq.query_index(
+                out / "evidence_index.sqlite", entity="snyder", date_from="2025-08-10", date_to="2025-08-12", limit=args.records
+            )
+            return [r["path"] for r in rows]
+
+        legacy_s = best_of(legacy, args.repeat)
+        indexed_s = best_of(indexed, args.repeat)
+        return {
+            "benchmark": "query",
+            "records": args.records,
+            "index_build_s": round(build_s, 3),
+            "matches": len(indexed()),
+            "same_result": legacy() == indexed(),
+            "legacy_json_filter_ms": round(legacy_s * 1000, 1),
+            "sqlite_query_ms": round(indexed_s * 1000, 1),
+            "speedup": round(legacy_s / indexed_s, 1) if indexed_s else None,
+        }
+
+
+def bench_timeline(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        spill = ed.TimelineSpill(out / ".timeline.spill.sqlite")
+        keys: List[ed.DedupeKey] = []
+        legacy_rows: List[Tuple[str, str]] = []
+        dates: List[str] = []
+        for idx in range(args.records):
+            # Every tenth file is a copy of the previous one, as with re-exported exhibits.
+            copy = idx % 10 == 9
+            sha = keys[-1][2] if copy else "%064x" % rng.getrandbits(256)
+            path = f"/evidence/box{idx % 97}/exhibit_{idx:07d}.pdf"
+            keys.append((path, 1000, sha))
+            if not copy:
+                dates = [
+                    "20%02d-%02d-%02d" % (rng.randint(15, 26), rng.randint(1, 12), rng.randint(1, 28))
+                    for _ in range(args.dates_per_file)
+                ]
+            for d in dates:
+                spill.add(d, "content", idx, [])
+                legacy_rows.append((d, path))
+
+        t0 = time.perf_counter()
+        outputs = ed.OutputSet(out)
+        w = outputs.records("timeline")
+        for row in spill.rows(keys):
+            w.append(row)
+        outputs.close()
+        spill.close()
+        build_s = time.perf_counter() - t0
+
+        timeline = etl.Timeline.load(out / "timeline.json")
+
+        def legacy() -> int:
+            # Unsorted rows: every range question is a full scan.
+            return sum(1 for d, _ in legacy_rows if "2025-08-01" <= d <= "2025-08-31")
+
+        def indexed() -> int:
+            return len(timeline.between("2025-08", "2025-08"))
+
+        legacy_s = best_of(legacy, args.repeat)
+        indexed_s = best_of(indexed, args.repeat)
+        return {
+            "benchmark": "timeline",
+            "raw_hits": len(legacy_rows),
+            "merged_rows": len(timeline.rows),
+            "sort_merge_write_s": round(build_s, 3),
+            "range_rows": indexed(),
+            "legacy_scan_ms": round(legacy_s * 1000, 2),
+            "bisect_range_ms": round(indexed_s * 1000, 3),
+        }
+
+
+def bench_terms(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    aliases = ed.build_entity_aliases([])
+    key = bytes(rng.getrandbits(8) for _ in range(ed.TERM_KEY_BYTES))
+    cfg = ed.ScanConfig(matcher=ed.AliasMatcher(aliases), term_index=True, term_key=key)
+    phrase = "cody mckenzie"
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "evidence"
+        root.mkdir()
+        for i in range(args.files):
+            (root / f"notes_{i:05d}.txt").write_text(synthetic_text(rng, aliases, args.text_kb * 1024), encoding="utf-8")
+        entries = list(ed.scan_roots([root]))
+        text_bytes = sum(st.st_size for _, _, st in entries)
+
+        t0 = time.perf_counter()
+        writer = ed.TermIndexWriter(Path(tmp) / "evidence_terms.idx", ed.term_key_check(key))
+        for _ in ed.index_files(entries, cfg, term_index=writer):
+            pass
+        stats = writer.finish([str(f) for _, f, _ in entries])
+        build_s = time.perf_counter() - t0
+
+        def rescan() -> List[str]:
+            # Without an index every new question means reading and tokenizing the evidence again.
+            out: List[str] = []
+            want = phrase.split()
+            for _, f, _ in entries:
+                toks = ed.TERM_TOKEN.findall(f.read_text(encoding="utf-8", errors="ignore").lower())
+                if any(toks[i : i + len(want)] == want for i in range(len(toks))):
+                    out.append(str(f))
+            return out
+
+        def indexed() -> List[str]:
+            index = et.TermIndex(Path(stats["path"]), key)
+            try:
+                return [index.paths[doc] for doc, _ in index.search(phrase)]
+            finally:
+                index.close()
+
+        rescan_s = best_of(rescan, args.repeat)
+        indexed_s = best_of(indexed, args.repeat)
+        return {
+            "benchmark": "terms",
+            "files": len(entries),
+            "text_mb": round(text_bytes / 1e6, 2),
+            "index_mb": round(stats["bytes"] / 1e6, 2),
+            "terms": stats["terms"],
+            "index_build_s": round(build_s, 3),
+            "matches": len(indexed()),
+            "same_result": rescan() == indexed(),
+            "rescan_phrase_ms": round(rescan_s * 1000, 1),
+            "indexed_phrase_ms": round(indexed_s * 1000, 1),
+            "speedup": round(rescan_s / indexed_s, 1) if indexed_s else None,
+        }
+
+
+def bench_watch(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    aliases = ed.build_entity_aliases([])
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "evidence"
+        root.mkdir()
+        for i in range(args.files):
+            (root / f"notes_{i:05d}.txt").write_text(synthetic_text(rng, aliases, args.text_kb * 1024), encoding="utf-8")
+
+        def run(out: str, *extra: str) -> float:
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                ed.main(["--root", str(root), "--out-dir", str(Path(tmp) / out), *extra])
+            return time.perf_counter() - t0
+
+        full_s = run("full")
+        run("watch", "--incremental")
+        # What a --watch rescan does after one exhibit is dropped in.
+        (root / "notes_dropped.txt").write_text(synthetic_text(rng, aliases, args.text_kb * 1024), encoding="utf-8")
+        rescan_s = run("watch", "--incremental")
+        return {
+            "benchmark": "watch",
+            "files": args.files + 1,
+            "full_rescan_s": round(full_s, 3),
+            "watch_rescan_after_drop_s": round(rescan_s, 3),
+            "speedup": round(full_s / rescan_s, 1) if rescan_s else None,
+        }
+
+
+def bench_profile(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    aliases = ed.build_entity_aliases([])
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "evidence"
+        root.mkdir()
+        for i in range(args.files):
+            if i % 4 == 0:
+                write_synthetic_docx(root / f"exhibit_{i:05d}.docx", rng, 200)
+            else:
+                (root / f"notes_{i:05d}.txt").write_text(synthetic_text(rng, aliases, args.text_kb * 1024), encoding="utf-8")
+
+        def run(*extra: str) -> Callable[[], None]:
+            def go() -> None:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ed.main(["--root", str(root), "--out-dir", str(Path(tmp) / "out"), "--no-content-store", *extra])
+
+            return go
+
+        plain_s = best_of(run(), args.repeat)
+        profiled_s = best_of(run("--profile"), args.repeat)
+        perf = json.loads((Path(tmp) / "out" / "PERF.json").read_text(encoding="utf-8"))
+        return {
+            "benchmark": "profile",
+            "files": args.files,
+            "plain_s": round(plain_s, 3),
+            "profiled_s": round(profiled_s, 3),
+            "overhead_pct": round((profiled_s / plain_s - 1) * 100, 1) if plain_s else None,
+            "top_file_stages": sorted(perf["file_stages"], key=lambda k: -perf["file_stages"][k]["wall_s"])[:3],
+        }
+
+
+class _SlowEntry:
+    # os.DirEntry stand-in whose stat() pays a simulated network round-trip.
+    def __init__(self, entry: os.DirEntry, delay: float) -> None:
+        self._entry = entry
+        self._delay = delay
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_symlink(self) -> bool:
+        return self._entry.is_symlink()
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        time.sleep(self._delay)
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class _SlowOs:
+    # Stands in for the deep dive's `os` module: scandir() and stat() each sleep `delay`.
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(os, name)
+
+    def stat(self, path: Any, *a: Any, **kw: Any) -> os.stat_result:
+        time.sleep(self.delay)
+        return os.stat(path, *a, **kw)
+
+    @contextlib.contextmanager
+    def scandir(self, path: Any) -> Iterator[Iterator[_SlowEntry]]:
+        time.sleep(self.delay)
+        with os.scandir(path) as it:
+            yield (_SlowEntry(e, self.delay) for e in it)
+
+
+@contextlib.contextmanager
+def simulated_latency(delay: float) -> Iterator[None]:
+    """
+    Make every directory read, stat() and open() done by evidence_deepdive sleep `delay`
+    seconds first (GIL released, like a blocking network call), as on an SMB share or a
+    cloud-synced folder whose files are fetched on demand. The deep dive's os and Path are
+    swapped for the block only; mock.patch.multiple puts both back however it exits.
+    """
+
+    class SlowPath(type(Path())):  # type: ignore[misc]
+        def open(self, *a: Any, **kw: Any) -> Any:
+            time.sleep(delay)
+            return super().open(*a, **kw)
+
+        def stat(self, *a: Any, **kw: Any) -> os.stat_result:
+            time.sleep(delay)
+            return super().stat(*a, **kw)
+
+    with mock.patch.multiple(ed, os=_SlowOs(delay), Path=SlowPath):
+        yield
+
+
+def bench_latency(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        info = write_corpus(Path(tmp), args.files, args.seed, text_kb=4, paragraphs=10, pdf_pages=2, media_kb=16)
+        root = Path(tmp) / "evidence"
+        cfg = ed.ScanConfig(matcher=ed.AliasMatcher(ed.build_entity_aliases([])))
+
+        def run(concurrency: int) -> Tuple[float, List[Tuple[str, str]]]:
+            with simulated_latency(args.latency_ms / 1000):
+                t0 = time.perf_counter()
+                if concurrency:
+                    entries = ed.scan_roots_async([root], concurrency=concurrency)
+                else:
+                    entries = list(ed.scan_roots([root]))
+                recs = [(r.full_path, r.sha256) for r in ed.index_files(entries, cfg, io_concurrency=concurrency)]
+                return time.perf_counter() - t0, recs
+
+        serial_s, serial_recs = run(0)
+        result: Dict[str, Any] = {
+            "benchmark": "latency",
+            "files": args.files,
+            "corpus_mb": round(info["bytes"] / 1e6, 1),
+            "latency_ms": args.latency_ms,
+            "serial_s": round(serial_s, 2),
+        }
+        for c in [int(x) for x in args.concurrency.split(",")]:
+            seconds, recs = run(c)
+            result[f"io_concurrency_{c}_s"] = round(seconds, 2)
+            result[f"io_concurrency_{c}_same"] = recs == serial_recs
+        return result
+
+
+def bench_corpus(args: argparse.Namespace) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    info = write_corpus(
+        Path(args.out), args.files, args.seed, args.text_kb, args.paragraphs, args.pdf_pages, args.media_kb, args.dup_pct
+    )
+    return {"benchmark": "corpus", "out": args.out, "generate_s": round(time.perf_counter() - t0, 2), **info}
+
+
+def run_deepdive_child(root: Path, out: Path, extra: List[str]) -> Tuple[float, Optional[float]]:
+    # (wall seconds, peak RSS in MB of the largest process in the scan's tree, or None off Unix)
+    cmd = [sys.executable, str(Path(ed.__file__).resolve()), "--root", str(root), "--out-dir", str(out), *extra]
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    rss_mb: Optional[float] = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is KB on Linux, bytes on macOS.
+        rss_mb = usage.ru_maxrss / (1e6 if sys.platform == "darwin" else 1e3)
+    else:
+        proc.wait()
+    seconds = time.perf_counter() - t0
+    if proc.returncode:
+        raise RuntimeError(f"deep dive exited with {proc.returncode}: {' '.join(cmd)}")
+    return seconds, rss_mb
+
+
+def bench_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    extra = shlex.split(args.deepdive_args)
+    params = {"text_kb": args.text_kb, "paragraphs": 40, "pdf_pages": 4, "media_kb": 64, "dup_pct": 5.0}
+    baseline: Dict[int, Dict[str, Any]] = {}
+    if args.baseline:
+        prev = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        baseline = {r["files"]: r for r in prev.get("results", [])}
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in [int(x) for x in args.sizes.split(",") if x.strip()]:
+            # --corpus-dir keeps generated corpora between invocations; same size+seed means same bytes.
+            base = Path(args.corpus_dir or tmp) / f"corpus_{n}_seed{args.seed}"
+            info_path = base / "CORPUS.json"
+            info = json.loads(info_path.read_text(encoding="utf-8")) if info_path.exists() else None
+            generate_s = 0.0
+            if not info or info.get("params") != params:
+                shutil.rmtree(base, ignore_errors=True)
+                t0 = time.perf_counter()
+                info = write_corpus(base, n, args.seed, **params)
+                generate_s = time.perf_counter() - t0
+
+            best_s = float("inf")
+            peak: Optional[float] = None
+            summary: Dict[str, Any] = {}
+            for run in range(args.runs):
+                out = Path(tmp) / f"out_{n}_{run}"
+                seconds, rss_mb = run_deepdive_child(base / "evidence", out, extra)
+                best_s = min(best_s, seconds)
+                if rss_mb is not None:
+                    peak = max(peak or 0.0, rss_mb)
+                summary = json.loads((out / "SUMMARY.json").read_text(encoding="utf-8"))
+                shutil.rmtree(out, ignore_errors=True)
+            if args.corpus_dir is None:
+                shutil.rmtree(base, ignore_errors=True)
+
+            row: Dict[str, Any] = {
+                "files": n,
+                "corpus_mb": round(info["bytes"] / 1e6, 1),
+                "generate_s": round(generate_s, 2),
+                "scan_s": round(best_s, 3),
+                "files_per_s": round(n / best_s, 1),
+                "mb_per_s": round(info["bytes"] / 1e6 / best_s, 2),
+                "peak_rss_mb": round(peak, 1) if peak is not None else None,
+                # Sanity: the scan saw every file and exactly the planted duplicate groups.
+                "indexed_ok": summary.get("indexed_count") == n,
+                "duplicates_ok": summary.get("duplicate_hash_groups") == info["duplicate_groups"],
+            }
+            prev_row = baseline.get(n)
+            if prev_row and prev_row.get("files_per_s"):
+                row["files_per_s_vs_baseline"] = round(row["files_per_s"] / prev_row["files_per_s"], 3)
+            results.append(row)
+    return {
+        "benchmark": "suite",
+        "seed": args.seed,
+        "deepdive_args": extra,
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+
+
+def bench_shard(args: argparse.Namespace) -> Dict[str, Any]:
+    # Shards run one after another here; on N nodes the wall time is the slowest shard plus the merge.
+    extra = shlex.split(args.deepdive_args)
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "corpus"
+        info = write_corpus(base, args.files, args.seed, media_kb=256, dup_pct=args.dup_pct)
+        root = base / "evidence"
+        single_s, _ = run_deepdive_child(root, Path(tmp) / "single", extra)
+        shard_s: List[float] = []
+        for i in range(1, args.shards + 1):
+            seconds, _ = run_deepdive_child(root, Path(tmp) / f"shard_{i}", [*extra, "--shard", f"{i}/{args.shards}"])
+            shard_s.append(seconds)
+        cmd = [sys.executable, str(Path(ed.__file__).resolve()), "merge", "--out-dir", str(Path(tmp) / "merged")]
+        cmd += [str(Path(tmp) / f"shard_{i}") for i in range(1, args.shards + 1)]
+        t0 = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+        merge_s = time.perf_counter() - t0
+
+        single, merged = Path(tmp) / "single", Path(tmp) / "merged"
+        # Everything but the run summaries and the hidden cache/content-store sidecars.
+        compared = sorted(p.name for p in single.iterdir() if p.is_file() and not p.name.startswith(".") and p.name not in ("SUMMARY.json", "PERF.json"))
+        differing = [name for name in compared if (single / name).read_bytes() != (merged / name).read_bytes()]
+        summary = json.loads((merged / "SUMMARY.json").read_text(encoding="utf-8"))
+        return {
+            "benchmark": "shard",
+            "files": args.files,
+            "shards": args.shards,
+            "deepdive_args": extra,
+            "single_node_s": round(single_s, 2),
+            "shard_s": [round(x, 2) for x in shard_s],
+            "merge_s": round(merge_s, 2),
+            "n_node_wall_s": round(max(shard_s) + merge_s, 2),
+            "speedup": round(single_s / (max(shard_s) + merge_s), 2),
+            "outputs_compared": len(compared),
+            "byte_identical": not differing,
+            "differing": differing,
+            "duplicates_ok": summary.get("duplicate_hash_groups") == info["duplicate_groups"],
+        }
+
+
+def bench_delta(args: argparse.Namespace) -> Dict[str, Any]:
+    # A rescan after a day of changes: the EvidenceVault imports the delta instead of the full manifest.
+    rng = random.Random(args.seed)
+    aliases = ed.build_entity_aliases([])
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "corpus"
+        write_corpus(base, args.files, args.seed, media_kb=64, dup_pct=5.0)
+        root = base / "evidence"
+        before, after = Path(tmp) / "before", Path(tmp) / "after"
+        run_deepdive_child(root, before, [])
+
+        files = sorted(f for f in root.rglob("*") if f.is_file())
+        n = max(1, args.files * args.change_pct // 100)
+        picked = rng.sample(files, 3 * n)
+        modify = [f for f in picked[:n] if f.suffix[1:] in CORPUS_TEXT_EXTS]
+        for f in modify:
+            with f.open("a", encoding="utf-8") as fh:
+                fh.write(f"\nAddendum {rng.randint(0, 10**9)}\n")
+        (root / "refiled").mkdir()
+        for f in picked[n : 2 * n]:
+            f.rename(root / "refiled" / f.name)  # rename keeps the mtime, as a move between folders does
+        for f in picked[2 * n :]:
+            f.unlink()
+        for i in range(n):
+            (root / f"new_exhibit_{i:05d}.txt").write_text(synthetic_text(rng, aliases, 2048), encoding="utf-8")
+        run_deepdive_child(root, after, ["--diff-against", str(before)])
+
+        delta_path = Path(tmp) / "delta.json"
+        t0 = time.perf_counter()
+        counts = ed.write_manifest_delta(before, after, delta_path)
+        diff_s = time.perf_counter() - t0
+        delta = json.loads(delta_path.read_text(encoding="utf-8"))
+        old_manifest = json.loads((before / "evidence_vault_manifest.json").read_text(encoding="utf-8"))
+        new_manifest = json.loads((after / "evidence_vault_manifest.json").read_text(encoding="utf-8"))
+        applied = edf.apply_manifest_delta(old_manifest, delta)
+        same_as_scan = json.loads((after / ed.DELTA_FILE).read_text(encoding="utf-8"))["upsert"] == delta["upsert"]
+        return {
+            "benchmark": "delta",
+            "files": args.files,
+            "changes": {"modified": len(modify), "moved": n, "removed": n, "added": n},
+            "counts": {k: v for k, v in counts.items() if k != "path"},
+            "counts_ok": (counts["modified"], counts["moved"], counts["removed"], counts["added"]) == (len(modify), n, n, n),
+            "diff_ms": round(diff_s * 1000, 1),
+            "full_manifest_entries": len(new_manifest),
+            "full_manifest_kb": round((after / "evidence_vault_manifest.json").stat().st_size / 1024, 1),
+            "delta_entries": len(delta["upsert"]) + len(delta["remove"]),
+            "delta_kb": round(delta_path.stat().st_size / 1024, 1),
+            "applied_matches_full": sorted(applied, key=lambda e: e["path"]) == sorted(new_manifest, key=lambda e: e["path"]),
+            "scan_delta_matches": same_as_scan,
+        }
+
+
+def bench_merkle(args: argparse.Namespace) -> Dict[str, Any]:
+    # Synthetic evidence layout: matter/box/folder/file, about 40 files per folder.
+    rng = random.Random(args.seed)
+    leaves = {
+        f"matter/box{i % 50:02d}/folder{(i // 50) % (args.files // 2000 + 1):03d}/exhibit_{i:07d}.pdf": "%064x" % rng.getrandbits(256)
+        for i in range(args.files)
+    }
+
+    def legacy_marker() -> str:
+        # The custody report's old integrity_marker: one sha256 over the sorted, concatenated hashes.
+        return hashlib.sha256("".join(sorted(leaves.values())).encode("utf-8")).hexdigest()
+
+    def build() -> em.MerkleTree:
+        tree = em.MerkleTree()
+        for path, commitment in leaves.items():
+            tree.set(path, commitment)
+        tree.root()
+        return tree
+
+    legacy_s = best_of(legacy_marker, args.repeat)
+    build_s = best_of(build, args.repeat)
+    tree = build()
+    built_dirs = tree.rehashed_dirs
+
+    changed = rng.sample(sorted(leaves), args.changes)
+    for path in changed:
+        leaves[path] = "%064x" % rng.getrandbits(256)
+    tree.rehashed_dirs = 0
+    t0 = time.perf_counter()
+    tree.sync(leaves)
+    incremental_root = tree.root()
+    incremental_s = time.perf_counter() - t0
+
+    proof = tree.proof(changed[0])
+    hashes = sum(len(step["siblings"]) for step in proof["steps"])
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = Path(tmp) / em.MERKLE_FILE
+        tree.save(saved)
+        # load() recomputes every subtree root and checks them against the saved ones.
+        load_s = best_of(lambda: em.MerkleTree.load(saved), args.repeat)
+    return {
+        "benchmark": "merkle",
+        "files": args.files,
+        "legacy_flat_marker_ms": round(legacy_s * 1000, 1),
+        "full_build_ms": round(build_s * 1000, 1),
+        "full_build_dirs_hashed": built_dirs,
+        "changes": args.changes,
+        "incremental_ms": round(incremental_s * 1000, 2),
+        "incremental_dirs_hashed": tree.rehashed_dirs,
+        "incremental_root_ok": incremental_root == build().root(),
+        "load_verify_ms": round(load_s * 1000, 1),
+        "proof_hashes": hashes,
+        "log2_files": round(math.log2(args.files), 1),
+        "proof_valid": em.verify_merkle_proof(proof),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seed", type=int, default=1337, help="RNG seed for synthetic data.")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best time is reported).")
+    sub = ap.add_subparsers(dest="benchmark", required=True)
+
+    p = sub.add_parser("entities", help="AliasMatcher vs per-alias re.findall.")
+    p.add_argument("--size-mb", type=float, default=1.0, help="Synthetic document size in MB.")
+    p.add_argument("--extra-terms", type=int, default=300, help="Filename-derived terms added to the alias table.")
+    p.set_defaults(fn=bench_entities)
+
+    p = sub.add_parser("dates", help="Single-pass DATE_SCANNER vs the legacy three-pattern find_dates.")
+    p.add_argument("--size-mb", type=float, default=1.0, help="Synthetic document size in MB.")
+    p.set_defaults(fn=bench_dates)
+
+    p = sub.add_parser("docx", help="Streaming DOCX tokenizer vs the legacy whole-XML regex path.")
+    p.add_argument("--paragraphs", type=int, default=20000, help="Paragraphs in the synthetic document.")
+    p.add_argument("--max-chars", type=int, default=1_000_000, help="Extraction budget passed to both implementations.")
+    p.set_defaults(fn=bench_docx)
+
+    p = sub.add_parser("io", help="Single-read FileBuffer hash+extract vs separate sha256_file and extraction reads.")
+    p.add_argument("--files", type=int, default=30, help="Synthetic files (docx/pdf/csv rotation).")
+    p.add_argument("--paragraphs", type=int, default=2000, help="Paragraphs per DOCX.")
+    p.add_argument("--pdf-pages", type=int, default=50, help="Pages per PDF.")
+    p.add_argument("--text-kb", type=int, default=2048, help="Size of each CSV in KB.")
+    p.set_defaults(fn=bench_io)
+
+    p = sub.add_parser("text", help="Chunked one-pass hash+scan of a large text file vs read_text() of the whole file.")
+    p.add_argument("--size-mb", type=int, default=64, help="Size of the synthetic CSV in MB.")
+    p.set_defaults(fn=bench_text)
+
+    p = sub.add_parser("media", help="Header-only capture dates (media_dates) vs reading whole videos.")
+    p.add_argument("--files", type=int, default=4, help="Number of synthetic videos.")
+    p.add_argument("--size-mb", type=int, default=512, help="Sample data per video in MB (sparse on disk).")
+    p.set_defaults(fn=bench_media)
+
+    p = sub.add_parser("records", help="Bytes per IndexedFile and row serialization: compact slotted records vs the old dataclass + asdict().")
+    p.add_argument("--records", type=int, default=100_000, help="Records held in memory.")
+    p.set_defaults(fn=bench_records)
+
+    p = sub.add_parser("output", help="Streaming OutputSet writers vs building every record list before dumping.")
+    p.add_argument("--records", type=int, default=20_000, help="Synthetic IndexedFile records.")
+    p.set_defaults(fn=bench_output)
+
+    p = sub.add_parser("query", help="EvidenceIndexDb entity+date lookup vs loading indexed_files.json and filtering.")
+    p.add_argument("--records", type=int, default=50_000, help="Synthetic IndexedFile records.")
+    p.set_defaults(fn=bench_query)
+
+    p = sub.add_parser("timeline", help="Sorted, duplicate-merged timeline with bisect ranges vs scanning unsorted rows.")
+    p.add_argument("--records", type=int, default=50_000, help="Synthetic files with dates.")
+    p.add_argument("--dates-per-file", type=int, default=4, help="Content dates per file.")
+    p.set_defaults(fn=bench_timeline)
+
+    p = sub.add_parser("terms", help="TermIndex phrase lookup vs re-reading and tokenizing every file.")
+    p.add_argument("--files", type=int, default=2000, help="Synthetic text files.")
+    p.add_argument("--text-kb", type=int, default=16, help="Size of each file in KB.")
+    p.set_defaults(fn=bench_terms)
+
+    p = sub.add_parser("profile", help="Scan time with and without --profile instrumentation.")
+    p.add_argument("--files", type=int, default=800, help="Synthetic files (1 in 4 DOCX, the rest text).")
+    p.add_argument("--text-kb", type=int, default=16, help="Size of each text file in KB.")
+    p.set_defaults(fn=bench_profile)
+
+    p = sub.add_parser("watch", help="Incremental rescan after one dropped file (what --watch runs) vs a full scan.")
+    p.add_argument("--files", type=int, default=2000, help="Synthetic text files already indexed.")
+    p.add_argument("--text-kb", type=int, default=16, help="Size of each file in KB.")
+    p.set_defaults(fn=bench_watch)
+
+    p = sub.add_parser("latency", help="Walk+index with simulated per-call latency: serial vs --io-concurrency.")
+    p.add_argument("--files", type=int, default=1000, help="Synthetic corpus size.")
+    p.add_argument("--latency-ms", type=float, default=2.0, help="Sleep before each scandir/stat/open (network round-trip).")
+    p.add_argument("--concurrency", default="8,32,64", help="Comma-separated --io-concurrency values to compare.")
+    p.set_defaults(fn=bench_latency)
+
+    p = sub.add_parser("corpus", help="Write a synthetic evidence corpus (no benchmark) for sharing or manual runs.")
+    p.add_argument("--out", required=True, help="Directory to create; files go under <out>/evidence, stats in <out>/CORPUS.json.")
+    p.add_argument("--files", type=int, default=1000, help="Files to generate, planted duplicates included.")
+    p.add_argument("--text-kb", type=int, default=8, help="Average text file size in KB.")
+    p.add_argument("--paragraphs", type=int, default=40, help="Average paragraphs per DOCX.")
+    p.add_argument("--pdf-pages", type=int, default=4, help="Average pages per PDF.")
+    p.add_argument("--media-kb", type=int, default=64, help="Average dummy media file size in KB.")
+    p.add_argument("--dup-pct", type=float, default=5.0, help="Percent of files that are byte copies of earlier files.")
+    p.set_defaults(fn=bench_corpus)
+
+    p = sub.add_parser("suite", help="End-to-end deep dive over synthetic corpora: files/s, MB/s and peak RSS per size.")
+    p.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated corpus sizes (files).")
+    p.add_argument("--runs", type=int, default=1, help="Scans per size (best time, highest RSS reported).")
+    p.add_argument("--text-kb", type=int, default=8, help="Average text file size in KB.")
+    p.add_argument("--corpus-dir", default=None, help="Keep generated corpora here and reuse them on later runs.")
+    p.add_argument("--deepdive-args", default="", help='Extra deep dive flags, e.g. --deepdive-args="--workers 4".')
+    p.add_argument("--baseline", default="", help="Earlier suite output (JSON) to compare files/s against.")
+    p.set_defaults(fn=bench_suite)
+
+    p = sub.add_parser("shard", help="Single-node scan vs --shard i/N runs + merge: projected N-node wall time, byte-identical outputs.")
+    p.add_argument("--files", type=int, default=2000, help="Corpus size (files).")
+    p.add_argument("--shards", type=int, default=4, help="Number of shards.")
+    p.add_argument("--dup-pct", type=float, default=5.0, help="Percent of files that are planted duplicates.")
+    p.add_argument("--deepdive-args", default="--dedupe staged", help="Deep dive flags for every run.")
+    p.set_defaults(fn=bench_shard)
+
+    p = sub.add_parser("delta", help="Run-to-run diff after a batch of edits/moves/deletes/additions: delta manifest vs full re-import.")
+    p.add_argument("--files", type=int, default=2000, help="Corpus size (files).")
+    p.add_argument("--change-pct", type=int, default=2, help="Percent of files in each change set (moved, removed, added; modified among text files).")
+    p.set_defaults(fn=bench_delta)
+
+    p = sub.add_parser("merkle", help="Merkle root build, incremental update after a few changes and proof size vs the flat custody marker.")
+    p.add_argument("--files", type=int, default=100_000, help="Leaves (files) in the tree.")
+    p.add_argument("--changes", type=int, default=10, help="Files changed before the incremental update.")
+    p.set_defaults(fn=bench_merkle)
+
+    args = ap.parse_args()
+    print(json.dumps(args.fn(args), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+`evidence_deepdive.py diff`: added/removed/moved/modified files between two runs' out-dirs,
+written as an EvidenceVault delta manifest (write_manifest_delta()), and the import side of
+such a delta (apply_manifest_delta()).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from evidence_deepdive import DELTA_FILE, output_path, write_manifest_delta
+
+
+def apply_manifest_delta(entries: List[Dict[str, Any]], delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # The EvidenceVault import of a delta: drop removed paths, then upsert by path (existing
+    # paths keep their place, new ones are appended).
+    gone = set(delta["remove"])
+    merged = {e["path"]: e for e in entries if e["path"] not in gone}
+    for e in delta["upsert"]:
+        merged[e["path"]] = e
+    return list(merged.values())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="evidence_deepdive.py diff",
+        description="Added/removed/moved/modified files between two runs, plus an EvidenceVault delta manifest.",
+    )
+    ap.add_argument("base", help="Out-dir of the earlier run.")
+    ap.add_argument("target", help="Out-dir of the later run.")
+    ap.add_argument("--delta", default="", help=f"Where to write the delta (default: <target>/{DELTA_FILE}).")
+    args = ap.parse_args(argv)
+
+    base_dir = Path(args.base).expanduser().resolve()
+    target_dir = Path(args.target).expanduser().resolve()
+    for d in (base_dir, target_dir):
+        if not d.is_dir():
+            print(f"ERROR: out-dir not found: {d}", file=sys.stderr)
+            return 2
+    if output_path(target_dir, "evidence_vault_manifest") is None:
+        print(f"ERROR: no evidence_vault_manifest in {target_dir}", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    try:
+        result = write_manifest_delta(base_dir, target_dir, Path(args.delta).expanduser().resolve() if args.delta else None)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    result["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
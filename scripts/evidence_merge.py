@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+`evidence_deepdive.py merge`: combine the SHARD.jsonl files of --shard 1/N .. N/N runs into
+the outputs a single run would have written (see write_shard() for the shard format).
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import heapq
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from evidence_deepdive import (
+    SHARD_FILE,
+    SHARD_VERSION,
+    EntityNames,
+    EvidenceItem,
+    IndexedFile,
+    TermIndexWriter,
+    write_json,
+    write_outputs,
+)
+
+
+def _shard_file(path: Path) -> Path:
+    # A shard's out-dir or its SHARD.jsonl(.gz) itself.
+    if path.is_dir():
+        for name in (SHARD_FILE, SHARD_FILE + ".gz"):
+            if (path / name).exists():
+                return path / name
+    return path
+
+
+def _open_shard(path: Path) -> TextIO:
+    opener: Any = gzip.open if path.suffix == ".gz" else open
+    return opener(path, "rt", encoding="utf-8")
+
+
+def _shard_rows(path: Path, partials: Dict[int, str]) -> Iterator[Tuple[List[int], Dict[str, Any]]]:
+    # (walk position, line) per record; the trailing partial digests go into `partials`.
+    with _open_shard(path) as f:
+        next(f)
+        for text in f:
+            line = json.loads(text)
+            if "partials" in line:
+                partials.update((int(p), d) for p, d in line["partials"].items())
+                return
+            yield line["pos"], line
+
+
+def merge_shards(paths: List[Path], out_dir: Path) -> Dict[str, Any]:
+    """
+    Outputs of a single run from the SHARD.jsonl files of one --shard i/N run per slice.
+
+    Records are k-way merged back into walk order and replayed through write_outputs(), so
+    indices, duplicate groups (across shards too), entity map, timeline and term index come
+    out byte-identical. A staged dedupe still reads the evidence for digests the shards could
+    not take (full hashes of partial-digest collisions, mostly), so run it where the roots are
+    mounted at the same paths.
+    """
+    files = [_shard_file(p) for p in paths]
+    headers: List[Dict[str, Any]] = []
+    for f in files:
+        if not f.is_file():
+            raise ValueError(f"no {SHARD_FILE} in {f}")
+        with _open_shard(f) as fh:
+            headers.append(json.loads(fh.readline()))
+    first = headers[0]
+    for f, h in zip(files, headers):
+        if h.get("version") != SHARD_VERSION:
+            raise ValueError(f"{f}: unsupported shard version {h.get('version')}")
+        for key in ("shards", "config_key", "listing", "roots", "options"):
+            if h[key] != first[key]:
+                raise ValueError(f"{f}: {key} does not match {files[0]}; shards must come from one run with identical options")
+    n = first["shards"]
+    got = sorted(h["shard"] for h in headers)
+    if got != list(range(1, n + 1)):
+        raise ValueError(f"need shards 1..{n} exactly once, got {got}")
+
+    args = argparse.Namespace(**first["options"])
+    roots = [Path(r) for r in first["roots"]]
+    seed_items = [EvidenceItem(**x) for x in first["seed_items"]]
+    term_writer: Optional[TermIndexWriter] = None
+    if args.term_index:
+        term_writer = TermIndexWriter(out_dir / Path(args.term_index).expanduser(), first["term_key_check"])
+    by_pos: Dict[int, str] = {}
+    partials: Dict[int, str] = {}
+    entities = EntityNames()
+
+    def replay() -> Iterator[IndexedFile]:
+        idx_of: Dict[int, int] = {}
+        streams = [_shard_rows(f, by_pos) for f in files]
+        for idx, (pos, line) in enumerate(heapq.merge(*streams, key=lambda r: r[0])):
+            if pos[1] == 0:
+                idx_of[pos[0]] = idx
+            if term_writer is not None:
+                term_writer.add(base64.b64decode(line["terms"]) if "terms" in line else None)
+            yield IndexedFile(**line["record"], entities=entities)
+        # Filled before write_outputs() dedupes, which is after the last record.
+        partials.update((idx_of[p], d) for p, d in by_pos.items() if p in idx_of)
+
+    summary = write_outputs(args, roots, out_dir, seed_items, replay(), term_writer, partials=partials, canonicals=first["canonicals"])
+    summary["shards"] = n
+    write_json(out_dir / "SUMMARY.json", summary)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="evidence_deepdive.py merge",
+        description="Combine the outputs of --shard 1/N .. N/N runs into what a single run would have written.",
+    )
+    ap.add_argument("shards", nargs="+", help="Shard out-dirs (or their SHARD.jsonl files), one per slice.")
+    ap.add_argument("--out-dir", required=True, help="Output directory for the merged reports/manifests.")
+    args = ap.parse_args(argv)
+    try:
+        summary = merge_shards([Path(p).expanduser().resolve() for p in args.shards], Path(args.out_dir).expanduser().resolve())
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Directory-shaped Merkle trees over evidence files, shared by evidence_deepdive.py (--merkle)
+and the chain-of-custody report; main() is `evidence_deepdive.py merkle prove/verify`.
+
+Leaves are keyed by merkle_key(): the evidence root's directory name plus the file's path
+under that root, so a tree (and its root) does not depend on where the evidence is mounted,
+and two tools that hash the same folder agree on every key.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+MERKLE_FILE = "evidence_merkle.json"
+MERKLE_VERSION = 2
+
+
+def merkle_key(root_name: str, rel_path: str) -> str:
+    # A file's place in the tree: "<root name>/<path under the root>", "/" separated.
+    return "/".join([root_name, *Path(rel_path).as_posix().split("/")])
+
+
+def merkle_leaf(sha256: str, size: int) -> str:
+    # What the tree commits to for a file: its sha256, or (unreadable archive member) a
+    # marker of its size only.
+    return sha256 or hashlib.sha256(b"unhashed\x00%d" % size).hexdigest()
+
+
+def _merkle_entry(kind: str, name: str, child: bytes) -> bytes:
+    # RFC 6962 leaf hash (0x00 prefix) of one directory entry: "f"ile or "d"irectory, name, child hash.
+    return hashlib.sha256(b"\x00" + kind.encode("ascii") + name.encode("utf-8") + b"\x00" + child).digest()
+
+
+def _merkle_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _merkle_levels(nodes: List[bytes]) -> List[List[bytes]]:
+    # Bottom-up levels of the binary tree; an unpaired last node moves up as is (the RFC 6962 shape).
+    levels = [nodes or [hashlib.sha256(b"").digest()]]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        up = [_merkle_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            up.append(level[-1])
+        levels.append(up)
+    return levels
+
+
+class MerkleTree:
+    """
+    A Merkle tree over files that mirrors their directories.
+
+    A directory's entries, sorted by name (files by their merkle_leaf(), subdirectories by
+    their own root), are the leaves of an RFC 6962-style binary tree whose root is the
+    directory's subtree root. A file's inclusion proof is one audit path per directory on
+    its way up: O(log n) hashes for a reasonably balanced tree. Subtree roots are cached, so
+    after set()/remove() only the directories above changed files are rehashed; load()
+    recomputes them all rather than trusting the saved ones.
+    """
+
+    def __init__(self) -> None:
+        self.leaves: Dict[str, str] = {}
+        # directory -> {entry name: "f" | "d"}; "" is the top
+        self.children: Dict[str, Dict[str, str]] = {"": {}}
+        self.dir_roots: Dict[str, str] = {}
+        self.rehashed_dirs = 0
+
+    @staticmethod
+    def _join(d: str, name: str) -> str:
+        return f"{d}/{name}" if d else name
+
+    def set(self, path: str, commitment: str) -> None:
+        if self.leaves.get(path) == commitment:
+            return
+        self.leaves[path] = commitment
+        d, _, name = path.rpartition("/")
+        self.children.setdefault(d, {})[name] = "f"
+        while True:
+            self.dir_roots.pop(d, None)
+            if not d:
+                return
+            parent, _, name = d.rpartition("/")
+            self.children.setdefault(parent, {})[name] = "d"
+            d = parent
+
+    def remove(self, path: str) -> None:
+        if self.leaves.pop(path, None) is None:
+            return
+        d, _, name = path.rpartition("/")
+        del self.children[d][name]
+        while True:
+            self.dir_roots.pop(d, None)
+            if not d:
+                return
+            parent, _, name = d.rpartition("/")
+            if not self.children[d]:
+                del self.children[d]
+                del self.children[parent][name]
+            d = parent
+
+    def sync(self, leaves: Dict[str, str]) -> int:
+        # Make the tree hold exactly `leaves`; returns the number of files added, changed or removed.
+        gone = [p for p in self.leaves if p not in leaves]
+        for path in gone:
+            self.remove(path)
+        changed = len(gone)
+        for path, commitment in leaves.items():
+            if self.leaves.get(path) != commitment:
+                self.set(path, commitment)
+                changed += 1
+        return changed
+
+    def find(self, path: str) -> str:
+        # The leaf key for path: a key itself, or a path under one of the top-level roots.
+        path = Path(path).as_posix()
+        if path in self.leaves:
+            return path
+        found = [key for key in (self._join(top, path) for top in self.children[""]) if key in self.leaves]
+        if len(found) != 1:
+            raise KeyError(f"not in the tree: {path}" if not found else f"ambiguous, give the root name: {found}")
+        return found[0]
+
+    def _levels(self, d: str) -> Tuple[List[str], List[List[bytes]]]:
+        names = sorted(self.children[d])
+        entries = []
+        for name in names:
+            kind = self.children[d][name]
+            child = self._join(d, name)
+            entries.append(_merkle_entry(kind, name, bytes.fromhex(self.leaves[child] if kind == "f" else self.root(child))))
+        return names, _merkle_levels(entries)
+
+    def root(self, d: str = "") -> str:
+        cached = self.dir_roots.get(d)
+        if cached is None:
+            cached = self._levels(d)[1][-1][0].hex()
+            self.dir_roots[d] = cached
+            self.rehashed_dirs += 1
+        return cached
+
+    def proof(self, path: str) -> Dict[str, Any]:
+        """Inclusion proof of one file: per directory, bottom up, its entry and audit path."""
+        if path not in self.leaves:
+            raise KeyError(f"not in the tree: {path}")
+        root = self.root()
+        steps: List[Dict[str, Any]] = []
+        child, kind = path, "f"
+        while True:
+            d, _, name = child.rpartition("/")
+            names, levels = self._levels(d)
+            i = bisect.bisect_left(names, name)
+            siblings: List[List[str]] = []
+            for level in levels[:-1]:
+                j = i ^ 1
+                if j < len(level):
+                    siblings.append(["L" if j < i else "R", level[j].hex()])
+                i //= 2
+            steps.append({"kind": kind, "name": name, "siblings": siblings})
+            if not d:
+                break
+            child, kind = d, "d"
+        return {"version": MERKLE_VERSION, "path": path, "leaf": self.leaves[path], "root": root, "steps": steps}
+
+    def save(self, path: Path) -> None:
+        data = {
+            "version": MERKLE_VERSION,
+            "root": self.root(),
+            "files": len(self.leaves),
+            "dir_roots": dict(sorted(self.dir_roots.items())),
+            "leaves": dict(sorted(self.leaves.items())),
+        }
+        # Written under a .tmp name and renamed, so readers never see a partial tree.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "MerkleTree":
+        # Every subtree root is recomputed from the leaves (about 0.8 s per 100k files) and the
+        # file is rejected unless its saved roots agree, so an edited tree cannot vouch for a leaf.
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != MERKLE_VERSION:
+            raise ValueError(f"{path}: unsupported merkle tree version {data.get('version')}")
+        tree = cls()
+        for p, commitment in data["leaves"].items():
+            tree.set(p, commitment)
+        if tree.root() != data["root"] or tree.dir_roots != data["dir_roots"]:
+            raise ValueError(f"{path}: saved roots do not match its leaves")
+        tree.rehashed_dirs = 0
+        return tree
+
+
+def verify_merkle_proof(proof: Dict[str, Any]) -> bool:
+    # Recompute the root from the leaf; the entry names must also spell the proof's path.
+    h = bytes.fromhex(proof["leaf"])
+    names: List[str] = []
+    for n, step in enumerate(proof["steps"]):
+        if step["kind"] != ("f" if n == 0 else "d"):
+            return False
+        node = _merkle_entry(step["kind"], step["name"], h)
+        for side, sibling in step["siblings"]:
+            node = _merkle_node(bytes.fromhex(sibling), node) if side == "L" else _merkle_node(node, bytes.fromhex(sibling))
+        h = node
+        names.append(step["name"])
+    return "/".join(reversed(names)) == proof["path"] and h.hex() == proof["root"]
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="evidence_deepdive.py merkle", description=f"Inclusion proofs against a --merkle tree ({MERKLE_FILE}).")
+    sub = ap.add_subparsers(dest="action", required=True)
+    p = sub.add_parser("prove", help="Print one file's inclusion proof.")
+    p.add_argument("--tree", required=True, help=f"{MERKLE_FILE} from a --merkle run, or a custody report's tree.")
+    p.add_argument(
+        "path",
+        help="<root name>/<path under the root> (or just the path under the root); archive members as <zip>!/<member>.",
+    )
+    p = sub.add_parser("verify", help="Check a proof; exits 1 when it does not hold.")
+    p.add_argument("proof", help="Proof JSON from `merkle prove`.")
+    p.add_argument("--root", default="", help="Root the proof must lead to (e.g. SUMMARY.json merkle.root).")
+    p.add_argument("--file", default="", help="Also sha256 this file and check it against the proof's leaf.")
+    args = ap.parse_args(argv)
+
+    try:
+        if args.action == "prove":
+            tree = MerkleTree.load(Path(args.tree).expanduser())
+            proof = tree.proof(tree.find(args.path))
+            print(json.dumps(proof, indent=2))
+            return 0
+        proof = json.loads(Path(args.proof).expanduser().read_text(encoding="utf-8"))
+        checks = {"proof": verify_merkle_proof(proof)}
+        if args.root:
+            checks["root"] = proof["root"] == args.root.lower()
+        if args.file:
+            checks["file"] = _sha256_file(Path(args.file).expanduser()) == proof["leaf"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    valid = all(checks.values())
+    print(json.dumps({"valid": valid, "path": proof["path"], "root": proof["root"], "checks": checks}, indent=2))
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
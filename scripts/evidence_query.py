@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+`evidence_deepdive.py query`: look up files in the SQLite index a scan writes with --sqlite
+(EvidenceIndexDb), by entity or alias, date range, category, hash prefix or FTS text.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from evidence_deepdive import date_bounds
+
+
+def resolve_entity(conn: sqlite3.Connection, name: str) -> List[str]:
+    # Canonical entities name is an alias of (indexes from before entity_aliases: none).
+    try:
+        rows = conn.execute("SELECT entity FROM entity_aliases WHERE alias = ?", (name.strip().lower(),)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [r[0] for r in rows]
+
+
+def query_index(
+    db_path: Path,
+    entity: str = "",
+    date_from: str = "",
+    date_to: str = "",
+    category: str = "",
+    sha256: str = "",
+    text: str = "",
+    duplicates_only: bool = False,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    Files matching every given filter (entity, date range, category, sha256 prefix, FTS text,
+    duplicates only), in walk order. Each row lists the dates and entity hits that matched.
+    entity is a canonical name or any alias of one (e.g. "Snyder" for "Jeffery Snyder").
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    where: List[str] = []
+    params: List[Any] = []
+    if entity:
+        names = [entity] + resolve_entity(conn, entity)
+        where.append(f"f.id IN (SELECT file_id FROM entity_hits WHERE entity COLLATE NOCASE IN ({','.join('?' * len(names))}))")
+        params += names
+    dated = bool(date_from or date_to)
+    lo, hi = date_bounds(date_from, date_to)
+    if dated:
+        where.append("f.id IN (SELECT file_id FROM file_dates WHERE date BETWEEN ? AND ?)")
+        params += [lo, hi]
+    if category:
+        where.append("f.category = ?")
+        params.append(category)
+    if sha256:
+        where.append("f.sha256 >= ? AND f.sha256 < ?")
+        params += [sha256.lower(), sha256.lower() + "g"]
+    if text:
+        where.append("f.id IN (SELECT rowid FROM files_fts WHERE files_fts MATCH ?)")
+        params.append(text)
+    if duplicates_only:
+        where.append("f.id IN (SELECT file_id FROM duplicates)")
+    sql = "SELECT f.id, f.full_path, f.category, f.sha256 FROM files f"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY f.id LIMIT ?"
+
+    out: List[Dict[str, Any]] = []
+    by_id: Dict[int, Dict[str, Any]] = {}
+    for file_id, full_path, cat, sha in conn.execute(sql, params + [limit]):
+        row: Dict[str, Any] = {"id": file_id, "path": full_path, "category": cat, "sha256": sha, "dates": [], "entities": {}}
+        out.append(row)
+        by_id[file_id] = row
+    # Details for all result rows in one query per table rather than one per row.
+    ids = json.dumps(list(by_id))
+    date_sql = "SELECT file_id, date, basis, pages FROM file_dates WHERE file_id IN (SELECT value FROM json_each(?))"
+    date_params: List[Any] = [ids]
+    if dated:
+        date_sql += " AND date BETWEEN ? AND ?"
+        date_params += [lo, hi]
+    for file_id, d, b, pg in conn.execute(date_sql + " ORDER BY file_id, date", date_params):
+        by_id[file_id]["dates"].append({"date": d, "basis": b, **({"pages": pg} if pg else {})})
+    for file_id, ent, c in conn.execute(
+        "SELECT file_id, entity, count FROM entity_hits WHERE file_id IN (SELECT value FROM json_each(?)) ORDER BY rowid", (ids,)
+    ):
+        by_id[file_id]["entities"][ent] = c
+    for file_id, other in conn.execute(
+        "SELECT d.file_id, f.full_path FROM duplicates d JOIN duplicates o ON o.sha256 = d.sha256 AND o.file_id != d.file_id"
+        " JOIN files f ON f.id = o.file_id WHERE d.file_id IN (SELECT value FROM json_each(?)) ORDER BY d.file_id, o.file_id",
+        (ids,),
+    ):
+        by_id[file_id].setdefault("duplicates", []).append(other)
+    conn.close()
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="evidence_deepdive.py query", description="Look up files in an --sqlite evidence index.")
+    ap.add_argument("--db", required=True, help="Index written by --sqlite.")
+    ap.add_argument("--entity", default="", help="Canonical entity name or one of its aliases (case-insensitive).")
+    ap.add_argument("--from", dest="date_from", default="", help="Earliest date, ISO or ISO prefix (2025-08).")
+    ap.add_argument("--to", dest="date_to", default="", help="Latest date, ISO or ISO prefix (2025-12 includes Dec 31).")
+    ap.add_argument("--category", default="", help='Exact category (e.g. "Filings & Notices").')
+    ap.add_argument("--sha256", default="", help="Full hash or hex prefix.")
+    ap.add_argument("--text", default="", help="FTS5 query over file name, relative path and category.")
+    ap.add_argument("--duplicates", action="store_true", help="Only files in a duplicate sha256 group.")
+    ap.add_argument("--limit", type=int, default=100, help="Maximum rows returned.")
+    args = ap.parse_args(argv)
+
+    db_path = Path(args.db).expanduser().resolve()
+    if not db_path.is_file():
+        print(f"ERROR: index not found: {db_path}", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    try:
+        rows = query_index(
+            db_path,
+            entity=args.entity,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            category=args.category,
+            sha256=args.sha256,
+            text=args.text,
+            duplicates_only=args.duplicates,
+            limit=args.limit,
+        )
+    except sqlite3.OperationalError as e:
+        print(f"ERROR: query failed: {e}", file=sys.stderr)
+        return 2
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    print(json.dumps({"count": len(rows), "elapsed_ms": round(elapsed_ms, 2), "results": rows}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
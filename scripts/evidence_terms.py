@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+`evidence_deepdive.py terms`: word and phrase lookup in the --term-index file a scan writes
+(TermIndexWriter), without reading any evidence. Tokens are hashed with the same --term-key.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from evidence_deepdive import (
+    TERM_INDEX_ENTRY,
+    TERM_INDEX_HEADER,
+    TERM_INDEX_MAGIC,
+    TERM_TOKEN,
+    get_varint,
+    load_term_key,
+    term_id,
+    term_key_check,
+)
+
+
+class TermIndex:
+    """Read side of a --term-index file: mmap'ed, binary search over the term dictionary."""
+
+    def __init__(self, path: Path, key: bytes) -> None:
+        self.key = key
+        self._f = path.open("rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(TERM_INDEX_MAGIC)] != TERM_INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"not a term index: {path}")
+        self.n_terms, self.dict_off, files_off, files_len, check = TERM_INDEX_HEADER.unpack_from(self._mm, len(TERM_INDEX_MAGIC))
+        if check != term_key_check(key):
+            self.close()
+            raise ValueError(f"{path} was built with a different --term-key")
+        self.paths: List[str] = json.loads(self._mm[files_off : files_off + files_len])
+
+    def _entry(self, tid: int) -> Optional[Tuple[int, int, int]]:
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t, off, size, docs = TERM_INDEX_ENTRY.unpack_from(self._mm, self.dict_off + mid * TERM_INDEX_ENTRY.size)
+            if t == tid:
+                return off, size, docs
+            if t < tid:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def postings(self, token: str) -> Dict[int, List[int]]:
+        # file id -> token positions for one (lowercased) token.
+        entry = self._entry(term_id(token, self.key))
+        if entry is None:
+            return {}
+        off, _, docs = entry
+        out: Dict[int, List[int]] = {}
+        doc = 0
+        pos = off
+        for _ in range(docs):
+            delta, pos = get_varint(self._mm, pos)
+            doc += delta
+            n, pos = get_varint(self._mm, pos)
+            plist: List[int] = []
+            p = 0
+            for _ in range(n):
+                g, pos = get_varint(self._mm, pos)
+                p += g
+                plist.append(p)
+            out[doc] = plist
+        return out
+
+    def search(self, phrase: str) -> List[Tuple[int, List[int]]]:
+        """(file id, start positions) for files containing the phrase's tokens consecutively."""
+        tokens = TERM_TOKEN.findall(phrase.lower())
+        if not tokens:
+            return []
+        lists = [self.postings(t) for t in tokens]
+        docs = set(lists[0]).intersection(*lists[1:])
+        out: List[Tuple[int, List[int]]] = []
+        for doc in sorted(docs):
+            later = [set(pl[doc]) for pl in lists[1:]]
+            starts = [p for p in lists[0][doc] if all(p + i in s for i, s in enumerate(later, start=1))]
+            if starts:
+                out.append((doc, starts))
+        return out
+
+    def close(self) -> None:
+        self._mm.close()
+        self._f.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="evidence_deepdive.py terms", description="Term and phrase lookup in a --term-index file (no evidence is read)."
+    )
+    ap.add_argument("--index", required=True, help="Index written by --term-index.")
+    ap.add_argument("--key", required=True, help="The --term-key file the index was built with.")
+    ap.add_argument("phrase", help="A word, or several words that must appear consecutively.")
+    ap.add_argument("--limit", type=int, default=100, help="Maximum rows returned.")
+    args = ap.parse_args(argv)
+
+    index_path = Path(args.index).expanduser().resolve()
+    if not index_path.is_file():
+        print(f"ERROR: term index not found: {index_path}", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    try:
+        index = TermIndex(index_path, load_term_key(Path(args.key).expanduser()))
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    hits = index.search(args.phrase)
+    rows = [
+        {"id": doc, "path": index.paths[doc], "hits": len(starts), "positions": starts} for doc, starts in hits[: args.limit]
+    ]
+    index.close()
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    print(json.dumps({"count": len(hits), "elapsed_ms": round(elapsed_ms, 2), "results": rows}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+`evidence_deepdive.py timeline`: a date-range page of the sorted timeline.json / timeline.jsonl
+a scan writes, found by bisection rather than by reading every row.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from evidence_deepdive import date_bounds
+
+
+class Timeline:
+    """
+    Sorted timeline rows (as written to timeline.json / timeline.jsonl) with bisect range
+    lookups, so "events between X and Y" is O(log n + k) and pages never need re-sorting.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self.dates = [r["date"] for r in rows]
+
+    @classmethod
+    def load(cls, path: Path) -> "Timeline":
+        opener: Any = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            if path.name.endswith((".jsonl", ".jsonl.gz")):
+                rows = [json.loads(line) for line in f if line.strip()]
+            else:
+                rows = json.load(f)
+        return cls(rows)
+
+    def span(self, date_from: str = "", date_to: str = "") -> Tuple[int, int]:
+        # Row slice [i, j) for the range; bounds accept ISO prefixes like query --from/--to.
+        lo, hi = date_bounds(date_from, date_to)
+        return bisect.bisect_left(self.dates, lo), bisect.bisect_right(self.dates, hi)
+
+    def between(self, date_from: str = "", date_to: str = "") -> List[Dict[str, Any]]:
+        i, j = self.span(date_from, date_to)
+        return self.rows[i:j]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="evidence_deepdive.py timeline", description="Date-range page of a sorted timeline output.")
+    ap.add_argument("--file", required=True, help="timeline.json or timeline.jsonl (optionally .gz) from a scan.")
+    ap.add_argument("--from", dest="date_from", default="", help="Earliest date, ISO or ISO prefix (2025-08).")
+    ap.add_argument("--to", dest="date_to", default="", help="Latest date, ISO or ISO prefix (2025-12 includes Dec 31).")
+    ap.add_argument("--offset", type=int, default=0, help="Rows to skip within the range (paging).")
+    ap.add_argument("--limit", type=int, default=100, help="Maximum rows returned.")
+    args = ap.parse_args(argv)
+
+    path = Path(args.file).expanduser().resolve()
+    if not path.is_file():
+        print(f"ERROR: timeline not found: {path}", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    timeline = Timeline.load(path)
+    i, j = timeline.span(args.date_from, args.date_to)
+    start = i + max(args.offset, 0)
+    rows = timeline.rows[start : min(j, start + args.limit)]
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    print(json.dumps({"count": j - i, "offset": args.offset, "elapsed_ms": round(elapsed_ms, 2), "results": rows}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
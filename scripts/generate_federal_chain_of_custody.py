@@ -1,12 +1,34 @@
 import os
+import sys
 import json
 import hashlib
+import importlib.util
 import psycopg2
 from fpdf import FPDF
 from datetime import datetime, timezone
+from pathlib import Path
 from urllib.parse import urlparse
 
 
+def load_evidence_merkle():
+    # scripts/evidence_merkle.py, loaded by path as evidence_deepdive.py's sibling_module() does, so no sys.path edits.
+    module = sys.modules.get("evidence_merkle")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("evidence_merkle", Path(__file__).resolve().with_name("evidence_merkle.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["evidence_merkle"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+evidence_merkle = load_evidence_merkle()
+
+MERKLE_TREE_PATH = os.path.join("docs", "LexiPro_Federal_Chain_of_Custody.merkle.json")
+# Artifacts are keyed as `evidence_deepdive.py --root docs --merkle` keys them ("docs/<path
+# under docs>"), so the two trees agree on every exhibit they share.
+EVIDENCE_ROOT = "docs"
+
+
 def get_db_conn_kwargs():
     db_url = os.getenv("DATABASE_URL") or os.getenv("LEXIPRO_DATABASE_URL")
     if db_url:
@@ -27,6 +49,15 @@ def get_db_conn_kwargs():
     }
 
 
+def artifact_merkle_key(file_path):
+    root = os.path.abspath(EVIDENCE_ROOT)
+    path = os.path.abspath(file_path)
+    if os.path.commonpath([root, path]) != root:
+        # Outside docs/: keyed under its own directory, as a deep dive rooted there would.
+        root = os.path.dirname(path)
+    return evidence_merkle.merkle_key(os.path.basename(root), os.path.relpath(path, root))
+
+
 def sha256_file(path):
     digest = hashlib.sha256()
     with open(path, "rb") as handle:
@@ -185,7 +216,14 @@ def generate():
             )
 
         hash_values = [row["sha256"] for row in artifact_rows]
-        integrity_marker = hashlib.sha256("".join(sorted(hash_values)).encode("utf-8")).hexdigest() if hash_values else ""
+        # Merkle root over the artifact files by directory; per-exhibit inclusion proofs come from
+        # the saved tree: python scripts/evidence_deepdive.py merkle prove --tree <tree> docs/<file>
+        tree = evidence_merkle.MerkleTree()
+        for file_path, row in zip(files, artifact_rows):
+            tree.set(artifact_merkle_key(file_path), row["sha256"])
+        integrity_marker = tree.root() if hash_values else ""
+        if hash_values:
+            tree.save(Path(MERKLE_TREE_PATH))
 
         has_event_hashes = False
         if events:
@@ -224,7 +262,7 @@ def generate():
         pdf.set_font("Helvetica", "B", 11)
         pdf.cell(55, 6, "HASH ALGORITHM:", ln=False)
         pdf.set_font("Helvetica", "", 11)
-        pdf.cell(0, 6, "SHA-256", ln=True)
+        pdf.cell(0, 6, "SHA-256 (Merkle tree over artifact directories)", ln=True)
 
         pdf.set_font("Helvetica", "B", 11)
         pdf.cell(55, 6, "LEDGER MODE:", ln=False)
@@ -304,7 +342,9 @@ def generate():
             0,
             5,
             "Reproduce ledger verification via /api/integrity/verify and /api/audit/export. "
-            "Results remain stable unless the artifact set is modified.",
+            "Results remain stable unless the artifact set is modified. "
+            "The integrity marker is the Merkle root of the artifact register; any single exhibit can be "
+            f"proven against it from {MERKLE_TREE_PATH} without re-hashing the rest.",
         )
         pdf.ln(3)
         pdf.set_font("Helvetica", "I", 9)
@@ -0,0 +1,67 @@
+import io
+import json
+import sys
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import evidence_deepdive as ed  # noqa: E402
+
+
+def _zip_bytes(members: Dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(zipfile.ZipInfo(name, date_time=(2025, 8, 1, 12, 0, 0)), data)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    """A small evidence root: dated text, duplicate copies and a ZIP holding a nested ZIP."""
+    root = tmp_path / "evidence"
+    (root / "filings").mkdir(parents=True)
+    (root / "notes").mkdir()
+    (root / "filings" / "OCSO_report_2025-08-01.txt").write_text(
+        "Oakland County Sheriff report filed 8/1/2025. Deputy Snyder wrote it; NEWTOKEN is mentioned.\n"
+    )
+    (root / "filings" / "FOIA_request.txt").write_text("FOIA request sent January 6, 2026 to MDCR.\n")
+    (root / "notes" / "call_log.txt").write_text("Call with Cody McKenzie on 2025-09-15 about the Liberty Bar.\n")
+    (root / "notes" / "call_log_copy.txt").write_text("Call with Cody McKenzie on 2025-09-15 about the Liberty Bar.\n")
+    (root / "notes" / "photo.jpg").write_bytes(b"\xff\xd8\xff\xe0" + b"\0" * 64)
+    inner = _zip_bytes({"deep/memo.txt": b"Pontiac memo dated 2025-10-02 naming NEWTOKEN.\n"})
+    (root / "bundle.zip").write_bytes(
+        _zip_bytes({"a/letter.txt": b"Letter to Jeffrey Snyder, 3/4/2025.\n", "a/nested.zip": inner})
+    )
+    return root
+
+
+@pytest.fixture
+def run_deepdive(capsys: pytest.CaptureFixture[str]) -> Callable[..., Dict[str, Any]]:
+    """Call evidence_deepdive.main() and return the summary it prints (or a subcommand's JSON)."""
+
+    def run(*argv: Any) -> Dict[str, Any]:
+        capsys.readouterr()
+        code = ed.main([str(a) for a in argv])
+        out = capsys.readouterr().out
+        assert code == 0, out
+        return json.loads(out)
+
+    return run
+
+
+def outputs(out_dir: Path) -> Dict[str, bytes]:
+    # Every output file of a run, minus the run-specific summary and the caches.
+    return {
+        f.name: f.read_bytes()
+        for f in sorted(out_dir.iterdir())
+        if f.is_file() and not f.name.startswith(".") and f.name not in ("SUMMARY.json", "PERF.json")
+    }
+
+
+def rows(path: Path) -> List[Dict[str, Any]]:
+    return json.loads(path.read_text(encoding="utf-8"))
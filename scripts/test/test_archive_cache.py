@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+import evidence_deepdive as ed
+from conftest import outputs, rows
+
+
+def test_member_cache_entry_round_trips() -> None:
+    content = ed.ContentResult(
+        content_extracted=True,
+        dates_from_content=["2025-03-04"],
+        entity_hits={"Jeffery Snyder": 2},
+        page_refs={"entities": {"Jeffery Snyder": [1]}, "dates": {"2025-03-04": [1]}},
+        terms=b"\x01\x02",
+    )
+    member = ed.ArchiveMember("a/letter.txt", 40, 1754049600.0, "ab" * 32, content)
+    # Through JSON, as FingerprintCache saves it; the postings come back separately.
+    entry = json.loads(json.dumps(member.cache_entry()))
+    back = ed.ArchiveMember.from_cache(entry, member.content.terms)
+    assert back.content == member.content
+    assert (back.inner, back.size, back.mtime, back.sha256) == (member.inner, member.size, member.mtime, member.sha256)
+    assert back.from_store
+
+
+def test_cached_members_match_a_fresh_scan(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    out = tmp_path / "out"
+    args = ("--root", corpus, "--out-dir", out, "--incremental", "--archive-depth", 2)
+    run_deepdive(*args)
+    summary = run_deepdive(*args)
+    assert summary["cache"]["misses"] == 0
+
+    fresh = tmp_path / "fresh"
+    run_deepdive("--root", corpus, "--out-dir", fresh, "--archive-depth", 2)
+    assert outputs(out) == outputs(fresh)
+    members = [r["rel_path"] for r in rows(out / "indexed_files.json") if ed.ARCHIVE_SEP in r["rel_path"]]
+    assert any(m.endswith("deep/memo.txt") for m in members)
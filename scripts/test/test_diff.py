@@ -0,0 +1,41 @@
+import shutil
+from pathlib import Path
+
+import evidence_diff
+from conftest import rows
+
+
+def test_delta_turns_the_old_manifest_into_the_new_one(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    base, target = tmp_path / "base", tmp_path / "target"
+    run_deepdive("--root", corpus, "--out-dir", base)
+
+    shutil.move(str(corpus / "notes" / "call_log.txt"), str(corpus / "filings" / "call_log.txt"))
+    (corpus / "filings" / "FOIA_request.txt").write_text("FOIA request withdrawn.\n")
+    (corpus / "notes" / "photo.jpg").unlink()
+    (corpus / "notes" / "new_exhibit.txt").write_text("New exhibit, 2025-11-20.\n")
+    run_deepdive("--root", corpus, "--out-dir", target)
+
+    result = run_deepdive("diff", base, target)
+    assert (result["added"], result["removed"], result["moved"], result["modified"]) == (1, 1, 1, 1)
+
+    delta = rows(Path(result["path"]))
+    # Manifest paths are "<evidence root name>:<full path>".
+    moved = {"from": f"evidence:{corpus / 'notes' / 'call_log.txt'}", "to": f"evidence:{corpus / 'filings' / 'call_log.txt'}"}
+    assert delta["moved"] == [moved]
+    old_manifest = rows(base / "evidence_vault_manifest.json")
+    new_manifest = rows(target / "evidence_vault_manifest.json")
+    applied = evidence_diff.apply_manifest_delta(old_manifest, delta)
+    assert sorted(applied, key=lambda e: e["path"]) == sorted(new_manifest, key=lambda e: e["path"])
+
+
+def test_scan_delta_matches_the_diff_subcommand(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    base, target = tmp_path / "base", tmp_path / "target"
+    run_deepdive("--root", corpus, "--out-dir", base)
+    (corpus / "notes" / "new_exhibit.txt").write_text("New exhibit, 2025-11-20.\n")
+    summary = run_deepdive("--root", corpus, "--out-dir", target, "--diff-against", base)
+    scan_delta = rows(Path(summary["delta"]["path"]))
+
+    result = run_deepdive("diff", base, target, "--delta", tmp_path / "delta.json")
+    diff_delta = rows(Path(result["path"]))
+    assert scan_delta["added"] == diff_delta["added"] == [f"evidence:{corpus / 'notes' / 'new_exhibit.txt'}"]
+    assert scan_delta["upsert"] == diff_delta["upsert"]
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from conftest import outputs, rows
+
+
+def test_unchanged_rerun_is_all_cache_hits(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    out = tmp_path / "out"
+    first = run_deepdive("--root", corpus, "--out-dir", out, "--incremental")
+    before = outputs(out)
+    second = run_deepdive("--root", corpus, "--out-dir", out, "--incremental")
+    assert second["cache"]["misses"] == 0
+    assert second["cache"]["hits"] == first["cache"]["misses"]
+    assert outputs(out) == before
+
+
+def test_modified_file_is_reindexed(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    out = tmp_path / "out"
+    run_deepdive("--root", corpus, "--out-dir", out, "--incremental")
+    (corpus / "filings" / "FOIA_request.txt").write_text("FOIA request resent February 2, 2026, now also to Pontiac.\n")
+    summary = run_deepdive("--root", corpus, "--out-dir", out, "--incremental")
+    assert summary["cache"]["misses"] == 1
+
+    fresh = tmp_path / "fresh"
+    run_deepdive("--root", corpus, "--out-dir", fresh)
+    assert outputs(out) == outputs(fresh)
+    foia = next(r for r in rows(out / "indexed_files.json") if r["name"] == "FOIA_request.txt")
+    assert "Pontiac" in foia["entity_hits"]
+
+
+def test_new_filename_alias_rematches_cached_content(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    # A file named after NEWTOKEN adds it to the alias table, so files whose text was
+    # cached under the old table must be matched again; the rest stay cache hits.
+    out = tmp_path / "out"
+    args = ("--root", corpus, "--out-dir", out, "--incremental", "--archive-depth", 2)
+    run_deepdive(*args)
+    (corpus / "notes" / "NEWTOKEN_note.txt").write_text("Short note.\n")
+    summary = run_deepdive(*args)
+    assert summary["cache"]["hits"] > 0
+    assert summary["cache"]["misses"] > 1
+
+    fresh = tmp_path / "fresh"
+    run_deepdive("--root", corpus, "--out-dir", fresh, "--archive-depth", 2, "--no-content-store")
+    assert outputs(out) == outputs(fresh)
+    entity_map = rows(out / "entity_map.json")
+    paths = [Path(e["path"]).name for e in entity_map["NEWTOKEN"]]
+    assert "OCSO_report_2025-08-01.txt" in paths
+    assert any(p.endswith("memo.txt") for p in paths)
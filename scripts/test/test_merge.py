@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pytest
+
+import evidence_deepdive as ed
+from conftest import outputs
+
+
+@pytest.mark.parametrize("dedupe", ["full", "staged"])
+def test_merged_shards_match_a_single_run(corpus: Path, tmp_path: Path, run_deepdive, dedupe: str) -> None:
+    opts = ("--archive-depth", 2, "--dedupe", dedupe)
+    single = tmp_path / "single"
+    run_deepdive("--root", corpus, "--out-dir", single, *opts)
+
+    shards = [tmp_path / f"shard{i}" for i in (1, 2, 3)]
+    for i, shard in enumerate(shards, start=1):
+        run_deepdive("--root", corpus, "--out-dir", shard, "--shard", f"{i}/3", *opts)
+    merged = tmp_path / "merged"
+    summary = run_deepdive("merge", *shards, "--out-dir", merged)
+    assert summary["shards"] == 3
+    assert outputs(merged) == outputs(single)
+
+
+def test_merge_rejects_a_missing_shard(corpus: Path, tmp_path: Path, run_deepdive, capsys) -> None:
+    for i in (1, 2):
+        run_deepdive("--root", corpus, "--out-dir", tmp_path / f"shard{i}", "--shard", f"{i}/3")
+    assert ed.main(["merge", str(tmp_path / "shard1"), str(tmp_path / "shard2"), "--out-dir", str(tmp_path / "merged")]) == 2
+    assert "need shards 1..3" in capsys.readouterr().err
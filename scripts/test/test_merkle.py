@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import evidence_merkle as em
+from conftest import rows
+
+
+def test_proofs_from_a_merkle_run_verify(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    out = tmp_path / "out"
+    summary = run_deepdive("--root", corpus, "--out-dir", out, "--merkle", "--archive-depth", 2)
+    tree_path = out / em.MERKLE_FILE
+    assert em.MerkleTree.load(tree_path).root() == summary["merkle"]["root"]
+
+    proof = run_deepdive("merkle", "prove", "--tree", tree_path, "evidence/notes/call_log.txt")
+    assert em.verify_merkle_proof(proof)
+    proof_path = tmp_path / "proof.json"
+    proof_path.write_text(json.dumps(proof))
+    result = run_deepdive(
+        "merkle", "verify", proof_path, "--root", summary["merkle"]["root"], "--file", corpus / "notes" / "call_log.txt"
+    )
+    assert result["valid"] and all(result["checks"].values())
+
+    member = next(r for r in rows(out / "indexed_files.json") if r["rel_path"].endswith("deep/memo.txt"))
+    assert em.verify_merkle_proof(run_deepdive("merkle", "prove", "--tree", tree_path, "evidence/" + member["rel_path"]))
+
+
+def test_tampered_proofs_fail(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    out = tmp_path / "out"
+    run_deepdive("--root", corpus, "--out-dir", out, "--merkle")
+    tree = em.MerkleTree.load(out / em.MERKLE_FILE)
+    proof = tree.proof(tree.find("evidence/filings/FOIA_request.txt"))
+
+    assert not em.verify_merkle_proof({**proof, "leaf": "00" * 32})
+    assert not em.verify_merkle_proof({**proof, "path": "evidence/filings/other.txt"})
+    assert not em.verify_merkle_proof({**proof, "root": "00" * 32})
+
+
+def test_rescan_updates_the_saved_tree_in_place(corpus: Path, tmp_path: Path, run_deepdive) -> None:
+    out = tmp_path / "out"
+    run_deepdive("--root", corpus, "--out-dir", out, "--merkle")
+    (corpus / "notes" / "call_log.txt").write_text("Call rescheduled.\n")
+    updated = run_deepdive("--root", corpus, "--out-dir", out, "--merkle")
+    assert updated["merkle"]["changed"] == 1
+
+    fresh = run_deepdive("--root", corpus, "--out-dir", tmp_path / "fresh", "--merkle")
+    assert updated["merkle"]["root"] == fresh["merkle"]["root"]
@@ -230,11 +230,17 @@ export default function EvidenceVault() {
       setManifestStatus("Importing...");
       const text = await file.text();
       const parsed = JSON.parse(text);
-      if (!Array.isArray(parsed)) {
-        throw new Error("Manifest must be a JSON array of items.");
+      // evidence_deepdive.py diff writes an evidence_vault_delta: entries to upsert plus paths to drop.
+      const isDelta = !Array.isArray(parsed) && parsed?.kind === "evidence_vault_delta";
+      if (!Array.isArray(parsed) && !isDelta) {
+        throw new Error("Manifest must be a JSON array of items or an evidence_vault_delta.");
       }
+      const rows: any[] = isDelta ? (Array.isArray(parsed.upsert) ? parsed.upsert : []) : parsed;
+      const removedPaths = new Set<string>(
+        isDelta && Array.isArray(parsed.remove) ? parsed.remove.map((p: any) => String(p || "").trim()) : []
+      );
 
-      const normalized = parsed
+      const normalized = rows
         .map((row: any) => {
           const name = String(row?.name || "").trim();
           const path = String(row?.path || "").trim();
@@ -247,13 +253,18 @@ export default function EvidenceVault() {
 
       const existing = readJson<Array<{ name: string; path: string; ext: string; category: string }>>(DYNAMIC_EVIDENCE_KEY, []);
       const mergedByPath = new Map<string, { name: string; path: string; ext: string; category: string }>();
-      existing.forEach((item) => mergedByPath.set(item.path, item));
+      let removed = 0;
+      existing.forEach((item) => {
+        if (removedPaths.has(item.path)) removed += 1;
+        else mergedByPath.set(item.path, item);
+      });
       normalized.forEach((item) => mergedByPath.set(item.path, item));
       const merged = Array.from(mergedByPath.values());
       writeJson(DYNAMIC_EVIDENCE_KEY, merged);
 
-      setManifestStatus(`Imported ${normalized.length} item(s). Dynamic evidence now: ${merged.length}.`);
-      logAuditEvent("Evidence manifest imported", { imported: normalized.length, merged: merged.length, filename: file.name });
+      const removedNote = isDelta ? `, removed ${removed}` : "";
+      setManifestStatus(`Imported ${normalized.length} item(s)${removedNote}. Dynamic evidence now: ${merged.length}.`);
+      logAuditEvent("Evidence manifest imported", { imported: normalized.length, removed, merged: merged.length, filename: file.name });
     } catch (err: any) {
       setManifestStatus(err?.message || "Manifest import failed.");
     }